@@ -0,0 +1,83 @@
+# batch.py
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from branch_and_bound import BranchAndBound
+from branch_and_cut import integral_rows
+from simplex import LPResult, RevisedSimplex, solve_lp
+
+
+class BatchResult:
+    """
+    Solutions of one model under many right-hand sides, stacked by scenario
+    points has one row per scenario (NaN where no solution was found), values,
+    status and iterations one entry per scenario.
+    """
+    def __init__(self, points, values, status, iterations):
+        self.points = points
+        self.values = values
+        self.status = status
+        self.iterations = iterations
+
+    def __len__(self):
+        return len(self.values)
+
+
+def _solve_chunk(constraints, cost, rhs, integer, int_tol=1e-6):
+    """
+    Solve consecutive scenarios with one simplex engine, each one starting from
+    the previous scenario's basis and factorization
+    """
+    cost = np.asarray(cost, dtype=float)
+    n_scenarios, n = len(rhs), len(cost)
+    points = np.full((n_scenarios, n), np.nan)
+    values = np.full(n_scenarios, np.nan)
+    status = np.empty(n_scenarios, dtype=object)
+    iterations = np.zeros(n_scenarios, dtype=np.int64)
+
+    if integer:
+        # A x <= b with integer coefficients and x implies A x <= floor(b)
+        integral = integral_rows(constraints['A'], np.zeros(rhs.shape[1]))
+        rhs = np.where(integral, np.floor(rhs + 1e-9), rhs)
+
+    engine = RevisedSimplex(constraints['A'], rhs[0], cost, constraints.get('lb'), constraints.get('ub'))
+    for k, b in enumerate(rhs):
+        result = engine.solve() if k == 0 else engine.modify(b=b)
+        iterations[k] = result.iterations
+        if integer and result.point is not None:
+            rounded = np.round(result.point)
+            if np.any(np.abs(result.point - rounded) > int_tol):
+                # Fractional vertex (non-integral data): fall back to Branch and Bound
+                result = BranchAndBound(solve_lp, dict(constraints, b=b), cost).solve()
+            else:
+                result = LPResult(rounded, float(cost @ rounded), result.status)
+        status[k] = result.status
+        if result.point is not None:
+            points[k] = result.point
+            values[k] = result.value
+    return points, values, status, iterations
+
+
+def solve_batch(constraints, cost, rhs, workers=1, integer=True):
+    """
+    Solve min c^T x s.t. A x <= b_k, lb <= x <= ub for every scenario b_k
+    The model structure is set up once. Only the right-hand side changes between
+    scenarios, so every basis stays dual feasible and the next scenario is
+    re-optimized from it with the dual simplex, reusing its LU factorization.
+    Args:
+        constraints: Dictionary containing A and optionally lb/ub (b is ignored)
+        cost: Cost vector c
+        rhs: Right-hand sides, one row per scenario
+        workers: Number of processes; scenarios are split into contiguous chunks
+        integer: Require integer solutions (Branch and Bound when the LP is fractional)
+    Returns:
+        BatchResult
+    """
+    rhs = np.atleast_2d(np.asarray(rhs, dtype=float))
+    if workers is None or workers <= 1 or len(rhs) < 2:
+        return BatchResult(*_solve_chunk(constraints, cost, rhs, integer))
+
+    chunks = np.array_split(np.arange(len(rhs)), min(workers, len(rhs)))
+    with ProcessPoolExecutor(len(chunks)) as pool:
+        futures = [pool.submit(_solve_chunk, constraints, cost, rhs[chunk], integer) for chunk in chunks]
+        parts = [future.result() for future in futures]
+    return BatchResult(*(np.concatenate(arrays) for arrays in zip(*parts)))
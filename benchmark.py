@@ -0,0 +1,199 @@
+# benchmark.py
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from data.generator import generate_instance
+from data.sample_data import HajjData
+from optimizer import Optimizer
+
+DEFAULT_SIZES = ['2x2', '5x6', '10x20', '20x50', '50x100']
+PRODUCTION_SIZES = ['100x500', '200x1000', '500x2000']
+
+# Engines and the largest number of variables each one runs on by default
+ENGINES = {
+    'lp': 20000,
+    'ip': 5000,
+    'ip_cuts': 5000,
+    'transport': 100000,
+}
+
+
+def _solve(optimizer, engine, hajj_data, instance):
+    """
+    Build the model for one engine and solve it
+    Returns:
+        The solver result and the time spent building the model
+    """
+    start = time.perf_counter()
+    if engine == 'transport':
+        supply, capacity, costs, bus_capacity = hajj_data.get_transport_problem(instance)
+        build_time = time.perf_counter() - start
+        return optimizer.optimizerTransport(supply, capacity, costs, bus_capacity), build_time
+
+    A, b, c, lb, ub = hajj_data.get_problem_matrices(instance, sparse=True, bounds=True)
+    constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+    build_time = time.perf_counter() - start
+    if engine == 'lp':
+        return optimizer.optimizerLP(constraints, c), build_time
+    return optimizer.optimizerIPBB(constraints, c, cuts=engine == 'ip_cuts'), build_time
+
+
+def run_case(engine, n_ports, n_hotels, seed=0, repeat=3, memory=True):
+    """
+    Benchmark one engine on one generated instance
+    A first, untimed solve takes the one-off import and cache costs; it is the
+    tracemalloc run that measures peak memory, when memory is set. The wall
+    time is the median of the repeat solves that follow.
+    Returns:
+        Dictionary with the instance, status, objective, times, memory and counts
+    """
+    optimizer = Optimizer()
+    hajj_data = HajjData()
+    instance = generate_instance(n_ports, n_hotels, seed, as_arrays=True)
+
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+    _solve(optimizer, engine, hajj_data, instance)
+    if memory:
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    times = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result, build_time = _solve(optimizer, engine, hajj_data, instance)
+        times.append(time.perf_counter() - start - build_time)
+
+    return {
+        'engine': engine,
+        'n_ports': n_ports,
+        'n_hotels': n_hotels,
+        'seed': seed,
+        'status': getattr(result, 'status', None),
+        'value': result[1],
+        'time_s': float(np.median(times)),
+        'build_time_s': build_time,
+        'peak_mb': peak_mb,
+        'nodes': getattr(result, 'nodes', None),
+        'iterations': getattr(result, 'iterations', None),
+    }
+
+
+def _case_key(record):
+    return (record['engine'], record['n_ports'], record['n_hotels'], record['seed'])
+
+
+def compare(results, baseline, time_tolerance=0.25, memory_tolerance=0.25, min_time=0.01):
+    """
+    Flag results that got worse than a stored baseline
+    Args:
+        results: Records from run_case
+        baseline: Records of an earlier run
+        time_tolerance: Allowed relative slowdown
+        memory_tolerance: Allowed relative growth of peak memory
+        min_time: Slowdowns below this many seconds are treated as noise
+    Returns:
+        List of {case, metric, baseline, current} regressions
+    """
+    previous = {_case_key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        base = previous.get(_case_key(record))
+        if base is None:
+            continue
+        checks = []
+        if record['status'] != base['status']:
+            checks.append('status')
+        elif (record['value'] is None) != (base['value'] is None) or (
+                record['value'] is not None and
+                abs(record['value'] - base['value']) > 1e-6 * max(1.0, abs(base['value']))):
+            checks.append('value')
+        if (record['time_s'] > base['time_s'] * (1 + time_tolerance) and
+                record['time_s'] - base['time_s'] > min_time):
+            checks.append('time_s')
+        if (record['peak_mb'] is not None and base.get('peak_mb') is not None and
+                record['peak_mb'] > base['peak_mb'] * (1 + memory_tolerance)):
+            checks.append('peak_mb')
+        if record['nodes'] is not None and base.get('nodes') is not None and record['nodes'] > base['nodes']:
+            checks.append('nodes')
+        for metric in checks:
+            regressions.append({'case': list(_case_key(record)), 'metric': metric,
+                                'baseline': base.get(metric), 'current': record[metric]})
+    return regressions
+
+
+def _parse_size(size):
+    n_ports, n_hotels = size.lower().split('x')
+    return int(n_ports), int(n_hotels)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the solvers on generated instances')
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help="Instance sizes as PORTSxHOTELS (default: %(default)s)")
+    parser.add_argument('--production', action='store_true',
+                        help=f"Add the production sizes {PRODUCTION_SIZES}")
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed solves per case, after an untimed warm-up; the median time is kept')
+    parser.add_argument('--max-variables', type=int, default=None,
+                        help='Run every engine up to this many variables, overriding its default limit')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc run')
+    parser.add_argument('--output', default='results/benchmark.json')
+    parser.add_argument('--baseline', default=None, help='Earlier output to check for regressions')
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--memory-tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    sizes = [_parse_size(size) for size in args.sizes]
+    if args.production:
+        sizes += [_parse_size(size) for size in PRODUCTION_SIZES]
+
+    results = []
+    for n_ports, n_hotels in sizes:
+        for engine in args.engines:
+            limit = args.max_variables or ENGINES[engine]
+            if n_ports * n_hotels > limit:
+                print(f"{engine:>10} {n_ports}x{n_hotels}: skipped (more than {limit} variables)")
+                continue
+            for seed in args.seeds:
+                record = run_case(engine, n_ports, n_hotels, seed, args.repeat, not args.no_memory)
+                results.append(record)
+                memory = f"{record['peak_mb']:8.1f} MB" if record['peak_mb'] is not None else ''
+                print(f"{engine:>10} {n_ports}x{n_hotels} seed {seed}: {record['status']}, "
+                      f"{record['time_s']:.3f} s {memory}, nodes {record['nodes']}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)['results'],
+                                  args.time_tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['case']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}")
+
+    output = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'results': results,
+        'regressions': regressions,
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
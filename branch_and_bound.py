@@ -0,0 +1,439 @@
+# branch_and_bound.py
+import heapq
+import itertools
+import time
+import numpy as np
+from heuristics import repair_solution
+from simplex import OPTIMAL, INFEASIBLE, UNBOUNDED
+from stats import SolverStats
+
+NODE_SELECTIONS = ('best_bound', 'depth_first', 'hybrid')
+BRANCHING_RULES = ('most_fractional', 'pseudo_cost', 'first')
+
+# Statuses of a search stopped before it proved optimality
+TIME_LIMIT = 'time_limit'
+NODE_LIMIT = 'node_limit'
+GAP_LIMIT = 'gap_limit'  # the search finished, proving the incumbent within the gap tolerance
+
+# LPs one dive may solve before it gives up
+DIVE_LPS = 20
+
+
+class IPResult(tuple):
+    """
+    Result of an integer solve. Unpacks as (optimal_point, optimal_value) and also
+    carries the status, the global lower bound, the number of nodes solved, the
+    SolverStats of the search and, for branch-and-cut, a summary of the cutting planes.
+    """
+    def __new__(cls, point, value, status, bound=None, nodes=0, cuts=None, stats=None):
+        result = super().__new__(cls, (point, value))
+        result.status = status
+        result.bound = bound
+        result.nodes = nodes
+        result.cuts = cuts
+        result.stats = stats
+        return result
+
+    @property
+    def point(self):
+        return self[0]
+
+    @property
+    def value(self):
+        return self[1]
+
+    @property
+    def gap(self):
+        """Relative gap between the returned value and the bound"""
+        if self.value is None or self.bound is None:
+            return np.inf
+        return (self.value - self.bound) / max(1.0, abs(self.value))
+
+
+class BoundChange:
+    """Bounds of one variable tightened by a branch, linked to the parent node's changes"""
+    __slots__ = ('variable', 'lower', 'upper', 'previous')
+
+    def __init__(self, variable, lower, upper, previous):
+        self.variable = variable
+        self.lower = lower
+        self.upper = upper
+        self.previous = previous
+
+
+class Node:
+    """
+    Open node of the search tree. Bounds are stored as the chain of changes from
+    the root, shared with the ancestors, so a node costs O(1) memory on top of
+    the immutable base model; the basis is shared with the sibling.
+    """
+    __slots__ = ('bound', 'depth', 'changes', 'basis', 'branch')
+
+    def __init__(self, bound, depth, changes=None, basis=None, branch=None):
+        self.bound = bound              # LP value of the parent, a lower bound for this node
+        self.depth = depth
+        self.changes = changes          # newest BoundChange, or None at the root
+        self.basis = basis              # parent's optimal basis, the warm start for the node's LP
+        self.branch = branch            # (variable, direction, distance moved) for pseudo-costs
+
+
+class BranchAndBound:
+    """
+    Iterative Branch and Bound driven by a priority queue of open nodes
+    Every node shares one incumbent, nodes whose parent bound cannot beat it are
+    pruned before their LP is solved, and the branching variable is chosen by
+    the most-fractional or pseudo-cost rule. Branching tightens a variable bound
+    (recorded as a diff against the parent) and the child LP is warm-started
+    from the parent's optimal basis.
+    The optional callback(event, stats) is called with 'incumbent' on every new
+    incumbent and with 'progress' every progress_interval solved nodes; with
+    history on, the same events are also kept in stats.history. Without either,
+    the global bound is only computed for the result.
+    The search stops early after time_limit seconds or node_limit LPs (checked
+    between nodes), and nodes that cannot beat the incumbent by more than
+    abs_gap or rel_gap * |incumbent| are pruned; the result then carries the
+    incumbent, the global lower bound and a TIME_LIMIT, NODE_LIMIT or GAP_LIMIT status.
+    An initial_solution (e.g. a greedy allocation) is repaired and taken as the
+    first incumbent. With heuristics on, the root LP solution is rounded and
+    repaired, and the root and every dive_interval-th node start a dive that
+    fixes the least fractional variables until the LP turns integral.
+    """
+    def __init__(self, lp_solver, constraints, cost, node_selection='best_bound',
+                 branching='most_fractional', int_tol=1e-6, callback=None, progress_interval=100,
+                 time_limit=None, node_limit=None, rel_gap=0.0, abs_gap=0.0,
+                 initial_solution=None, heuristics=True, dive_interval=50, history=False):
+        if node_selection not in NODE_SELECTIONS:
+            raise ValueError(f"Unknown node selection '{node_selection}', expected one of {NODE_SELECTIONS}")
+        if branching not in BRANCHING_RULES:
+            raise ValueError(f"Unknown branching rule '{branching}', expected one of {BRANCHING_RULES}")
+        self.lp_solver = lp_solver
+        self.constraints = constraints
+        self.cost = np.asarray(cost, dtype=float)
+        self.node_selection = node_selection
+        self.branching = branching
+        self.int_tol = int_tol
+        self.callback = callback
+        self.progress_interval = progress_interval
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.rel_gap = rel_gap
+        self.abs_gap = abs_gap
+        self.initial_solution = initial_solution
+        self.heuristics = heuristics
+        self.dive_interval = dive_interval
+
+        # Shared, read-only base bounds that every node's changes apply to
+        n = len(self.cost)
+        lb = constraints.get('lb')
+        ub = constraints.get('ub')
+        self.base_lb = np.full(n, -np.inf) if lb is None else np.array(lb, dtype=float)
+        self.base_ub = np.full(n, np.inf) if ub is None else np.array(ub, dtype=float)
+        self.base_lb.setflags(write=False)
+        self.base_ub.setflags(write=False)
+
+        # With integral costs every integer solution has an integral value, so a
+        # node only helps if it can beat the incumbent by at least one unit
+        self.objective_step = 1.0 if np.all(self.cost == np.round(self.cost)) else 0.0
+
+        self.pseudo_sum = np.zeros((2, n))    # [down, up] objective gain per unit
+        self.pseudo_count = np.zeros((2, n))
+
+        self.best_point = None
+        self.best_value = np.inf
+        self.nodes = 0
+        self.unbounded = False
+        self.limit_status = None
+        self.stats = SolverStats(history)
+        self._pruned_bound = np.inf  # smallest bound of a pruned node
+        self._active_bound = None
+        self._counter = itertools.count()
+        self._queue = []
+        self._depth_first = node_selection in ('depth_first', 'hybrid')
+
+    # ------------------------------------------------------------------
+    # Node queue
+    # ------------------------------------------------------------------
+    def _key(self, node):
+        if self._depth_first:
+            return (-node.depth, node.bound)
+        return (node.bound, -node.depth)
+
+    def _push(self, node):
+        heapq.heappush(self._queue, (self._key(node), next(self._counter), node))
+
+    def _pop(self):
+        return heapq.heappop(self._queue)[2]
+
+    def _switch_to_best_bound(self):
+        """Hybrid search dives until the first incumbent, then goes best-bound"""
+        self._depth_first = False
+        self._queue = [(self._key(node), count, node) for _, count, node in self._queue]
+        heapq.heapify(self._queue)
+
+    def _cutoff(self):
+        """Objective value a node has to beat"""
+        return self.best_value
+
+    def _tolerance(self):
+        """Improvement a node must be able to make: one objective step or the allowed gap"""
+        cutoff = self._cutoff()
+        if not np.isfinite(cutoff):
+            return self.objective_step
+        return max(self.objective_step, self.abs_gap, self.rel_gap * abs(cutoff))
+
+    def _can_improve(self, bound):
+        return bound < self._cutoff() - self._tolerance() + 1e-9 * max(1.0, abs(bound))
+
+    def _prune(self, bound):
+        """Drop a node that cannot improve enough; its bound still limits the global bound"""
+        self.stats.pruned_by_bound += 1
+        self._pruned_bound = min(self._pruned_bound, bound)
+
+    def _global_bound(self):
+        """Smallest lower bound over the open nodes, the node being solved and the pruned nodes"""
+        bounds = [node.bound for _, _, node in self._queue]
+        if self._active_bound is not None:
+            bounds.append(self._active_bound)
+        return min(min(bounds, default=self.best_value), self._pruned_bound, self.best_value)
+
+    def _snapshot(self, event):
+        if self.callback is None and not self.stats.keep_history:
+            return  # nobody to report to: skip the scan of the open nodes
+        self.stats.record(self.best_value, self._global_bound())
+        if self.callback is not None:
+            self.callback(event, self.stats)
+
+    # ------------------------------------------------------------------
+    # Branching
+    # ------------------------------------------------------------------
+    def _fractional(self, point):
+        distance = np.abs(point - np.round(point))
+        return np.flatnonzero(distance > self.int_tol)
+
+    def _select_variable(self, point, fractional):
+        frac = point[fractional] - np.floor(point[fractional])
+        if self.branching == 'first':
+            return fractional[0]
+        if self.branching == 'pseudo_cost':
+            known = self.pseudo_count > 0
+            if known.any():
+                average = self.pseudo_sum[known].sum() / self.pseudo_count[known].sum()
+                estimate = np.where(known, self.pseudo_sum / np.maximum(self.pseudo_count, 1), average)
+                down = frac * estimate[0, fractional]
+                up = (1 - frac) * estimate[1, fractional]
+                score = np.maximum(down, 1e-6) * np.maximum(up, 1e-6)
+                return fractional[np.argmax(score)]
+        return fractional[np.argmax(np.minimum(frac, 1 - frac))]
+
+    def _update_pseudo_cost(self, node, value):
+        variable, direction, distance = node.branch
+        if distance > 0:
+            self.pseudo_sum[direction, variable] += (value - node.bound) / distance
+            self.pseudo_count[direction, variable] += 1
+
+    def _node_bounds(self, node):
+        """Materialize the bounds of a node from the base model and its change chain"""
+        lb = self.base_lb.copy()
+        ub = self.base_ub.copy()
+        seen = set()
+        change = node.changes
+        while change is not None:
+            if change.variable not in seen:  # the newest change of a variable wins
+                seen.add(change.variable)
+                lb[change.variable] = change.lower
+                ub[change.variable] = change.upper
+            change = change.previous
+        return lb, ub
+
+    def _children(self, node, lb, ub, point, result, variable):
+        x = point[variable]
+        floor_val, ceil_val = np.floor(x), np.ceil(x)
+
+        # Floor branch: x_i <= floor, ceil branch: x_i >= ceil
+        floor_change = BoundChange(variable, lb[variable], floor_val, node.changes)
+        ceil_change = BoundChange(variable, ceil_val, ub[variable], node.changes)
+        value, basis = result.value, result.basis
+        return [Node(value, node.depth + 1, floor_change, basis, (variable, 0, x - floor_val)),
+                Node(value, node.depth + 1, ceil_change, basis, (variable, 1, ceil_val - x))]
+
+    # ------------------------------------------------------------------
+    # Primal heuristics
+    # ------------------------------------------------------------------
+    def _offer(self, point):
+        """Repair a candidate solution and take it as incumbent if it is better"""
+        if point is None:
+            return False
+        point = repair_solution(self.constraints['A'], self.constraints['b'], self.base_lb,
+                                self.base_ub, self.cost, point)
+        if point is None or float(self.cost @ point) >= self.best_value - 1e-9:
+            return False
+        self.stats.heuristic_solutions += 1
+        self._new_incumbent(point)
+        return True
+
+    def _dive(self, lb, ub, result):
+        """
+        Fix the least fractional quarter of the fractional variables to their
+        nearest integer and re-solve, until the LP is integral or cannot improve
+        Returns:
+            The last LP point of the dive, for repair, or None
+        """
+        lb, ub = lb.copy(), ub.copy()
+        point = result.point
+        for _ in range(DIVE_LPS):
+            fractional = self._fractional(point)
+            if len(fractional) == 0:
+                break
+            distance = np.abs(point[fractional] - np.round(point[fractional]))
+            fixed = fractional[np.argsort(distance, kind='stable')[:max(1, len(fractional) // 4)]]
+            lb[fixed] = ub[fixed] = np.round(point[fixed])
+            result = self.lp_solver(dict(self.constraints, lb=lb, ub=ub), self.cost, result.basis)
+            self.stats.heuristic_lps += 1
+            if result.point is None:
+                break
+            if not self._can_improve(result.value):
+                return None
+            point = result.point
+        return point
+
+    def _run_heuristics(self, node, lb, ub, result):
+        start = time.perf_counter()
+        if node.depth == 0:
+            self._offer(result.point)
+        self._offer(self._dive(lb, ub, result))
+        self.stats.heuristic_time += time.perf_counter() - start
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def _solve_lp(self, constraints, basis):
+        start = time.perf_counter()
+        result = self.lp_solver(constraints, self.cost, basis)
+        self.stats.lp_time += time.perf_counter() - start
+        self.stats.lp_calls += 1
+        self.stats.pivots += getattr(result, 'iterations', 0)
+        return result
+
+    def _relaxation(self, node, lb, ub):
+        """Solve the LP relaxation of a node; children re-optimize from the parent's basis"""
+        return self._solve_lp(dict(self.constraints, lb=lb, ub=ub), node.basis)
+
+    def _process(self, node):
+        """
+        Solve the LP of one node
+        Returns:
+            The node's children, empty when the node is pruned, infeasible or integral
+        """
+        stats = self.stats
+        if not self._can_improve(node.bound):
+            self._prune(node.bound)
+            return []  # pruned by the parent bound
+
+        lb, ub = self._node_bounds(node)
+        point, value = result = self._relaxation(node, lb, ub)
+        self.nodes += 1
+        stats.nodes_solved += 1
+        if self.nodes % self.progress_interval == 0:
+            self._snapshot('progress')
+        if result.status == UNBOUNDED:
+            self.unbounded = True
+            return []
+        if point is None:
+            stats.pruned_infeasible += 1
+            return []
+        if node.branch is not None and self.branching == 'pseudo_cost':
+            self._update_pseudo_cost(node, value)
+        if not self._can_improve(value):
+            self._prune(value)
+            return []
+
+        fractional = self._fractional(point)
+        if len(fractional) == 0:
+            stats.integral_nodes += 1
+            self._new_incumbent(np.round(point))
+            return []
+        if self.heuristics and (node.depth == 0 or self.nodes % self.dive_interval == 0):
+            self._run_heuristics(node, lb, ub, result)
+            if not self._can_improve(value):
+                self._prune(value)
+                return []
+
+        start = time.perf_counter()
+        variable = self._select_variable(point, fractional)
+        children = self._children(node, lb, ub, point, result, variable)
+        stats.branching_time += time.perf_counter() - start
+        stats.nodes_created += len(children)
+        return children
+
+    def _new_incumbent(self, point):
+        self.best_point = point
+        self.best_value = float(self.cost @ point)
+        if self._depth_first and self.node_selection == 'hybrid':
+            self._switch_to_best_bound()
+        self._snapshot('incumbent')
+
+    def _expand(self, node):
+        """Process a node and queue its children"""
+        self._active_bound = node.bound
+        for child in self._process(node):
+            self._push(child)
+        self._active_bound = None
+
+    def _limit_reached(self):
+        """Check the time and node limits, setting limit_status when one is hit"""
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            self.limit_status = NODE_LIMIT
+        elif self.time_limit is not None and self.stats.elapsed >= self.time_limit:
+            self.limit_status = TIME_LIMIT
+        return self.limit_status is not None
+
+    def _search(self, max_nodes=None):
+        """
+        Process open nodes until the queue is empty, a limit is hit, or max_nodes
+        LPs have been solved
+        """
+        start = self.nodes
+        while self._queue and not self.unbounded:
+            if max_nodes is not None and self.nodes - start >= max_nodes:
+                return
+            if self._limit_reached():
+                return
+            self._expand(self._pop())
+
+    def _result(self):
+        stats = self.stats
+        stats.total_time = stats.elapsed
+        if self.unbounded:
+            stats.record(self.best_value, -np.inf)
+            return IPResult(None, None, UNBOUNDED, -np.inf, self.nodes, stats=stats)
+
+        bound = float(self._global_bound())
+        if self.objective_step:
+            bound = min(float(np.ceil(bound - 1e-6)), self.best_value)  # integral objective values
+        stopped = self.limit_status is not None and bool(self._queue)
+        if self.best_point is None:
+            status = self.limit_status if stopped else INFEASIBLE
+            stats.record(np.inf, bound)
+            return IPResult(None, None, status, bound, self.nodes, stats=stats)
+
+        gap = self.best_value - bound
+        if gap < self.objective_step or gap <= 1e-9 * max(1.0, abs(self.best_value)):
+            status, bound = OPTIMAL, self.best_value
+        elif stopped:
+            status = self.limit_status
+        else:
+            status = GAP_LIMIT
+        stats.record(self.best_value, bound)
+        return IPResult(self.best_point, self.best_value, status, bound, self.nodes, stats=stats)
+
+    def solve(self):
+        """
+        Run the search
+        Returns:
+            IPResult (optimal_point, optimal_value) with status, bound, node count and stats
+        """
+        self._offer(self.initial_solution)
+        self._push(Node(-np.inf, 0))
+        self.stats.nodes_created += 1
+        self._search()
+        return self._result()
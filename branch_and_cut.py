@@ -0,0 +1,286 @@
+# branch_and_cut.py
+import time
+import numpy as np
+from branch_and_bound import BranchAndBound, Node
+from simplex import RevisedSimplex, OPTIMAL, BASIC, AT_UPPER
+from sparse import CSRMatrix, vstack
+
+
+def integral_rows(A, b):
+    """Rows whose slack b - A x is integer whenever x is (integer coefficients and rhs)"""
+    b = np.asarray(b, dtype=float)
+    if isinstance(A, CSRMatrix):
+        fractional = np.bincount(A.row_ids, weights=A.data != np.round(A.data), minlength=A.shape[0])
+        integral = fractional == 0
+    else:
+        integral = np.all(A == np.round(A), axis=1)
+    return integral & (b == np.round(b))
+
+
+def gomory_mixed_integer_cuts(engine, root_lb, root_ub, integral_slack, max_cuts=20,
+                              away=0.01, max_dynamism=1e6):
+    """
+    Gomory mixed-integer cuts read off the optimal tableau of a solved LP
+    Nonbasic variables are measured from the root bounds rather than the node
+    bounds, so a cut found at a node is valid for the whole tree.
+    Args:
+        engine: RevisedSimplex after an optimal solve
+        root_lb, root_ub: Variable bounds of the root model
+        integral_slack: Whether the slack of every row is integer in integer solutions
+        max_cuts: Largest number of cuts returned
+        away: Smallest distance from an integer for a row to be used
+        max_dynamism: Largest ratio between the biggest and smallest cut coefficient
+    Returns:
+        List of (coefficients, rhs) of cuts a x <= rhs violated by the LP point,
+        most efficacious first
+    """
+    n, m = engine.n, engine.m
+    x = engine.x
+    point = x[:n]
+    at_upper = engine.status == AT_UPPER
+    nonbasic = engine.status != BASIC
+    bound = np.where(at_upper, np.concatenate([root_ub, np.full(m, np.inf)]),
+                     np.concatenate([root_lb, np.zeros(m)]))
+    finite = np.isfinite(bound)
+    bound = np.where(finite, bound, 0.0)
+    sign = np.where(at_upper, -1.0, 1.0)
+    integer = np.concatenate([finite[:n] & (bound[:n] == np.round(bound[:n])), integral_slack])
+
+    # Tableau rows of fractional basic variables, most fractional first
+    rows = np.flatnonzero(engine.basic < n)
+    frac = x[engine.basic[rows]] - np.floor(x[engine.basic[rows]])
+    candidate = (frac > away) & (frac < 1 - away)
+    rows, frac = rows[candidate], frac[candidate]
+    rows = rows[np.argsort(-np.minimum(frac, 1 - frac))]
+
+    cuts = []
+    for r in rows[:2 * max_cuts]:
+        alpha = engine.tableau_row(r)
+        alpha[~nonbasic | (np.abs(alpha) < 1e-11)] = 0.0
+        used = alpha != 0
+        if np.any(used & ~finite):
+            continue
+
+        # x_B + sum a_j t_j = beta with t_j >= 0 the distance of x_j from its bound
+        beta = x[engine.basic[r]] + alpha @ (x - bound)
+        f0 = beta - np.floor(beta)
+        if f0 < away or f0 > 1 - away:
+            continue
+        a = sign * alpha
+        f = a - np.floor(a)
+        f[(f < 1e-9) | (f > 1 - 1e-9)] = 0.0
+        g = np.where(integer, np.where(f <= f0, f / f0, (1 - f) / (1 - f0)),
+                     np.where(a >= 0, a / f0, -a / (1 - f0)))
+        g[~used] = 0.0
+
+        # sum g_j t_j >= 1 in the original variables, slacks t = b - A x
+        g_struct, g_slack = g[:n] * sign[:n], g[n:]
+        coefficients = engine.AT @ g_slack - g_struct
+        rhs = g_slack @ engine.b - g_struct @ bound[:n] - 1.0
+        rhs += 1e-7 * max(1.0, abs(rhs))  # safety margin against rounding in the tableau
+
+        magnitude = np.abs(coefficients[coefficients != 0])
+        if len(magnitude) == 0 or magnitude.max() > max_dynamism * magnitude.min():
+            continue
+        violation = coefficients @ point - rhs
+        if violation > 1e-6 * max(1.0, abs(rhs)):
+            cuts.append((violation / np.linalg.norm(coefficients), coefficients, rhs))
+
+    cuts.sort(key=lambda cut: -cut[0])
+    return [(coefficients, rhs) for _, coefficients, rhs in cuts[:max_cuts]]
+
+
+class CutPool:
+    """
+    Cuts currently in the LP. A cut is only accepted if it is not nearly
+    parallel to one already there, and its age counts the rounds since it was
+    last binding so that cuts which stopped mattering can be purged.
+    """
+    def __init__(self, max_age=3, max_parallelism=0.999):
+        self.max_age = max_age
+        self.max_parallelism = max_parallelism
+        self.coefficients = []
+        self.rhs = []
+        self.age = []
+        self._directions = []
+        self.added = 0
+        self.purged = 0
+
+    def __len__(self):
+        return len(self.rhs)
+
+    def add(self, coefficients, rhs):
+        """Add a cut unless it is nearly parallel to a pooled one; returns whether it was added"""
+        direction = coefficients / np.linalg.norm(coefficients)
+        if self._directions and np.max(np.array(self._directions) @ direction) > self.max_parallelism:
+            return False
+        self.coefficients.append(coefficients)
+        self.rhs.append(rhs)
+        self.age.append(0)
+        self._directions.append(direction)
+        self.added += 1
+        return True
+
+    def age_cuts(self, point, tol=1e-6):
+        """Reset the age of the cuts binding at point, age the others by one round"""
+        if not self.rhs:
+            return
+        rhs = np.array(self.rhs)
+        slack = rhs - np.array(self.coefficients) @ point
+        binding = slack <= tol * np.maximum(1.0, np.abs(rhs))
+        self.age = list(np.where(binding, 0, np.array(self.age) + 1))
+
+    def purge(self):
+        """
+        Drop the cuts older than max_age
+        Returns:
+            Indices of the cuts that stay, in order
+        """
+        kept = [i for i, age in enumerate(self.age) if age <= self.max_age]
+        self.purged += len(self.rhs) - len(kept)
+        self.coefficients = [self.coefficients[i] for i in kept]
+        self.rhs = [self.rhs[i] for i in kept]
+        self.age = [self.age[i] for i in kept]
+        self._directions = [self._directions[i] for i in kept]
+        return np.array(kept, dtype=np.int64)
+
+    def rows(self):
+        return np.array(self.coefficients), np.array(self.rhs)
+
+
+class BranchAndCut(BranchAndBound):
+    """
+    Branch and Bound with Gomory mixed-integer cuts
+    The root LP, and the LPs of nodes up to cut_depth, are re-solved in rounds:
+    cuts are read off the optimal tableau, the most efficacious ones that are
+    not nearly parallel to a pooled cut are appended as rows, and the LP is
+    re-optimized from the extended basis with the dual simplex. Cuts that stay
+    slack for max_age rounds are purged at the root. Every cut is globally
+    valid, so all later nodes solve the strengthened model.
+    Further keyword arguments (tolerances, callback, limits) go to BranchAndBound.
+    """
+    def __init__(self, lp_solver, constraints, cost, node_selection='best_bound',
+                 branching='most_fractional', cut_depth=0, rounds=10, max_cuts=20,
+                 max_age=3, max_parallelism=0.999, **kwargs):
+        super().__init__(lp_solver, constraints, cost, node_selection, branching, **kwargs)
+        self.cut_depth = cut_depth
+        self.rounds = rounds
+        self.max_cuts = max_cuts
+        self.pool = CutPool(max_age, max_parallelism)
+        self.base_A = constraints['A']
+        self.base_b = np.asarray(constraints['b'], dtype=float)
+        self.integral_slack = integral_rows(self.base_A, self.base_b)
+        self.cut_rounds = 0
+        self.root_lp_bound = None
+        self.root_cut_bound = None
+
+    def _update_model(self):
+        """Rebuild the LP rows from the base model and the pooled cuts"""
+        if len(self.pool):
+            coefficients, rhs = self.pool.rows()
+            A = vstack([self.base_A, coefficients])
+            b = np.concatenate([self.base_b, rhs])
+        else:
+            A, b = self.base_A, self.base_b
+        self.constraints = dict(self.constraints, A=A, b=b)
+
+    def _relaxation(self, node, lb, ub):
+        basis = node.basis
+        m = len(self.constraints['b'])
+        if basis is not None and len(basis.basic) < m:
+            # Cuts were added since the parent was solved: their slacks start basic
+            basis = basis.resized(len(self.cost), np.arange(len(basis.basic)), m - len(basis.basic))
+        result = self._solve_lp(dict(self.constraints, lb=lb, ub=ub), basis)
+        if node.depth > self.cut_depth:
+            return result
+        return self._cut_rounds(node, lb, ub, result)
+
+    def _engine_lp(self, solve, *args, **kwargs):
+        """Run a solve or modify of the cut-round engine, counted like any other LP"""
+        start = time.perf_counter()
+        result = solve(*args, **kwargs)
+        self.stats.lp_time += time.perf_counter() - start
+        self.stats.lp_calls += 1
+        self.stats.pivots += result.iterations
+        return result
+
+    def _cut_rounds(self, node, lb, ub, result):
+        """
+        Add cuts and re-solve until none are found, the bound stalls or the rounds
+        run out. One engine is kept over the rounds: the cuts of a round are added
+        to it as rows and the LP re-optimized from its current basis and factorization.
+        """
+        root = node.depth == 0
+        if root:
+            self.root_lp_bound = result.value
+        engine = None
+        stalled = 0
+        for _ in range(self.rounds):
+            point, value = result
+            if point is None or not self._can_improve(value) or len(self._fractional(point)) == 0:
+                break
+            if engine is None:
+                # The node LP came from lp_solver; rebuild its optimal basis in an engine
+                engine = RevisedSimplex(self.constraints['A'], self.constraints['b'], self.cost, lb, ub)
+                if self._engine_lp(engine.solve, result.basis).status != OPTIMAL:
+                    break
+            integral_slack = np.concatenate([self.integral_slack, np.zeros(len(self.pool), dtype=bool)])
+            cuts = gomory_mixed_integer_cuts(engine, self.base_lb, self.base_ub, integral_slack,
+                                             self.max_cuts)
+
+            pooled = len(self.pool)
+            kept = np.arange(pooled)
+            if root:
+                self.pool.age_cuts(point)
+                kept = self.pool.purge()
+            added = sum(self.pool.add(coefficients, rhs) for coefficients, rhs in cuts)
+            if not added and len(kept) == pooled:
+                break
+
+            base_rows = np.arange(len(self.base_b))
+            self._update_model()
+            result = self._engine_lp(engine.modify, b=self.constraints['b'], A=self.constraints['A'],
+                                     kept_rows=np.concatenate([base_rows, len(base_rows) + kept]))
+            self.cut_rounds += 1
+            if result.status != OPTIMAL:
+                break
+
+            if result.value <= value + 1e-6 * max(1.0, abs(value)):
+                stalled += 1
+                if stalled >= 2:
+                    break
+            else:
+                stalled = 0
+        if root:
+            self.root_cut_bound = result.value
+        return result
+
+    def cut_root(self):
+        """
+        Run the root cut rounds only
+        Returns:
+            The constraints strengthened with the cuts, for a separate tree search
+        """
+        self._relaxation(Node(-np.inf, 0), self.base_lb.copy(), self.base_ub.copy())
+        return self.constraints
+
+    def cut_summary(self, best_value=None):
+        """
+        Cutting-plane statistics, including the fraction of the root gap (root LP
+        bound to best integer value) that the cuts closed
+        """
+        best_value = self.best_value if best_value is None else best_value
+        closed = None
+        if self.root_lp_bound is not None and self.root_cut_bound is not None and np.isfinite(best_value):
+            gap = best_value - self.root_lp_bound
+            if gap > 1e-9 * max(1.0, abs(best_value)):
+                closed = min(1.0, (self.root_cut_bound - self.root_lp_bound) / gap)
+        return {'rounds': self.cut_rounds, 'cuts_added': self.pool.added,
+                'cuts_purged': self.pool.purged, 'cuts_active': len(self.pool),
+                'root_lp_bound': self.root_lp_bound, 'root_cut_bound': self.root_cut_bound,
+                'root_gap_closed': closed}
+
+    def _result(self):
+        result = super()._result()
+        result.cuts = self.cut_summary()
+        return result
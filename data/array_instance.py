@@ -0,0 +1,194 @@
+# data/array_instance.py
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ('supply', 'capacity', 'costs')
+INSTANCE_FILES = ('ports.txt', 'hotels.txt', 'supply.npy', 'capacity.npy', 'costs.npy', 'meta.json')
+
+
+class ArrayInstance:
+    """
+    Port/hotel instance held as arrays: supply and capacity vectors, a ports x
+    hotels cost matrix and the port/hotel name tables. Instances read with
+    load_instance are memory-mapped, so the arrays are paged in from disk as
+    they are used instead of being parsed into Python objects.
+    """
+    def __init__(self, ports, hotels, supply, capacity, costs, bus_capacity):
+        self.ports = list(ports)
+        self.hotels = list(hotels)
+        self.supply = supply
+        self.capacity = capacity
+        self.costs = costs
+        self.bus_capacity = bus_capacity
+        shape = (len(self.ports), len(self.hotels))
+        if supply.shape != shape[:1] or capacity.shape != shape[1:] or costs.shape != shape:
+            raise ValueError(f"Array shapes {supply.shape}, {capacity.shape}, {costs.shape} "
+                             f"do not match {shape[0]} ports and {shape[1]} hotels")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Convert an instance in the dictionary format of HajjData"""
+        ports = list(data['ports'].keys())
+        hotels = list(data['hotels'].keys())
+        costs = np.fromiter((data['costs'][(port, hotel)] for port in ports for hotel in hotels),
+                            dtype=float, count=len(ports) * len(hotels))
+        return cls(ports, hotels,
+                   np.fromiter(data['ports'].values(), dtype=float, count=len(ports)),
+                   np.fromiter(data['hotels'].values(), dtype=float, count=len(hotels)),
+                   costs.reshape(len(ports), len(hotels)), data['bus_capacity'])
+
+    def to_dict(self):
+        """Instance in the dictionary format of HajjData (slow for large instances)"""
+        pairs = [(port, hotel) for port in self.ports for hotel in self.hotels]
+        return {
+            'ports': dict(zip(self.ports, self.supply.tolist())),
+            'hotels': dict(zip(self.hotels, self.capacity.tolist())),
+            'bus_capacity': self.bus_capacity,
+            'costs': dict(zip(pairs, np.ravel(self.costs).tolist())),
+        }
+
+
+def _write_names(path, names):
+    with open(path, 'w', encoding='utf-8') as f:
+        for name in names:
+            if '\n' in name:
+                raise ValueError(f"Name {name!r} contains a line break")
+            f.write(name + '\n')
+
+
+def _read_names(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def _write_meta(directory, n_ports, n_hotels, bus_capacity):
+    meta = {'version': FORMAT_VERSION, 'n_ports': n_ports, 'n_hotels': n_hotels,
+            'bus_capacity': bus_capacity}
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+def save_instance(instance, directory):
+    """
+    Write an instance as a directory of meta.json, ports.txt/hotels.txt name
+    tables and supply/capacity/costs .npy arrays
+    Args:
+        instance: ArrayInstance or instance dictionary
+        directory: Output directory, created if needed
+    """
+    if isinstance(instance, dict):
+        instance = ArrayInstance.from_dict(instance)
+    os.makedirs(directory, exist_ok=True)
+    _write_names(os.path.join(directory, 'ports.txt'), instance.ports)
+    _write_names(os.path.join(directory, 'hotels.txt'), instance.hotels)
+    for name in ARRAYS:
+        np.save(os.path.join(directory, f'{name}.npy'),
+                np.ascontiguousarray(getattr(instance, name), dtype=float))
+    _write_meta(directory, len(instance.ports), len(instance.hotels), instance.bus_capacity)
+
+
+def load_instance(directory, mmap=True):
+    """
+    Read an instance written by save_instance or import_csv
+    Args:
+        directory: Instance directory
+        mmap: Memory-map the arrays read-only instead of reading them into memory
+    Returns:
+        ArrayInstance
+    """
+    with open(os.path.join(directory, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported instance format version {meta.get('version')}")
+    arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r' if mmap else None)
+              for name in ARRAYS}
+    return ArrayInstance(_read_names(os.path.join(directory, 'ports.txt')),
+                         _read_names(os.path.join(directory, 'hotels.txt')),
+                         arrays['supply'], arrays['capacity'], arrays['costs'], meta['bus_capacity'])
+
+
+def _read_table(path):
+    """Two-column CSV with a header row: names and values"""
+    with open(path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))[1:]
+    return [row[0] for row in rows], np.array([float(row[1]) for row in rows])
+
+
+def _import_arrays(directory, ports, hotels, supply, capacity, costs_csv, chunk_rows):
+    """Write the name tables and arrays of import_csv, filling costs.npy chunk by chunk"""
+    port_index = {port: i for i, port in enumerate(ports)}
+    hotel_index = {hotel: j for j, hotel in enumerate(hotels)}
+    _write_names(os.path.join(directory, 'ports.txt'), ports)
+    _write_names(os.path.join(directory, 'hotels.txt'), hotels)
+    np.save(os.path.join(directory, 'supply.npy'), supply)
+    np.save(os.path.join(directory, 'capacity.npy'), capacity)
+
+    costs = np.lib.format.open_memmap(os.path.join(directory, 'costs.npy'), mode='w+',
+                                      dtype=np.float64, shape=(len(ports), len(hotels)))
+    costs[...] = np.nan
+    with open(costs_csv, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        while True:
+            chunk = [row for _, row in zip(range(chunk_rows), reader)]
+            if not chunk:
+                break
+            try:
+                rows = [port_index[row[0]] for row in chunk]
+                cols = [hotel_index[row[1]] for row in chunk]
+            except KeyError as error:
+                raise ValueError(f"Cost row for unknown port or hotel {error}") from None
+            # A pair seen in an earlier chunk already has a cost, one seen twice in
+            # this chunk repeats its flat index
+            pairs = np.array(rows, dtype=np.int64) * len(hotels) + np.array(cols, dtype=np.int64)
+            unique, counts = np.unique(pairs, return_counts=True)
+            repeated = np.concatenate([unique[counts > 1], pairs[~np.isnan(costs[rows, cols])]])
+            if len(repeated):
+                i, j = divmod(int(repeated[0]), len(hotels))
+                raise ValueError(f"{costs_csv} has more than one cost for {ports[i]},{hotels[j]}")
+            costs[rows, cols] = np.array([row[2] for row in chunk], dtype=float)
+    missing = int(np.isnan(costs).sum())
+    costs.flush()
+    del costs
+    if missing:
+        raise ValueError(f"{costs_csv} has no cost for {missing} port/hotel pairs")
+
+
+def import_csv(ports_csv, hotels_csv, costs_csv, directory, bus_capacity, chunk_rows=100000):
+    """
+    Convert CSV files into the array format, streaming the cost file in chunks
+    straight into a memory-mapped costs.npy
+    Args:
+        ports_csv: CSV with a header row and port,supply rows
+        hotels_csv: CSV with a header row and hotel,capacity rows
+        costs_csv: CSV with a header row and port,hotel,cost rows; every pair must
+                   appear exactly once
+        directory: Output directory, created if needed; a failed import leaves
+                   it as it was
+        bus_capacity: Pilgrims that can travel between any port and hotel
+        chunk_rows: Cost rows parsed per chunk
+    Returns:
+        The imported ArrayInstance, memory-mapped from directory
+    """
+    ports, supply = _read_table(ports_csv)
+    hotels, capacity = _read_table(hotels_csv)
+    # Everything is written to a staging directory next to the output and moved
+    # in once complete, so a failed import never leaves a loadable partial instance
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.import-', dir=parent)
+    try:
+        _import_arrays(staging, ports, hotels, supply, capacity, costs_csv, chunk_rows)
+        _write_meta(staging, len(ports), len(hotels), bus_capacity)
+        os.makedirs(directory, exist_ok=True)
+        for name in INSTANCE_FILES:  # meta.json last
+            os.replace(os.path.join(staging, name), os.path.join(directory, name))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return load_instance(directory)
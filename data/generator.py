@@ -0,0 +1,129 @@
+# data/generator.py
+
+import numpy as np
+from data.array_instance import ArrayInstance
+
+# Gateways pilgrims arrive through: (name, latitude, longitude, share of arrivals)
+GATEWAYS = [
+    ('Jeddah_Airport', 21.68, 39.16, 0.45),
+    ('Madinah_Airport', 24.55, 39.70, 0.25),
+    ('Taif_Airport', 21.48, 40.54, 0.05),
+    ('Yanbu_Seaport', 24.09, 38.06, 0.10),
+    ('Northern_Border', 28.40, 36.57, 0.15),
+]
+
+# Hotel districts: (name, latitude, longitude, share of hotels)
+CITIES = [
+    ('Makkah', 21.42, 39.83, 0.6),
+    ('Madinah', 24.47, 39.61, 0.4),
+]
+
+
+def _distance_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two sets of points"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+
+def generate_arrays(n_ports, n_hotels, seed=0, load=0.9):
+    """
+    Generate a random port/hotel instance as arrays
+    Ports are scattered around the arrival gateways and hotels around Makkah
+    and Madinah. Costs grow with road distance, with a premium for the better
+    hotels and some noise, so the cheap allocations follow the city clusters.
+    Args:
+        n_ports: Number of ports
+        n_hotels: Number of hotels
+        seed: Random seed; the same seed always gives the same instance
+        load: Total pilgrims as a fraction of total hotel capacity
+    Returns:
+        supply, capacity, costs (ports x hotels) and port/hotel names and coordinates
+    """
+    rng = np.random.default_rng(seed)
+
+    share = np.array([gateway[3] for gateway in GATEWAYS])
+    gateway = rng.choice(len(GATEWAYS), n_ports, p=share / share.sum())
+    if n_ports >= len(GATEWAYS):
+        gateway[:len(GATEWAYS)] = np.arange(len(GATEWAYS))  # every gateway is used
+    port_lat = np.array([GATEWAYS[g][1] for g in gateway]) + rng.normal(0, 0.05, n_ports)
+    port_lon = np.array([GATEWAYS[g][2] for g in gateway]) + rng.normal(0, 0.05, n_ports)
+
+    share = np.array([city[3] for city in CITIES])
+    city = rng.choice(len(CITIES), n_hotels, p=share / share.sum())
+    if n_hotels >= len(CITIES):
+        city[:len(CITIES)] = np.arange(len(CITIES))
+    hotel_lat = np.array([CITIES[c][1] for c in city]) + rng.normal(0, 0.02, n_hotels)
+    hotel_lon = np.array([CITIES[c][2] for c in city]) + rng.normal(0, 0.02, n_hotels)
+    premium = rng.random(n_hotels) < 0.2
+
+    road = 1.3 * _distance_km(port_lat[:, None], port_lon[:, None], hotel_lat[None, :], hotel_lon[None, :])
+    costs = 50 + 0.35 * road + np.where(premium, 40, 0)[None, :] + rng.normal(0, 5, (n_ports, n_hotels))
+    costs = np.round(np.maximum(costs, 10))
+
+    capacity = np.where(premium, rng.integers(150, 301, n_hotels), rng.integers(80, 201, n_hotels))
+    capacity = capacity.astype(float)
+
+    # Arrivals follow the gateway shares; a busy gateway may have more than its buses can carry
+    weights = rng.gamma(2.0, 1.0, n_ports) * np.array([GATEWAYS[g][3] for g in gateway])
+    supply = np.floor(load * capacity.sum() * weights / weights.sum())
+
+    port_names = [f'{GATEWAYS[g][0]}_{i + 1}' for i, g in enumerate(gateway)]
+    hotel_names = [f"{CITIES[c][0]}_{'Premium' if p else 'Standard'}_{j + 1}"
+                   for j, (c, p) in enumerate(zip(city, premium))]
+    locations = {'ports': np.column_stack([port_lat, port_lon]),
+                 'hotels': np.column_stack([hotel_lat, hotel_lon])}
+    return supply, capacity, costs, port_names, hotel_names, locations
+
+
+def generate_instance(n_ports, n_hotels, seed=0, bus_capacity=50, load=0.9, as_arrays=False):
+    """
+    Generate a random instance in the dictionary format of HajjData
+    Args:
+        n_ports: Number of ports
+        n_hotels: Number of hotels
+        seed: Random seed; the same seed always gives the same instance
+        bus_capacity: Pilgrims that can travel between any port and hotel
+        load: Total pilgrims as a fraction of total hotel capacity
+        as_arrays: Return an ArrayInstance instead, which skips building the dictionaries
+    Returns:
+        Instance usable wherever 'small', 'medium' or 'large' is
+    """
+    supply, capacity, costs, ports, hotels, _ = generate_arrays(n_ports, n_hotels, seed, load)
+    if as_arrays:
+        return ArrayInstance(ports, hotels, supply, capacity, costs, bus_capacity)
+    pairs = [(port, hotel) for port in ports for hotel in hotels]
+    return {
+        'ports': dict(zip(ports, supply.tolist())),
+        'hotels': dict(zip(hotels, capacity.tolist())),
+        'bus_capacity': bus_capacity,
+        'costs': dict(zip(pairs, costs.ravel().tolist())),
+    }
+
+
+def generate_arrivals(supply, n_days=14, stay_days=5, seed=0, load=0.7, peak_day=None, spread=None):
+    """
+    Split arrivals over the days of the season
+    Arrivals build up towards peak_day and fall off after it. A port's mean daily
+    arrivals are load * supply / stay_days, so on average the hotels hold load
+    times the single-day supply, and around the peak somewhat more.
+    Args:
+        supply: Pilgrims per port in the single-day model
+        n_days: Days in the horizon
+        stay_days: Days each pilgrim stays in a hotel
+        seed: Random seed
+        load: Mean occupancy as a fraction of the single-day supply
+        peak_day: Busiest day (default: two thirds into the horizon)
+        spread: Standard deviation of the arrival profile in days (default n_days / 4)
+    Returns:
+        Whole-pilgrim arrivals (days x ports)
+    """
+    rng = np.random.default_rng(seed)
+    supply = np.asarray(supply, dtype=float)
+    peak_day = 2 * (n_days - 1) / 3 if peak_day is None else peak_day
+    spread = n_days / 4 if spread is None else spread
+    profile = np.exp(-0.5 * ((np.arange(n_days) - peak_day) / spread) ** 2)
+    totals = np.round(load * supply * n_days / stay_days).astype(np.int64)
+    return np.stack([rng.multinomial(total, profile / profile.sum()) for total in totals],
+                    axis=1).astype(float)
@@ -0,0 +1,208 @@
+# data/multiday.py
+
+import numpy as np
+from sparse import CSRMatrix
+
+
+def _last_bus_rows(group, limit, bus_capacity):
+    """
+    Rows x <= r y + q (bus_capacity - r) over groups of pairs (x and y summed over
+    the group). A group that can take at most limit = q * bus_capacity + r
+    pilgrims (0 < r < bus_capacity) needs a (q + 1)-th bus for the last r. The
+    rows hold for integer buses and cut off the fractional buses of the LP
+    relaxation; groups without a partial bus get no row.
+    Args:
+        group: Group of every pair
+        limit: Pilgrims each group can take at most
+        bus_capacity: Pilgrims per bus
+    Returns:
+        rows, pairs and values of the x then y entries, and the right-hand sides
+    """
+    full, rest = np.divmod(np.asarray(limit, dtype=float), bus_capacity)
+    partial = np.flatnonzero(rest > 0)
+    pairs = np.flatnonzero(rest[group] > 0)
+    rows = np.searchsorted(partial, group[pairs])
+    return (np.concatenate([rows, rows]), pairs,
+            np.concatenate([np.ones(len(pairs)), -rest[group[pairs]]]),
+            full[partial] * (bus_capacity - rest[partial]))
+
+
+class MultiDayInstance:
+    """
+    Port/hotel instance over several days. Pilgrims arrive at the ports day by
+    day and are moved to a hotel on their arrival day, where they stay for
+    stay_days days, so a hotel's occupancy on day t counts the arrivals of days
+    t - stay_days + 1 ... t. Buses are reused every day: every port -> hotel
+    pair needs ceil(pilgrims / bus_capacity) buses and a day's buses may not
+    exceed that day's fleet.
+
+    Day t has the variables x (pilgrims per pair, port-major) followed by y
+    (buses per pair). The days are only linked by the hotel occupancy rows.
+    Pilgrims that are not moved on their arrival day cost unserved_cost each.
+    """
+    def __init__(self, instance, arrivals, stay_days, fleet, bus_cost=0.0, unserved_cost=None):
+        self.instance = instance
+        self.arrivals = np.asarray(arrivals, dtype=float)
+        self.stay_days = int(stay_days)
+        self.fleet = np.broadcast_to(np.asarray(fleet, dtype=float), (len(self.arrivals),))
+        self.bus_cost = float(bus_cost)
+        if unserved_cost is None:
+            unserved_cost = 10.0 * float(np.max(instance.costs))
+        self.unserved_cost = float(unserved_cost)
+        if self.arrivals.ndim != 2 or self.arrivals.shape[1] != len(instance.ports):
+            raise ValueError(f"Arrivals of shape {self.arrivals.shape} do not match "
+                             f"days x {len(instance.ports)} ports")
+        if self.stay_days < 1:
+            raise ValueError("stay_days must be at least 1")
+
+    @property
+    def n_days(self):
+        return len(self.arrivals)
+
+    @property
+    def n_ports(self):
+        return len(self.instance.ports)
+
+    @property
+    def n_hotels(self):
+        return len(self.instance.hotels)
+
+    @property
+    def capacity(self):
+        return np.asarray(self.instance.capacity, dtype=float)
+
+    @property
+    def constant(self):
+        """Objective term left out of the cost vectors: every pilgrim counted as unserved"""
+        return self.unserved_cost * float(self.arrivals.sum())
+
+    def occupancy(self, flows):
+        """
+        Hotel occupancy of every day
+        Args:
+            flows: Pilgrims moved (days x ports x hotels)
+        Returns:
+            Occupancy (days x hotels)
+        """
+        arrived = np.zeros((self.n_days + 1, self.n_hotels))
+        np.cumsum(np.asarray(flows, dtype=float).sum(axis=1), axis=0, out=arrived[1:])
+        days = np.arange(self.n_days)
+        return arrived[days + 1] - arrived[np.maximum(days + 1 - self.stay_days, 0)]
+
+    def penalties(self, multipliers):
+        """
+        Cost per pilgrim that the multipliers of the occupancy rows (days x hotels)
+        add to each day's arrivals: the sum over the days of their stay
+        """
+        total = np.zeros((self.n_days + 1, self.n_hotels))
+        np.cumsum(np.asarray(multipliers, dtype=float)[::-1], axis=0, out=total[1:])
+        total = total[::-1]  # total[t] sums the multipliers of days t ... n_days - 1
+        days = np.arange(self.n_days)
+        return total[days] - total[np.minimum(days + self.stay_days, self.n_days)]
+
+    def total_cost(self, flows, buses):
+        """Transport, bus and unserved cost of a plan (days x ports x hotels arrays)"""
+        flows = np.asarray(flows, dtype=float)
+        unserved = self.arrivals - flows.sum(axis=2)
+        return float((flows * self.instance.costs).sum() + self.bus_cost * np.sum(buses) +
+                     self.unserved_cost * unserved.sum())
+
+    def day_matrices(self, day, penalty=None, capacity=None):
+        """
+        Single-day model in the bounds form of HajjData.get_problem_matrices
+        Rows: port arrivals, hotel capacity, x - bus_capacity * y <= 0 for every
+        pair, last-bus rows for the pairs, ports and hotels that cannot fill
+        their last bus and the day's fleet.
+        Args:
+            day: Day index
+            penalty: Extra cost per pilgrim at every hotel (e.g. from penalties())
+            capacity: Beds available to the day's arrivals (defaults to the hotels' capacity)
+        Returns:
+            A (CSRMatrix), b, c, lb, ub; c x + constant term of the day is its cost
+        """
+        n_ports, n_hotels = self.n_ports, self.n_hotels
+        n_pairs = n_ports * n_hotels
+        capacity = self.capacity if capacity is None else np.maximum(np.asarray(capacity, dtype=float), 0)
+        arrivals = self.arrivals[day]
+        bus_capacity = float(self.instance.bus_capacity)
+
+        flow_ub = np.minimum(arrivals[:, None], capacity[None, :]).ravel()
+        bus_ub = np.minimum(np.ceil(flow_ub / bus_capacity), self.fleet[day])
+
+        pair = np.arange(n_pairs)
+        port_of, hotel_of = np.divmod(pair, n_hotels)
+        link_row = n_ports + n_hotels + pair
+        rows = [port_of, n_ports + hotel_of, link_row, link_row]
+        cols = [pair, pair, pair, n_pairs + pair]
+        values = [np.ones(3 * n_pairs), np.full(n_pairs, -bus_capacity)]
+        b = [arrivals, capacity, np.zeros(n_pairs)]
+
+        # Last-bus rows for every pair, port and hotel
+        n_rows = n_ports + n_hotels + n_pairs
+        for group, limit in ((pair, flow_ub), (port_of, arrivals), (hotel_of, capacity)):
+            group_rows, group_cols, group_values, rhs = _last_bus_rows(group, limit, bus_capacity)
+            rows.append(n_rows + group_rows)
+            cols.append(np.concatenate([group_cols, n_pairs + group_cols]))
+            values.append(group_values)
+            b.append(rhs)
+            n_rows += len(rhs)
+
+        rows.append(np.full(n_pairs, n_rows))
+        cols.append(n_pairs + pair)
+        values.append(np.ones(n_pairs))
+        b.append([self.fleet[day]])
+        A = CSRMatrix.from_coo(np.concatenate(rows), np.concatenate(cols), np.concatenate(values),
+                               (n_rows + 1, 2 * n_pairs))
+        b = np.concatenate(b)
+
+        flow_cost = np.asarray(self.instance.costs, dtype=float) - self.unserved_cost
+        if penalty is not None:
+            flow_cost = flow_cost + np.asarray(penalty, dtype=float)[None, :]
+        c = np.concatenate([flow_cost.ravel(), np.full(n_pairs, self.bus_cost)])
+        return A, b, c, np.zeros(2 * n_pairs), np.concatenate([flow_ub, bus_ub])
+
+    def problem_matrices(self):
+        """
+        Whole-horizon model: the day models side by side plus one occupancy row
+        per day and hotel. Too large for Branch and Bound beyond a few days; it
+        is meant for checking the decomposition on small instances.
+        Returns:
+            A (CSRMatrix), b, c, lb, ub; c x + constant is the total cost
+        """
+        n_pairs = self.n_ports * self.n_hotels
+        n_day_vars = 2 * n_pairs
+        rows, cols, values, bs, cs, lbs, ubs = [], [], [], [], [], [], []
+        offset = 0
+        for day in range(self.n_days):
+            A, b, c, lb, ub = self.day_matrices(day)
+            rows.append(A.row_ids + offset)
+            cols.append(A.indices + day * n_day_vars)
+            values.append(A.data)
+            bs.append(b)
+            cs.append(c)
+            lbs.append(lb)
+            ubs.append(ub)
+            offset += A.shape[0]
+
+        # Occupancy of hotel j on day t: the flows into j of the stay window ending at t
+        hotel_of = np.arange(n_pairs) % self.n_hotels
+        for t in range(self.n_days):
+            for day in range(max(0, t - self.stay_days + 1), t + 1):
+                rows.append(offset + t * self.n_hotels + hotel_of)
+                cols.append(day * n_day_vars + np.arange(n_pairs))
+                values.append(np.ones(n_pairs))
+        bs.append(np.tile(self.capacity, self.n_days))
+        n_rows = offset + self.n_days * self.n_hotels
+
+        A = CSRMatrix.from_coo(np.concatenate(rows), np.concatenate(cols), np.concatenate(values),
+                               (n_rows, self.n_days * n_day_vars))
+        return A, np.concatenate(bs), np.concatenate(cs), np.concatenate(lbs), np.concatenate(ubs)
+
+    def split(self, point):
+        """
+        Flows and buses of a whole-horizon point (as ordered by problem_matrices)
+        Returns:
+            flows, buses (days x ports x hotels)
+        """
+        blocks = np.asarray(point, dtype=float).reshape(self.n_days, 2, self.n_ports, self.n_hotels)
+        return blocks[:, 0], blocks[:, 1]
@@ -1,6 +1,37 @@
 # data/sample_data.py
 
+import os
 import numpy as np
+from data.array_instance import ArrayInstance, load_instance
+from data.multiday import MultiDayInstance
+from sparse import CSRMatrix
+
+
+def max_service(supply, capacity, bus_capacity):
+    """
+    Most pilgrims that can be moved when every port -> hotel pair carries at
+    most bus_capacity: the max flow of the port/hotel network. With the ports
+    on the source side of a cut ordered by supply, the minimum cut over k
+    source-side ports is the supply of the others plus min(capacity, k * bus
+    capacity) for every hotel.
+    Args:
+        supply: Pilgrims at every port
+        capacity: Beds at every hotel
+        bus_capacity: Pilgrims that can travel between any port and hotel
+    Returns:
+        The max flow, min(total supply, total capacity) when the buses never bind
+    """
+    supply = np.sort(np.asarray(supply, dtype=float))[::-1]
+    capacity = np.sort(np.asarray(capacity, dtype=float))
+    k = np.arange(len(supply) + 1)
+    others = supply.sum() - np.concatenate([[0.0], np.cumsum(supply)])
+    # sum_j min(capacity_j, t) for t = k * bus capacity, from the sorted capacities
+    # A bus capacity above the total capacity never binds; capping it keeps an infinite one finite
+    limit = k * min(float(bus_capacity), capacity.sum() + 1.0)
+    below = np.searchsorted(capacity, limit, side='right')
+    filled = np.concatenate([[0.0], np.cumsum(capacity)])[below] + limit * (len(capacity) - below)
+    return float((others + filled).min())
+
 
 class HajjData:
     def __init__(self):
@@ -114,60 +145,198 @@ class HajjData:
             }
         }
 
-    def get_problem_matrices(self, example='small'):
+    def get_example(self, example='small'):
         """
-        Convert the dictionary format to matrices for optimization
+        Look up an example by name
         Args:
-            example: 'small', 'medium', or 'large'
+            example: 'small', 'medium', 'large', an instance dictionary in the same format,
+                     an ArrayInstance or the directory of a saved array instance
         Returns:
-            A, b, c (constraint matrices and cost vector)
+            The instance dictionary, or the ArrayInstance for array instances
         """
+        if isinstance(example, (dict, ArrayInstance)):
+            return example
+        if example not in ('small', 'medium', 'large') and os.path.isdir(example):
+            return load_instance(example)
         if example == 'small':
-            data = self.small_example
+            return self.small_example
         elif example == 'medium':
-            data = self.medium_example
+            return self.medium_example
         else:
-            data = self.large_example
+            return self.large_example
+
+    def as_arrays(self, example='small'):
+        """
+        Look up an example as an ArrayInstance
+        Args:
+            example: Anything get_example accepts
+        Returns:
+            ArrayInstance; array instances are returned as is, without copying
+        """
+        data = self.get_example(example)
+        if isinstance(data, ArrayInstance):
+            return data
+        return ArrayInstance.from_dict(data)
+
+    def get_names(self, example='small'):
+        """Port and hotel names, in the order of the model's rows and variables"""
+        instance = self.as_arrays(example)
+        return instance.ports, instance.hotels
+
+    def get_transport_problem(self, example='small'):
+        """
+        Convert the dictionary format to the arrays used by the transportation solver
+        Args:
+            example: Anything get_example accepts
+        Returns:
+            supply, capacity, costs (ports x hotels) and the bus capacity; for array
+            instances these are the stored (possibly memory-mapped) arrays
+        """
+        instance = self.as_arrays(example)
+        return instance.supply, instance.capacity, instance.costs, instance.bus_capacity
+
+    def get_problem_matrices(self, example='small', sparse=False, bounds=False):
+        """
+        Convert the dictionary format to matrices for optimization
+        Args:
+            example: Anything get_example accepts; for array instances c is a
+                     read-only view of the stored cost matrix
+            sparse: Return A as a CSRMatrix, built without any dense intermediate
+            bounds: Express bus capacity and non-negativity as per-variable
+                    bounds lb <= x <= ub instead of constraint rows
+        Returns:
+            A, b, c (constraint matrices and cost vector), followed by lb, ub when bounds is set
+        """
+        instance = self.as_arrays(example)
 
-        ports = list(data['ports'].keys())
-        hotels = list(data['hotels'].keys())
-        n_ports = len(ports)
-        n_hotels = len(hotels)
+        n_ports = len(instance.ports)
+        n_hotels = len(instance.hotels)
         n_variables = n_ports * n_hotels
 
-        # Create cost vector
-        c = np.zeros(n_variables)
-        for i, port in enumerate(ports):
-            for j, hotel in enumerate(hotels):
-                c[i * n_hotels + j] = data['costs'][(port, hotel)]
+        # Cost vector: variable i * n_hotels + j is the port i -> hotel j flow
+        c = instance.costs.reshape(n_variables)
+
+        b_port = np.asarray(instance.supply, dtype=float)
+        b_hotel = np.asarray(instance.capacity, dtype=float)
+        b_bus = np.full(n_variables, float(instance.bus_capacity))
+        b_nonneg = np.zeros(n_variables)
+        # Without this row the cheapest plan is to move nobody; the buses may
+        # limit how many can move below what the ports and hotels allow
+        b_service = -np.array([max_service(b_port, b_hotel, instance.bus_capacity)])
 
         # Create constraint matrix A and vector b
         # Constraints:
         # 1. Port capacity constraints
         # 2. Hotel capacity constraints
-        # 3. Bus capacity constraints
-        A_port = np.zeros((n_ports, n_variables))
-        A_hotel = np.zeros((n_hotels, n_variables))
-        A_bus = np.eye(n_variables)  # Bus capacity constraints
+        # 3. Bus capacity constraints (or ub when bounds is set)
+        # 4. Non-negativity of every flow (or lb when bounds is set)
+        # 5. Service constraint: move as many pilgrims as ports, hotels and buses allow
+        if sparse:
+            A = self._sparse_constraints(n_ports, n_hotels, bounds)
+        else:
+            A_port = np.zeros((n_ports, n_variables))
+            A_hotel = np.zeros((n_hotels, n_variables))
+            A_service = -np.ones((1, n_variables))
 
-        b_port = np.zeros(n_ports)
-        b_hotel = np.zeros(n_hotels)
-        b_bus = np.ones(n_variables) * data['bus_capacity']
+            # Fill port constraints
+            for i in range(n_ports):
+                A_port[i, i * n_hotels:(i + 1) * n_hotels] = 1
 
-        # Fill port constraints
-        for i, port in enumerate(ports):
+            # Fill hotel constraints
             for j in range(n_hotels):
-                A_port[i, i * n_hotels + j] = 1
-            b_port[i] = data['ports'][port]
+                A_hotel[j, j::n_hotels] = 1
 
-        # Fill hotel constraints
-        for j, hotel in enumerate(hotels):
-            for i in range(n_ports):
-                A_hotel[j, i * n_hotels + j] = 1
-            b_hotel[j] = data['hotels'][hotel]
+            if bounds:
+                A = np.vstack([A_port, A_hotel, A_service])
+            else:
+                A_bus = np.eye(n_variables)  # Bus capacity constraints
+                A_nonneg = -np.eye(n_variables)
+                A = np.vstack([A_port, A_hotel, A_bus, A_nonneg, A_service])
 
         # Combine all constraints
-        A = np.vstack([A_port, A_hotel, A_bus])
-        b = np.concatenate([b_port, b_hotel, b_bus])
-
+        if bounds:
+            b = np.concatenate([b_port, b_hotel, b_service])
+            return A, b, c, b_nonneg, b_bus
+        b = np.concatenate([b_port, b_hotel, b_bus, b_nonneg, b_service])
         return A, b, c
+
+    def get_multiday_problem(self, example='small', arrivals=None, n_days=14, stay_days=5,
+                             fleet=None, bus_cost=0.0, unserved_cost=None, seed=0):
+        """
+        Time-indexed version of an example: daily arrivals, hotel stays that carry
+        occupancy over to the next days and a daily bus fleet
+        Args:
+            example: Anything get_example accepts
+            arrivals: Pilgrims arriving at every port (days x ports); by default
+                      generated from the ports' supply with generate_arrivals
+            n_days, seed: Horizon and random seed of the generated arrivals
+            stay_days: Days each pilgrim stays in a hotel
+            fleet: Buses available per day (scalar or one per day); by default
+                   enough to carry the busiest day's arrivals in full buses
+            bus_cost: Cost of using one bus for a day
+            unserved_cost: Cost per pilgrim not moved on arrival (default: 10x the
+                           highest pair cost)
+        Returns:
+            MultiDayInstance; its day_matrices and problem_matrices give the
+            per-day and whole-horizon models
+        """
+        instance = self.as_arrays(example)
+        if arrivals is None:
+            from data.generator import generate_arrivals
+            arrivals = generate_arrivals(instance.supply, n_days, stay_days, seed)
+        arrivals = np.asarray(arrivals, dtype=float)
+        if fleet is None:
+            fleet = np.ceil(arrivals.sum(axis=1).max() / instance.bus_capacity)
+        return MultiDayInstance(instance, arrivals, stay_days, fleet, bus_cost, unserved_cost)
+
+    def get_scenario_rhs(self, example='small', supply=None, capacity=None, bounds=False):
+        """
+        Right-hand sides of get_problem_matrices for many supply/capacity scenarios
+        Args:
+            example: 'small', 'medium', 'large', or an instance dictionary
+            supply: Port supplies, one row per scenario (defaults to the example's)
+            capacity: Hotel capacities, one row per scenario (defaults to the example's)
+            bounds: Match get_problem_matrices(..., bounds=True)
+        Returns:
+            Matrix with one right-hand side b per scenario, in the same row order
+        """
+        base_supply, base_capacity, costs, bus_capacity = self.get_transport_problem(example)
+        supply = np.atleast_2d(base_supply if supply is None else np.asarray(supply, dtype=float))
+        capacity = np.atleast_2d(base_capacity if capacity is None else np.asarray(capacity, dtype=float))
+        n_scenarios = max(len(supply), len(capacity))
+        supply = np.broadcast_to(supply, (n_scenarios, supply.shape[1]))
+        capacity = np.broadcast_to(capacity, (n_scenarios, capacity.shape[1]))
+
+        service = -np.array([[max_service(s, c, bus_capacity)] for s, c in zip(supply, capacity)])
+        blocks = [supply, capacity]
+        if not bounds:
+            n_variables = costs.size
+            blocks += [np.full((n_scenarios, n_variables), float(bus_capacity)),
+                       np.zeros((n_scenarios, n_variables))]
+        return np.hstack(blocks + [service])
+
+    def _sparse_constraints(self, n_ports, n_hotels, bounds):
+        """
+        Constraint matrix of get_problem_matrices as a CSRMatrix, in the same row order
+        The structure is fixed, so the CSR arrays are written directly, in O(nonzeros)
+        """
+        n_variables = n_ports * n_hotels
+        var = np.arange(n_variables)
+        # Port row i holds its hotels' variables, hotel row j every port's variable j
+        indices = [var, var.reshape(n_ports, n_hotels).T.ravel()]
+        values = [np.ones(n_variables), np.ones(n_variables)]
+        row_lengths = [np.full(n_ports, n_hotels), np.full(n_hotels, n_ports)]
+        n_rows = n_ports + n_hotels
+        if not bounds:
+            indices += [var, var]
+            values += [np.ones(n_variables), -np.ones(n_variables)]
+            row_lengths += [np.ones(2 * n_variables, dtype=np.int64)]
+            n_rows += 2 * n_variables
+        indices.append(var)
+        values.append(-np.ones(n_variables))
+        row_lengths.append([n_variables])
+
+        indptr = np.zeros(n_rows + 2, dtype=np.int64)
+        np.cumsum(np.concatenate(row_lengths), out=indptr[1:])
+        return CSRMatrix(np.concatenate(values), np.concatenate(indices), indptr,
+                         (n_rows + 1, n_variables))
@@ -0,0 +1,313 @@
+# decomposition.py
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from branch_and_bound import BranchAndBound, GAP_LIMIT, TIME_LIMIT
+from simplex import OPTIMAL, ITERATION_LIMIT, RevisedSimplex, solve_lp
+from sparse import CSRMatrix
+
+# Status of a solve whose Lagrangian bound has converged short of the best plan's value
+BOUND_CONVERGED = 'bound_converged'
+
+# Status of a solve stopped because the master LP was not solved to optimality
+MASTER_FAILED = 'master_failed'
+
+# Branch and Bound limits of the day models; their bounds keep the Lagrangian bound valid
+DAY_OPTIONS = {'node_limit': 200, 'rel_gap': 1e-3}
+
+# Fractions of the penalties the rolling-horizon repair plans with. The full
+# penalties price beds for the relaxed plans and keep too many pilgrims away
+# from hotels that the residual capacity already protects.
+REPAIR_SCALES = (0.5, 0.75, 0.9)
+
+# Worker-side state, set once per process by _init_worker
+_worker = {}
+
+
+class MultiDayResult:
+    """
+    Plan of a multi-day decomposition solve: flows and buses (days x ports x
+    hotels) of the best feasible plan, its total cost, the Lagrangian lower
+    bound, the status and the (iteration, bound, value) history.
+    """
+    def __init__(self, flows, buses, value, bound, status, iterations, history, multiday):
+        self.flows = flows
+        self.buses = buses
+        self.value = value
+        self.bound = bound
+        self.status = status
+        self.iterations = iterations
+        self.history = history
+        self.unserved = multiday.arrivals - flows.sum(axis=2)
+        self.occupancy = multiday.occupancy(flows)
+
+    @property
+    def gap(self):
+        """Relative gap between the plan's cost and the lower bound"""
+        return (self.value - self.bound) / max(1.0, abs(self.value))
+
+
+def greedy_buses(flow_cost, bus_cost, arrivals, capacity, bus_capacity, fleet):
+    """
+    Fill the day's fleet one bus at a time, each bus on the pair where it saves
+    the most: cost times the pilgrims it can still carry there, plus its bus cost
+    Args:
+        flow_cost: Cost per pilgrim moved (ports x hotels), negative where moving pays
+        bus_cost: Cost per bus
+        arrivals, capacity: Pilgrims at every port and beds at every hotel
+        bus_capacity: Pilgrims per bus
+        fleet: Buses available
+    Returns:
+        flows, buses (ports x hotels)
+    """
+    arrivals = np.array(arrivals, dtype=float)
+    capacity = np.array(capacity, dtype=float)
+    flows = np.zeros(flow_cost.shape)
+    buses = np.zeros(flow_cost.shape)
+    for _ in range(int(fleet)):
+        load = np.minimum(np.minimum(arrivals[:, None], capacity[None, :]), bus_capacity)
+        saving = flow_cost * load + bus_cost
+        i, j = np.unravel_index(np.argmin(saving), saving.shape)
+        if saving[i, j] >= 0:
+            break
+        flows[i, j] += load[i, j]
+        buses[i, j] += 1
+        arrivals[i] -= load[i, j]
+        capacity[j] -= load[i, j]
+    return flows, buses
+
+
+def solve_day(multiday, day, penalty=None, capacity=None, options=None):
+    """
+    Solve one day's model with Branch and Bound
+    Args:
+        multiday: MultiDayInstance
+        day: Day index
+        penalty: Extra cost per pilgrim at every hotel
+        capacity: Beds available to the day's arrivals
+        options: Passed to BranchAndBound (e.g. node_limit, rel_gap)
+    Returns:
+        flows, buses (ports x hotels), the objective of the day's model and a
+        lower bound on it
+    """
+    A, b, c, lb, ub = multiday.day_matrices(day, penalty, capacity)
+    n_pairs = len(c) // 2
+    beds = multiday.capacity if capacity is None else np.maximum(capacity, 0)
+    flows, buses = greedy_buses(c[:n_pairs].reshape(multiday.n_ports, multiday.n_hotels),
+                                multiday.bus_cost, multiday.arrivals[day], beds,
+                                multiday.instance.bus_capacity, multiday.fleet[day])
+    result = BranchAndBound(solve_lp, {'A': A, 'b': b, 'lb': lb, 'ub': ub}, c,
+                            initial_solution=np.concatenate([flows.ravel(), buses.ravel()]),
+                            **(options or {})).solve()
+    point = result.point if result.point is not None else np.zeros(len(c))
+    flows, buses = np.asarray(point).reshape(2, multiday.n_ports, multiday.n_hotels)
+    return flows, buses, float(c @ point), float(result.bound)
+
+
+def rolling_horizon(multiday, penalties=None, options=None):
+    """
+    Plan the days in order, each one with the beds the earlier days left free
+    over the days of its stay
+    Args:
+        multiday: MultiDayInstance
+        penalties: Extra cost per pilgrim and hotel for every day (days x hotels)
+        options: Passed to BranchAndBound for every day
+    Returns:
+        flows, buses (days x ports x hotels) of a plan that fits the hotels
+    """
+    shape = (multiday.n_days, multiday.n_ports, multiday.n_hotels)
+    flows, buses = np.zeros(shape), np.zeros(shape)
+    for day in range(multiday.n_days):
+        # Beds taken on the days of this stay by arrivals already planned
+        stay = slice(day, min(day + multiday.stay_days, multiday.n_days))
+        taken = multiday.occupancy(flows)[stay].max(axis=0)
+        penalty = None if penalties is None else penalties[day]
+        flows[day], buses[day], _, _ = solve_day(multiday, day, penalty,
+                                                 multiday.capacity - taken, options)
+    return flows, buses
+
+
+def _init_worker(multiday, options):
+    _worker.update(multiday=multiday, options=options)
+
+
+def _solve_day_task(day, penalty):
+    return solve_day(_worker['multiday'], day, penalty, options=_worker['options'])
+
+
+def _rolling_horizon_task(penalties):
+    return rolling_horizon(_worker['multiday'], penalties, _worker['options'])
+
+
+class LagrangianDecomposition:
+    """
+    Lagrangian relaxation of the hotel occupancy rows that link the days
+    With multipliers on the occupancy rows the days separate: each one is a
+    single-day model whose pair costs carry the multipliers of the days the
+    pilgrims would stay, solved independently (in parallel with workers > 1).
+    The sum of the day bounds gives a lower bound on the whole horizon.
+
+    The multipliers come from a small master LP that mixes the day plans found
+    so far (at most one unit of plans per day) under the occupancy rows; its row
+    prices are the next multipliers. This is the cutting-plane method on the
+    Lagrangian dual and converges in far fewer rounds than subgradient steps.
+    Feasible plans come from a rolling-horizon pass that solves the days in
+    order, each one with the beds left by the days already planned, using the
+    current multipliers to steer away from hotels that fill up later.
+
+    It is meant for long horizons and is not a speedup at small ones: a
+    monolithic MILP solver on problem_matrices can be much faster there (0.6 s
+    against 8.5 s for 'large' over 7 days in one measurement with HiGHS; the
+    ratio depends on the machine and the day-model limits).
+    """
+    def __init__(self, multiday, workers=1, max_iterations=50, rel_gap=1e-3, time_limit=None,
+                 repair_interval=5, subproblem_options=None):
+        self.multiday = multiday
+        self.workers = workers
+        self.max_iterations = max_iterations
+        self.rel_gap = rel_gap
+        self.time_limit = time_limit
+        self.repair_interval = repair_interval
+        self.subproblem_options = DAY_OPTIONS if subproblem_options is None else subproblem_options
+
+        self.multipliers = np.zeros((multiday.n_days, multiday.n_hotels))
+        self.bound = -np.inf
+        self.best_value = np.inf
+        self.best_plan = None
+        self.history = []
+        self._pool = None
+        # Master LP columns: day, cost and hotel totals of every day plan found
+        self._column_days = []
+        self._column_costs = []
+        self._column_totals = []
+
+    def _solve_days(self, penalties):
+        """Solve every day's model under the given penalties (days x hotels)"""
+        days = range(self.multiday.n_days)
+        if self._pool is None:
+            return [solve_day(self.multiday, day, penalty, options=self.subproblem_options)
+                    for day, penalty in zip(days, penalties)]
+        return list(self._pool.map(_solve_day_task, days, penalties))
+
+    def _offer(self, flows, buses):
+        """Keep a plan if it fits the hotels and beats the best one"""
+        if np.any(self.multiday.occupancy(flows) > self.multiday.capacity + 1e-6):
+            return
+        value = self.multiday.total_cost(flows, buses)
+        if value < self.best_value - 1e-9:
+            self.best_value = value
+            self.best_plan = (flows, buses)
+
+    def _add_columns(self, flows, buses):
+        """Add every day's plan (days x ports x hotels) to the master LP"""
+        multiday = self.multiday
+        flow_cost = np.asarray(multiday.instance.costs, dtype=float) - multiday.unserved_cost
+        self._column_days.extend(range(multiday.n_days))
+        self._column_costs.extend(((flows * flow_cost).sum(axis=(1, 2)) +
+                                   multiday.bus_cost * buses.sum(axis=(1, 2))).tolist())
+        self._column_totals.extend(flows.sum(axis=1))
+
+    def _master(self):
+        """
+        Solve the master LP over the day plans found so far
+        Returns:
+            Its value (an upper bound on the Lagrangian dual) and the multipliers
+            (days x hotels) given by its occupancy row prices; None and the
+            current multipliers when the LP is not solved to optimality
+        """
+        multiday = self.multiday
+        n_days, n_hotels = multiday.n_days, multiday.n_hotels
+        days = np.array(self._column_days)
+        totals = np.array(self._column_totals)
+        column = np.arange(len(days))
+
+        # A plan of day s fills its hotels on days s ... s + stay_days - 1
+        rows, cols, values = [n_days * n_hotels + days], [column], [np.ones(len(days))]
+        for offset in range(multiday.stay_days):
+            stays = np.flatnonzero(days + offset < n_days)
+            rows.append(((days[stays] + offset) * n_hotels)[:, None] + np.arange(n_hotels))
+            cols.append(np.repeat(stays, n_hotels))
+            values.append(totals[stays])
+        A = CSRMatrix.from_coo(np.concatenate([r.ravel() for r in rows]), np.concatenate(cols),
+                               np.concatenate([v.ravel() for v in values]),
+                               (n_days * n_hotels + n_days, len(days)))
+        b = np.concatenate([np.tile(multiday.capacity, n_days), np.ones(n_days)])
+        engine = RevisedSimplex(A, b, np.array(self._column_costs), np.zeros(len(days)))
+        result = engine.solve()
+        if result.status != OPTIMAL:
+            return None, self.multipliers
+        prices = -engine.duals()[:n_days * n_hotels]
+        return result.value + multiday.constant, np.maximum(prices, 0).reshape(n_days, n_hotels)
+
+    def _repair(self, penalties):
+        """Offer the rolling-horizon plans under every fraction of the penalties"""
+        scaled = [scale * penalties for scale in REPAIR_SCALES]
+        if self._pool is None:
+            plans = [rolling_horizon(self.multiday, p, self.subproblem_options) for p in scaled]
+        else:
+            plans = self._pool.map(_rolling_horizon_task, scaled)
+        for flows, buses in plans:
+            self._offer(flows, buses)
+
+    def _gap(self):
+        return (self.best_value - self.bound) / max(1.0, abs(self.best_value))
+
+    def solve(self):
+        """
+        Alternate between the day models and the master LP
+        Returns:
+            MultiDayResult
+        """
+        multiday = self.multiday
+        capacity = multiday.capacity
+        start = time.perf_counter()
+        if self.workers is not None and self.workers > 1:
+            self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                             initargs=(multiday, self.subproblem_options))
+        try:
+            self._offer(*rolling_horizon(multiday, options=self.subproblem_options))
+            if self.best_plan is None:
+                # Moving nobody always fits the hotels
+                empty = np.zeros((multiday.n_days, multiday.n_ports, multiday.n_hotels))
+                self._offer(empty, empty)
+            status, iteration = ITERATION_LIMIT, 0
+            for iteration in range(1, self.max_iterations + 1):
+                penalties = multiday.penalties(self.multipliers)
+                days = self._solve_days(penalties)
+                flows = np.stack([day[0] for day in days])
+                buses = np.stack([day[1] for day in days])
+                rent = float((self.multipliers * capacity[None, :]).sum())
+                self.bound = max(self.bound, sum(day[3] for day in days) + multiday.constant - rent)
+                value = sum(day[2] for day in days) + multiday.constant - rent
+
+                self._offer(flows, buses)
+                if iteration % self.repair_interval == 0:
+                    self._repair(penalties)
+                self._add_columns(flows, buses)
+                master_value, self.multipliers = self._master()
+                self.history.append((iteration, self.bound, self.best_value))
+
+                if self._gap() <= max(self.rel_gap, 1e-9):
+                    status = OPTIMAL if self._gap() <= 1e-9 else GAP_LIMIT
+                    break
+                if master_value is None:
+                    # Without new prices the next days would repeat this iteration
+                    status = MASTER_FAILED
+                    break
+                if master_value - value <= 1e-6 * max(1.0, abs(master_value)):
+                    # No day plan improves the master: the bound cannot rise further
+                    status = BOUND_CONVERGED
+                    break
+                if self.time_limit is not None and time.perf_counter() - start >= self.time_limit:
+                    status = TIME_LIMIT
+                    break
+            if status != OPTIMAL and iteration % self.repair_interval:
+                self._repair(multiday.penalties(self.multipliers))
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+        flows, buses = self.best_plan
+        return MultiDayResult(flows, buses, self.best_value, min(self.bound, self.best_value),
+                              status, iteration, self.history, multiday)
@@ -0,0 +1,206 @@
+# heuristics.py
+import numpy as np
+from sparse import CSRMatrix
+from transport import vogel_initial_solution
+
+
+def _whole(supply, capacity, costs, arc_capacity):
+    """Port/hotel data as arrays, with the amounts rounded down to whole pilgrims"""
+    costs = np.asarray(costs, dtype=float)
+    supply = np.floor(np.asarray(supply, dtype=float) + 1e-9)
+    capacity = np.floor(np.asarray(capacity, dtype=float) + 1e-9)
+    arc_capacity = np.floor(np.broadcast_to(np.asarray(arc_capacity, dtype=float), costs.shape) + 1e-9)
+    return supply, capacity, costs, arc_capacity
+
+
+def _augment(flows, supply, capacity, arc_capacity):
+    """
+    Route pilgrims a heuristic left at their port along augmenting paths
+    (port -> hotel, back to a port that sends to that hotel, -> another hotel ...)
+    until they reach a hotel with spare beds or no such path exists
+    """
+    n_ports, n_hotels = flows.shape
+    supply_left = supply - flows.sum(axis=1)
+    capacity_left = capacity - flows.sum(axis=0)
+    while supply_left.max(initial=0) > 0 and capacity_left.max(initial=0) > 0:
+        # Breadth-first search; a port's parent is the hotel it was reached from (-1 for a start)
+        port_parent = np.full(n_ports, -2)
+        hotel_parent = np.full(n_hotels, -1)
+        frontier = np.flatnonzero(supply_left > 0)
+        port_parent[frontier] = -1
+        end = None
+        while len(frontier):
+            rows, hotels = np.nonzero((flows[frontier] < arc_capacity[frontier]) & (hotel_parent < 0))
+            hotels, first = np.unique(hotels, return_index=True)
+            hotel_parent[hotels] = frontier[rows[first]]
+            spare = hotels[capacity_left[hotels] > 0]
+            if len(spare):
+                end = spare[0]
+                break
+            ports, cols = np.nonzero((flows[:, hotels] > 0) & (port_parent == -2)[:, None])
+            ports, first = np.unique(ports, return_index=True)
+            port_parent[ports] = hotels[cols[first]]
+            frontier = ports
+        if end is None:
+            break
+
+        path = []  # (port, hotel, +1 to add flow or -1 to remove it)
+        j = end
+        while True:
+            i = hotel_parent[j]
+            path.append((i, j, 1))
+            if port_parent[i] == -1:
+                break
+            j = port_parent[i]
+            path.append((i, j, -1))
+        amount = min(supply_left[i], capacity_left[end],
+                     min(arc_capacity[p, h] - flows[p, h] if sign > 0 else flows[p, h]
+                         for p, h, sign in path))
+        for p, h, sign in path:
+            flows[p, h] += sign * amount
+        supply_left[i] -= amount
+        capacity_left[end] -= amount
+    return flows
+
+
+def greedy_allocation(supply, capacity, costs, arc_capacity=np.inf):
+    """
+    Cheapest-arc greedy: fill the port -> hotel pairs in order of increasing cost,
+    then route any pilgrims left at a port along augmenting paths
+    Args:
+        supply: Pilgrims at every port
+        capacity: Beds at every hotel
+        costs: Cost per pilgrim (ports x hotels)
+        arc_capacity: Pilgrims the buses can carry on every pair
+    Returns:
+        Whole-pilgrim allocation (ports x hotels)
+    """
+    supply, capacity, costs, arc_capacity = _whole(supply, capacity, costs, arc_capacity)
+    flows = np.zeros(costs.shape)
+    supply_left, capacity_left = supply.copy(), capacity.copy()
+    remaining = min(supply.sum(), capacity.sum())
+    n_hotels = costs.shape[1]
+    for index in np.argsort(costs, axis=None, kind='stable'):
+        if remaining <= 0:
+            break
+        i, j = divmod(int(index), n_hotels)
+        amount = min(supply_left[i], capacity_left[j], arc_capacity[i, j])
+        if amount > 0:
+            flows[i, j] = amount
+            supply_left[i] -= amount
+            capacity_left[j] -= amount
+            remaining -= amount
+    return _augment(flows, supply, capacity, arc_capacity)
+
+
+def vogel_allocation(supply, capacity, costs, arc_capacity=np.inf):
+    """
+    Vogel's approximation on the port -> hotel problem, balanced with a dummy
+    port or hotel at zero cost, then augmenting paths for any pilgrims left at a port
+    Args:
+        supply: Pilgrims at every port
+        capacity: Beds at every hotel
+        costs: Cost per pilgrim (ports x hotels)
+        arc_capacity: Pilgrims the buses can carry on every pair
+    Returns:
+        Whole-pilgrim allocation (ports x hotels)
+    """
+    supply, capacity, costs, arc_capacity = _whole(supply, capacity, costs, arc_capacity)
+    n_ports, n_hotels = costs.shape
+    excess = supply.sum() - capacity.sum()
+    rows, cols = n_ports + (excess < 0), n_hotels + (excess > 0)
+    balanced_costs = np.zeros((rows, cols))
+    balanced_costs[:n_ports, :n_hotels] = costs
+    balanced_capacity = np.full((rows, cols), np.inf)
+    balanced_capacity[:n_ports, :n_hotels] = arc_capacity
+    balanced_supply, balanced_demand = supply, capacity
+    if excess < 0:
+        balanced_supply = np.append(supply, -excess)
+    elif excess > 0:
+        balanced_demand = np.append(capacity, excess)
+    flows = vogel_initial_solution(balanced_supply, balanced_demand, balanced_costs, balanced_capacity)[0]
+    return _augment(flows[:n_ports, :n_hotels].copy(), supply, capacity, arc_capacity)
+
+
+def initial_allocation(supply, capacity, costs, arc_capacity=np.inf):
+    """
+    Best of the greedy and Vogel allocations: the one that moves the most
+    pilgrims, then the cheaper one
+    Returns:
+        Whole-pilgrim allocation (ports x hotels); ravel() gives the variable
+        order of HajjData.get_problem_matrices
+    """
+    costs = np.asarray(costs, dtype=float)
+    candidates = [greedy_allocation(supply, capacity, costs, arc_capacity),
+                  vogel_allocation(supply, capacity, costs, arc_capacity)]
+    return min(candidates, key=lambda flows: (-flows.sum(), float((costs * flows).sum())))
+
+
+def _nonzeros(A):
+    """Row, column and value of every nonzero of a dense or CSR matrix"""
+    if isinstance(A, CSRMatrix):
+        return A.row_ids, A.indices, A.data
+    A = np.asarray(A, dtype=float)
+    rows, cols = np.nonzero(A)
+    return rows, cols, A[rows, cols]
+
+
+def repair_solution(A, b, lb, ub, cost, point, max_moves=None, tol=1e-6):
+    """
+    Round a point to integers and shift single variables until A x <= b holds
+    Each move takes the most violated row and changes the variable that reduces
+    its violation at the smallest cost per unit, by as much as is needed
+    without leaving the bounds or violating a satisfied row.
+    Args:
+        A, b: Constraints A x <= b (A dense or CSRMatrix)
+        lb, ub: Variable bounds
+        cost: Cost vector c, used to choose between moves
+        point: Point to round, e.g. an LP solution or a heuristic allocation
+        max_moves: Moves to try before giving up (default 10 per row)
+    Returns:
+        Integral feasible point, or None when the repair gets stuck
+    """
+    b = np.asarray(b, dtype=float)
+    cost = np.asarray(cost, dtype=float)
+    lb = np.ceil(np.asarray(lb, dtype=float) - tol)
+    ub = np.floor(np.asarray(ub, dtype=float) + tol)
+    rows, cols, vals = _nonzeros(A)
+    x = np.clip(np.round(np.asarray(point, dtype=float)), lb, ub)
+    slack = b - A @ x
+    violation_tol = tol * np.maximum(1.0, np.abs(b))
+    if max_moves is None:
+        max_moves = 10 * len(b) + 100
+
+    for _ in range(max_moves):
+        violated = slack < -violation_tol
+        if not violated.any():
+            return x
+        i = int(np.argmin(np.where(violated, slack, np.inf)))
+
+        in_row = rows == i
+        candidates, coefficients = cols[in_row], vals[in_row]
+        direction = -np.sign(coefficients)
+        room = np.where(direction > 0, ub[candidates] - x[candidates], x[candidates] - lb[candidates])
+        need = np.ceil(-slack[i] / np.abs(coefficients) - tol)
+
+        # Rows whose slack a candidate would use up limit how far it can move
+        moves = np.zeros(len(cost))
+        moves[candidates] = direction
+        effect = vals * moves[cols]
+        tight = (effect > 0) & (rows != i)
+        limit = np.full(len(cost), np.inf)
+        row_limit = np.where(violated[rows[tight]], 0.0,
+                             np.floor(np.maximum(slack[rows[tight]], 0.0) / effect[tight] + tol))
+        np.minimum.at(limit, cols[tight], row_limit)
+
+        step = np.minimum(np.minimum(need, room), limit[candidates])
+        usable = np.flatnonzero(step >= 1)
+        if len(usable) == 0:
+            return None
+        score = cost[candidates[usable]] * direction[usable] / np.abs(coefficients[usable])
+        k = usable[np.argmin(score)]
+        j, delta = candidates[k], step[k] * direction[k]
+        x[j] += delta
+        in_column = cols == j
+        slack[rows[in_column]] -= vals[in_column] * delta
+    return None
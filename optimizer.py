@@ -1,7 +1,10 @@
 # optimizer.py
 import numpy as np
-import matplotlib.pyplot as plt
 from itertools import combinations
+from simplex import solve_lp
+from transport import TransportationSolver
+from branch_and_bound import BranchAndBound
+from branch_and_cut import BranchAndCut
 
 class Optimizer:
     def __init__(self):
@@ -37,118 +40,131 @@ class Optimizer:
                 
         return np.array(points)
 
-    def optimizerLP(self, constraints, cost):
+    def optimizerLP(self, constraints, cost, basis=None):
         """
-        Solve Linear Programming problem using Vertex Enumeration
+        Solve Linear Programming problem using the bounded-variable revised simplex method
         Args:
-            constraints: Dictionary containing A and b
+            constraints: Dictionary containing A (dense or CSRMatrix) and b, and optionally
+                         lb/ub variable bounds
             cost: Cost vector c
+            basis: Optional basis of an earlier solve of the same rows to warm-start from
         Returns:
-            optimal_point, optimal_value
+            optimal_point, optimal_value (an LPResult that also carries status and basis)
         """
-        # Find all feasible vertices
-        vertices = self.intersections(constraints)
-        
-        if len(vertices) == 0:
-            return None, None
-        
-        # Evaluate cost at each vertex
-        costs = np.dot(vertices, cost)
-        
-        # Find minimum cost and corresponding point
-        min_idx = np.argmin(costs)
-        return vertices[min_idx], costs[min_idx]
+        return solve_lp(constraints, cost, basis)
+
+    def optimizerTransport(self, supply, capacity, costs, arc_capacity=None):
+        """
+        Solve the port -> hotel transportation problem with the transportation simplex
+        The model is totally unimodular, so the optimum is integral without Branch and Bound.
+        Args:
+            supply: Pilgrims at every port
+            capacity: Capacity of every hotel
+            costs: Cost matrix (ports x hotels)
+            arc_capacity: Bus capacity of every port -> hotel pair (scalar or matrix)
+        Returns:
+            optimal_point, optimal_value (flows in the same order as get_problem_matrices)
+        """
+        return TransportationSolver(supply, capacity, costs, arc_capacity).solve()
 
-    def optimizerIPBB(self, constraints, cost):
+    def optimizerIPBB(self, constraints, cost, node_selection='best_bound', branching='most_fractional',
+                      workers=1, deterministic=False, cuts=False, cut_depth=0, callback=None,
+                      time_limit=None, node_limit=None, rel_gap=0.0, abs_gap=0.0,
+                      initial_solution=None, heuristics=True, history=False):
         """
         Solve Integer Programming problem using Branch and Bound
         Args:
-            constraints: Dictionary containing A and b
+            constraints: Dictionary containing A and b, and optionally lb/ub variable bounds
             cost: Cost vector c
+            node_selection: 'best_bound', 'depth_first' or 'hybrid' (dive until the
+                            first incumbent, then best-bound)
+            branching: 'most_fractional', 'pseudo_cost' or 'first' fractional variable
+            workers: Number of processes; more than one runs the parallel search
+            deterministic: Make parallel runs reproducible (synchronized rounds); the
+                           time limit is then only checked between rounds
+            cuts: Add Gomory mixed-integer cuts at the root (branch-and-cut)
+            cut_depth: Also add cuts at nodes up to this depth (serial search only)
+            callback: Optional callback(event, stats), called with 'incumbent' on every new
+                      incumbent and with 'progress' periodically during the search
+            time_limit: Stop after this many seconds and return the best solution found
+            node_limit: Stop after this many node LPs
+            rel_gap: Stop once the incumbent is proven within this fraction of the optimum
+            abs_gap: Stop once the incumbent is proven within this objective distance
+            initial_solution: Known integer point (e.g. from heuristics.initial_allocation),
+                              repaired if needed and used as the first incumbent
+            heuristics: Round the root LP solution and dive for incumbents during the search
+            history: Keep the incumbent and global bound of every callback event in
+                     stats.history
         Returns:
-            optimal_point, optimal_value
+            optimal_point, optimal_value (an IPResult that also carries status, bound, gap,
+            node count and SolverStats, and with cuts a summary including the fraction of
+            the root gap closed). The status is 'optimal', or 'time_limit', 'node_limit'
+            or 'gap_limit' when a limit ended the search; the point is None when no
+            integer solution was found in time.
         """
-        def branch_and_bound(constraints, cost, best_sol=None, best_val=float('inf')):
-            # Solve LP relaxation
-            sol, val = self.optimizerLP(constraints, cost)
-            
-            if sol is None:  # Infeasible
-                return None, float('inf')
-            
-            if val >= best_val:  # Prune by bound
-                return best_sol, best_val
-            
-            # Check if solution is integer
-            if all(abs(x - round(x)) < 1e-10 for x in sol):
-                return sol, val
-            
-            # Find first non-integer variable
-            for i, x in enumerate(sol):
-                if abs(x - round(x)) > 1e-10:
-                    # Branch on this variable
-                    floor_val = np.floor(x)
-                    ceil_val = np.ceil(x)
-                    
-                    # Add new constraints for both branches
-                    A_new = np.vstack([constraints['A'], [0] * i + [1] + [0] * (len(sol) - i - 1)])
-                    
-                    # Floor branch
-                    b_floor = np.append(constraints['b'], floor_val)
-                    constraints_floor = {'A': A_new, 'b': b_floor}
-                    sol_floor, val_floor = branch_and_bound(constraints_floor, cost, best_sol, best_val)
-                    
-                    if val_floor < best_val:
-                        best_sol = sol_floor
-                        best_val = val_floor
-                    
-                    # Ceil branch
-                    b_ceil = np.append(constraints['b'], -ceil_val)
-                    constraints_ceil = {'A': A_new, 'b': b_ceil}
-                    sol_ceil, val_ceil = branch_and_bound(constraints_ceil, cost, best_sol, best_val)
-                    
-                    if val_ceil < best_val:
-                        best_sol = sol_ceil
-                        best_val = val_ceil
-                    
-                    break
-            
-            return best_sol, best_val
-        
-        return branch_and_bound(constraints, cost)
+        options = dict(callback=callback, time_limit=time_limit, node_limit=node_limit,
+                       rel_gap=rel_gap, abs_gap=abs_gap, initial_solution=initial_solution,
+                       heuristics=heuristics, history=history)
+        if workers is not None and workers > 1:
+            from parallel_bb import ParallelBranchAndBound
+            root = None
+            if cuts:
+                root = BranchAndCut(self.optimizerLP, constraints, cost, node_selection, branching)
+                constraints = root.cut_root()
+            search = ParallelBranchAndBound(self.optimizerLP, constraints, cost, node_selection,
+                                            branching, workers, deterministic, **options)
+            result = search.solve()
+            if root is not None:
+                result.cuts = root.cut_summary(search.best_value)
+            return result
+        if cuts:
+            search = BranchAndCut(self.optimizerLP, constraints, cost, node_selection, branching,
+                                  cut_depth, **options)
+        else:
+            search = BranchAndBound(self.optimizerLP, constraints, cost, node_selection, branching,
+                                    **options)
+        return search.solve()
 
-    def plot_2d_problem(self, constraints, cost, solution=None):
+    def optimizerBatch(self, constraints, cost, rhs, workers=1, integer=True):
+        """
+        Solve one model under many right-hand side scenarios (e.g. arrival forecasts)
+        The structure is built once and every scenario is warm-started from the
+        previous one's basis and factorization with the dual simplex.
+        Args:
+            constraints: Dictionary containing A and optionally lb/ub variable bounds
+            cost: Cost vector c
+            rhs: Right-hand sides, one row per scenario (see HajjData.get_scenario_rhs)
+            workers: Number of processes to split the scenarios over
+            integer: Require integer solutions
+        Returns:
+            BatchResult with points (scenarios x variables), values, status and iterations
+        """
+        from batch import solve_batch
+        return solve_batch(constraints, cost, rhs, workers, integer)
+
+    def optimizerMultiDay(self, multiday, workers=1, max_iterations=50, rel_gap=1e-3, time_limit=None):
+        """
+        Plan a season day by day with Lagrangian decomposition over the hotel occupancy rows
+        Args:
+            multiday: MultiDayInstance (see HajjData.get_multiday_problem)
+            workers: Number of processes to solve the day models on
+            max_iterations: Maximum number of master iterations
+            rel_gap: Stop when the plan is within this relative gap of the lower bound
+            time_limit: Maximum solve time in seconds
+        Returns:
+            MultiDayResult with flows and buses (days x ports x hotels), value, bound and status
+        """
+        from decomposition import LagrangianDecomposition
+        return LagrangianDecomposition(multiday, workers, max_iterations, rel_gap, time_limit).solve()
+
+    def plot_2d_problem(self, constraints, cost, solution=None, path=None):
         """
         Plot the feasible region and solution for 2D problems
+        Args:
+            constraints: Dictionary containing A and b
+            cost: Cost vector c
+            solution: Optional point to mark
+            path: Write the plot to this image file headlessly instead of showing it
         """
-        A = constraints['A']
-        b = constraints['b']
-        
-        # Create a grid of points
-        x = np.linspace(-10, 100, 1000)
-        y = np.linspace(-10, 100, 1000)
-        X, Y = np.meshgrid(x, y)
-        
-        # Plot feasible region
-        plt.figure(figsize=(10, 8))
-        for i in range(len(b)):
-            if np.abs(A[i, 1]) < 1e-10:  # Vertical line
-                plt.axvline(x=b[i]/A[i, 0], color='r', alpha=0.3)
-            else:
-                plt.plot(x, (b[i] - A[i, 0]*x)/A[i, 1], 'r', alpha=0.3)
-        
-        # Shade feasible region
-        for i in range(len(x)):
-            for j in range(len(y)):
-                point = np.array([X[i,j], Y[i,j]])
-                if all(np.dot(A, point) <= b):
-                    plt.plot(X[i,j], Y[i,j], 'b.', alpha=0.1)
-        
-        if solution is not None:
-            plt.plot(solution[0], solution[1], 'g*', markersize=15, label='Optimal Solution')
-        
-        plt.grid(True)
-        plt.legend()
-        plt.xlabel('x1')
-        plt.ylabel('x2')
-        plt.title('Feasible Region and Optimal Solution')
-        plt.show()
\ No newline at end of file
+        from plotting import plot_2d_problem
+        plot_2d_problem(constraints['A'], constraints['b'], solution, path)
\ No newline at end of file
@@ -0,0 +1,312 @@
+# parallel_bb.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+import numpy as np
+from branch_and_bound import BranchAndBound, BoundChange, Node
+from simplex import solve_lp
+from sparse import CSRMatrix
+
+# Per-process state of a pool worker, set once by _init_worker
+_worker = {}
+
+
+class SharedModel:
+    """
+    Base model (A, b, c and the root bounds) copied once into shared memory,
+    so workers attach to the same buffers instead of receiving a pickled copy per task
+    """
+    def __init__(self, constraints, cost):
+        n = len(cost)
+        lb = constraints.get('lb')
+        ub = constraints.get('ub')
+        arrays = {
+            'b': np.asarray(constraints['b'], dtype=float),
+            'cost': np.asarray(cost, dtype=float),
+            'lb': np.full(n, -np.inf) if lb is None else np.asarray(lb, dtype=float),
+            'ub': np.full(n, np.inf) if ub is None else np.asarray(ub, dtype=float),
+        }
+        A = constraints['A']
+        if isinstance(A, CSRMatrix):
+            arrays.update(A_data=A.data, A_indices=A.indices, A_indptr=A.indptr)
+            self.A_shape = A.shape
+        else:
+            arrays['A'] = np.asarray(A, dtype=float)
+            self.A_shape = None
+
+        self.blocks = []
+        self.spec = {'A_shape': self.A_shape, 'arrays': {}}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.spec['arrays'][name] = (block.name, array.shape, array.dtype.str)
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def attach_model(spec):
+    """
+    Map a SharedModel into this process
+    Returns:
+        constraints, cost and the shared memory handles (keep them alive while in use)
+    """
+    handles = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in spec['arrays'].items():
+        block = shared_memory.SharedMemory(name=block_name)
+        handles.append(block)
+        arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+    if spec['A_shape'] is not None:
+        A = CSRMatrix(arrays['A_data'], arrays['A_indices'], arrays['A_indptr'], spec['A_shape'])
+    else:
+        A = arrays['A']
+    constraints = {'A': A, 'b': arrays['b'], 'lb': arrays['lb'], 'ub': arrays['ub']}
+    return constraints, arrays['cost'], handles
+
+
+class SharedIncumbent:
+    """Incumbent objective value in shared memory, readable by every worker"""
+    def __init__(self, value=np.inf, name=None, lock=None):
+        self.owner = name is None
+        if self.owner:
+            self.block = shared_memory.SharedMemory(create=True, size=8)
+        else:
+            self.block = shared_memory.SharedMemory(name=name)
+        self.name = self.block.name
+        self.lock = lock
+        self.array = np.ndarray((1,), np.float64, buffer=self.block.buf)
+        if self.owner:
+            self.array[0] = value
+
+    @property
+    def value(self):
+        return float(self.array[0])
+
+    def offer(self, value):
+        """Publish value if it improves on the shared incumbent"""
+        with self.lock:
+            if value < self.array[0]:
+                self.array[0] = value
+
+    def close(self):
+        del self.array
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+
+
+def _flatten(changes):
+    """Bound change chain as a picklable tuple, oldest first"""
+    flat = []
+    while changes is not None:
+        flat.append((changes.variable, changes.lower, changes.upper))
+        changes = changes.previous
+    return tuple(reversed(flat))
+
+
+def _chain(flat):
+    changes = None
+    for variable, lower, upper in flat:
+        changes = BoundChange(variable, lower, upper, changes)
+    return changes
+
+
+class SubtreeSearch(BranchAndBound):
+    """
+    Depth-first search of one subtree inside a worker. It prunes against the
+    incumbent the master knew when the task was sent and, unless the run is
+    deterministic, against the shared incumbent, to which it publishes its own.
+    It hands its open nodes back early once the next one is worse than the
+    frontier, the master's best open bound when the task was sent, so workers
+    do not dive into nodes a best-bound search would never get to.
+    """
+    def __init__(self, constraints, cost, branching, incumbent, deterministic, known_value,
+                 frontier=np.inf, **limits):
+        super().__init__(solve_lp, constraints, cost, 'depth_first', branching, **limits)
+        self.incumbent = incumbent
+        self.deterministic = deterministic
+        self.known_value = known_value
+        self.frontier = frontier
+
+    def _search(self, max_nodes=None):
+        """Stop early, leaving the nodes to the master, once the next one is worse than the frontier"""
+        start = self.nodes
+        frontier = self.frontier + 1e-9 * max(1.0, abs(self.frontier))
+        while self._queue and not self.unbounded:
+            if max_nodes is not None and self.nodes - start >= max_nodes:
+                return
+            if self._limit_reached():
+                return
+            if self.nodes > start and self._queue[0][2].bound > frontier:
+                return
+            self._expand(self._pop())
+
+    def _cutoff(self):
+        if self.deterministic:
+            return min(self.best_value, self.known_value)
+        return min(self.best_value, self.known_value, self.incumbent.value)
+
+    def _new_incumbent(self, point):
+        super()._new_incumbent(point)
+        if not self.deterministic:
+            self.incumbent.offer(self.best_value)
+
+
+def _init_worker(spec, incumbent_name, lock, branching, deterministic, rel_gap, abs_gap):
+    constraints, cost, handles = attach_model(spec)
+    _worker.update(constraints=constraints, cost=cost, handles=handles,
+                   incumbent=SharedIncumbent(name=incumbent_name, lock=lock),
+                   branching=branching, deterministic=deterministic,
+                   rel_gap=rel_gap, abs_gap=abs_gap)
+
+
+def _explore(task, incumbent_value, node_budget, time_limit=None, frontier=np.inf):
+    """
+    Worker task: search the subtree below one node for at most node_budget LPs
+    and time_limit seconds
+    Returns:
+        best point found (or None), its value, the unexplored open nodes, the LP
+        count, whether the LP was unbounded, the stats counters and the smallest
+        bound of a pruned node
+    """
+    bound, depth, flat, basis, branch = task
+    search = SubtreeSearch(_worker['constraints'], _worker['cost'], _worker['branching'],
+                           _worker['incumbent'], _worker['deterministic'], incumbent_value,
+                           frontier, time_limit=time_limit, rel_gap=_worker['rel_gap'],
+                           abs_gap=_worker['abs_gap'])
+    search._push(Node(bound, depth, _chain(flat), basis, branch))
+    search._search(node_budget)
+
+    open_nodes = [(node.bound, node.depth, _flatten(node.changes), node.basis, node.branch)
+                  for _, _, node in sorted(search._queue, key=lambda entry: entry[:2])]
+    return (search.best_point, search.best_value, open_nodes, search.nodes, search.unbounded,
+            search.stats.counters(), search._pruned_bound)
+
+
+class ParallelBranchAndBound(BranchAndBound):
+    """
+    Branch and Bound spread over a process pool
+    The master keeps the open-node queue and hands subtrees to workers, which
+    search them depth-first for a bounded number of LPs and send back their
+    best solution and any nodes left open. The base model lives in shared memory
+    and the incumbent value is broadcast through a shared buffer. In
+    deterministic mode the work proceeds in synchronized rounds whose results
+    are merged in submission order and workers only prune against the incumbent
+    at the start of the round, so the result does not depend on timing.
+    Tasks are small (task_nodes LPs) and carry the master's best open bound, so
+    the parallel search explores about as many nodes as the serial one.
+    Limits are checked by the master between tasks, and every task is given the
+    time that is left, so a run overshoots the node limit by at most the tasks in flight.
+    In deterministic mode the tasks get no time limit, since where a worker
+    stopped would depend on timing: the master checks it between rounds, so a
+    timed-out run returns the result of its last whole round.
+    """
+    def __init__(self, lp_solver, constraints, cost, node_selection='best_bound',
+                 branching='most_fractional', workers=None, deterministic=False, task_nodes=8,
+                 **kwargs):
+        super().__init__(lp_solver, constraints, cost, node_selection, branching, **kwargs)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.deterministic = deterministic
+        self.task_nodes = task_nodes
+        self._in_flight = {}  # submitted task -> bound of its subtree root
+
+    def _global_bound(self):
+        return min([super()._global_bound()] + list(self._in_flight.values()))
+
+    def _submit(self, pool, task):
+        budget = self.task_nodes
+        if self.node_limit is not None:
+            budget = max(1, min(budget, self.node_limit - self.nodes))
+        time_limit = None
+        if self.time_limit is not None and not self.deterministic:
+            time_limit = self.time_limit - self.stats.elapsed
+        frontier = self._queue[0][2].bound if self._queue and not self._depth_first else np.inf
+        future = pool.submit(_explore, task, self.best_value, budget, time_limit, frontier)
+        self._in_flight[future] = task[0]
+        return future
+
+    def _next_task(self):
+        while self._queue:
+            node = self._pop()
+            if self._can_improve(node.bound):
+                return (node.bound, node.depth, _flatten(node.changes), node.basis, node.branch)
+            self._prune(node.bound)
+        return None
+
+    def _merge(self, future):
+        point, value, open_nodes, nodes, unbounded, counters, pruned_bound = future.result()
+        self.nodes += nodes
+        self.stats.merge(counters)
+        self._pruned_bound = min(self._pruned_bound, pruned_bound)
+        self.unbounded = self.unbounded or unbounded
+        for bound, depth, flat, basis, branch in open_nodes:
+            self._push(Node(bound, depth, _chain(flat), basis, branch))
+        del self._in_flight[future]
+        if point is not None and value < self.best_value:
+            self._new_incumbent(point)
+            self.incumbent.offer(self.best_value)
+        if self.nodes // self.progress_interval > (self.nodes - nodes) // self.progress_interval:
+            self._snapshot('progress')
+
+    def _run_rounds(self, pool):
+        while self._queue and not self.unbounded and not self._limit_reached():
+            tasks = []
+            while len(tasks) < 2 * self.workers:
+                task = self._next_task()
+                if task is None:
+                    break
+                tasks.append(task)
+            futures = [self._submit(pool, task) for task in tasks]
+            for future in futures:
+                self._merge(future)
+
+    def _run_asynchronous(self, pool):
+        pending = set()
+        while not self.unbounded:
+            while len(pending) < 2 * self.workers and not self._limit_reached():
+                task = self._next_task()
+                if task is None:
+                    break
+                pending.add(self._submit(pool, task))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._merge(future)
+        for future in pending:
+            future.cancel()
+        self._in_flight.clear()
+
+    def solve(self):
+        """
+        Run the search: the root is solved here, its subtrees on the pool
+        Returns:
+            IPResult (optimal_point, optimal_value) with status, bound, node count and stats
+        """
+        self._offer(self.initial_solution)
+        self.stats.nodes_created += 1
+        self._expand(Node(-np.inf, 0))
+        if not self._queue or self.unbounded:
+            return self._result()
+
+        context = multiprocessing.get_context()
+        model = SharedModel(self.constraints, self.cost)
+        self.incumbent = SharedIncumbent(self.best_value, lock=context.Lock())
+        try:
+            with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                     initargs=(model.spec, self.incumbent.name, self.incumbent.lock,
+                                               self.branching, self.deterministic,
+                                               self.rel_gap, self.abs_gap)) as pool:
+                if self.deterministic:
+                    self._run_rounds(pool)
+                else:
+                    self._run_asynchronous(pool)
+        finally:
+            self.incumbent.close()
+            model.close()
+        return self._result()
@@ -0,0 +1,165 @@
+# plotting.py
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# Names are drawn next to the markers up to this many ports or hotels
+MAX_LABELS = 60
+
+# Background renderers, created on first use: {'thread' or 'process': executor}
+_executors = {}
+
+
+def _figure(figsize):
+    """Figure on the Agg canvas: rendered off-screen, without pyplot or a display"""
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def feasible_mask(A, b, x, y):
+    """
+    Grid points of a 2D problem that satisfy A [x1, x2] <= b
+    Returns:
+        Boolean matrix, rows along y and columns along x
+    """
+    A = np.asarray(A, dtype=float)
+    inside = np.ones((len(y), len(x)), dtype=bool)
+    for (a1, a2), rhs in zip(A, np.asarray(b, dtype=float)):
+        inside &= a1 * x[None, :] + a2 * y[:, None] <= rhs
+    return inside
+
+
+def draw_2d_problem(ax, A, b, solution=None, limits=(-10, 100), resolution=1000):
+    """
+    Draw the constraint lines, the feasible region as one masked raster and the
+    solution of a 2D problem onto ax
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    x = np.linspace(limits[0], limits[1], resolution)
+    y = np.linspace(limits[0], limits[1], resolution)
+
+    inside = feasible_mask(A, b, x, y)
+    ax.imshow(np.ma.masked_array(np.ones(inside.shape), mask=~inside), origin='lower',
+              extent=(x[0], x[-1], y[0], y[-1]), cmap='Blues', vmin=0, vmax=1, alpha=0.3,
+              aspect='auto', interpolation='nearest')
+
+    vertical = np.abs(A[:, 1]) < 1e-10
+    for a1, rhs in zip(A[vertical, 0], b[vertical]):
+        ax.axvline(x=rhs / a1, color='r', alpha=0.3)
+    slanted = ~vertical
+    lines = (b[slanted, None] - A[slanted, 0, None] * x[None, :]) / A[slanted, 1, None]
+    ax.add_collection(LineCollection(np.stack([np.broadcast_to(x, lines.shape), lines], axis=-1),
+                                     colors='r', alpha=0.3))
+
+    if solution is not None:
+        ax.plot(solution[0], solution[1], 'g*', markersize=15, label='Optimal Solution')
+        ax.legend()
+    ax.set_xlim(limits)
+    ax.set_ylim(limits)
+    ax.grid(True)
+    ax.set_xlabel('x1')
+    ax.set_ylabel('x2')
+    ax.set_title('Feasible Region and Optimal Solution')
+
+
+def plot_2d_problem(A, b, solution=None, path=None):
+    """
+    Plot the feasible region and solution of a 2D problem
+    Args:
+        A, b: Constraints A x <= b with two variables
+        solution: Optional point to mark
+        path: Image file to write headlessly; without it the plot is shown with pyplot
+    """
+    if path is not None:
+        figure = _figure((10, 8))
+        draw_2d_problem(figure.add_subplot(), A, b, solution)
+        figure.savefig(path)
+        return
+    import matplotlib.pyplot as plt
+    figure = plt.figure(figsize=(10, 8))
+    draw_2d_problem(figure.add_subplot(), A, b, solution)
+    plt.show()
+
+
+def flow_figure(report, title):
+    """Port -> hotel flow diagram: one scatter per side and one LineCollection for all flows"""
+    figure = _figure((12, 8))
+    ax = figure.add_subplot()
+    ax.set_title(f'Pilgrim Flow Diagram - {title.upper()} Example')
+
+    # Ports on the left and hotels on the right
+    port_y = np.arange(len(report.ports))
+    hotel_y = np.arange(len(report.hotels))
+    ax.plot(np.zeros(len(port_y)), port_y, 'bo', markersize=10, label='Ports')
+    ax.plot(np.ones(len(hotel_y)), hotel_y, 'rs', markersize=10, label='Hotels')
+    if len(report.ports) <= MAX_LABELS:
+        for name, y in zip(report.ports, port_y):
+            ax.text(-0.1, y, name, horizontalalignment='right')
+    if len(report.hotels) <= MAX_LABELS:
+        for name, y in zip(report.hotels, hotel_y):
+            ax.text(1.1, y, name, horizontalalignment='left')
+
+    rows, cols = report.flows()
+    share = report.allocation[rows, cols] / max(report.supply.max(), 1)
+    segments = np.stack([np.column_stack([np.zeros(len(rows)), rows]),
+                         np.column_stack([np.ones(len(cols)), cols])], axis=1)
+    colors = np.zeros((len(rows), 4))
+    colors[:, 1] = 0.5  # matplotlib 'g'
+    colors[:, 3] = np.clip(share, 0, 1)
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=share * 5))
+
+    ax.legend()
+    ax.grid(True)
+    ax.axis('off')
+    return figure
+
+
+def capacity_figure(report, title):
+    """Used versus available capacity of every port and hotel"""
+    figure = _figure((12, 6))
+    ax = figure.add_subplot()
+    ax.set_title(f'Capacity Utilization - {title.upper()} Example')
+
+    locations = report.ports + report.hotels
+    x = np.arange(len(locations))
+    ax.bar(x, np.concatenate([report.supply, report.capacity]), alpha=0.3, label='Capacity')
+    ax.bar(x, np.concatenate([report.port_used, report.hotel_used]), alpha=0.7, label='Used')
+    ax.set_xticks(x)
+    ax.set_xticklabels(locations, rotation=45, ha='right')
+    ax.set_ylabel('Number of Pilgrims')
+    ax.legend()
+    figure.tight_layout()
+    return figure
+
+
+def render_report(report, title, directory='results'):
+    """
+    Write the flow diagram and capacity chart of a SolutionReport as PNG files
+    Returns:
+        The written paths
+    """
+    paths = [os.path.join(directory, f'flow_diagram_{title}.png'),
+             os.path.join(directory, f'capacity_utilization_{title}.png')]
+    for figure, path in zip((flow_figure(report, title), capacity_figure(report, title)), paths):
+        figure.savefig(path)
+    return paths
+
+
+def render_in_background(report, title, directory='results', process=False):
+    """
+    Render a report's charts without blocking the caller
+    Args:
+        report, title, directory: As for render_report
+        process: Render in a worker process instead of a thread
+    Returns:
+        Future of the written paths
+    """
+    kind = 'process' if process else 'thread'
+    if kind not in _executors:
+        _executors[kind] = ProcessPoolExecutor(1) if process else ThreadPoolExecutor(1)
+    return _executors[kind].submit(render_report, report, title, directory)
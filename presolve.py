@@ -0,0 +1,202 @@
+# presolve.py
+import numpy as np
+from simplex import INFEASIBLE
+from sparse import CSRMatrix
+
+# Presolve status of a model that was reduced without proving it infeasible
+REDUCED = 'reduced'
+
+
+class PresolveResult:
+    """
+    Reduced model produced by presolve, and the mapping back to the original
+    variables. Solve constraints/cost with any Optimizer method and pass the
+    result to postsolve.
+    """
+    def __init__(self, status, constraints=None, cost=None, offset=0.0, kept_rows=None,
+                 kept_cols=None, fixed_values=None, stats=None):
+        self.status = status
+        self.constraints = constraints
+        self.cost = cost
+        self.offset = offset            # objective contribution of the fixed variables
+        self.kept_rows = kept_rows
+        self.kept_cols = kept_cols
+        self.fixed_values = fixed_values
+        self.stats = stats or {}
+
+    def postsolve(self, result):
+        """
+        Map a solution of the reduced model back to the original variable order
+        Args:
+            result: (point, value) of the reduced model
+        Returns:
+            optimal_point, optimal_value of the original model
+        """
+        point, value = result[0], result[1]
+        if point is None:
+            return None, None
+        full = self.fixed_values.copy()
+        full[self.kept_cols] = point
+        return full, value + self.offset
+
+    def reduce(self, point):
+        """
+        Restrict a point of the original model to the kept variables, e.g. to
+        pass a heuristic solution to the reduced solve
+        Args:
+            point: Point of the original model, or None
+        Returns:
+            The point in the reduced variable order; it may need repair when it
+            disagrees with the fixed variables
+        """
+        if point is None:
+            return None
+        return np.asarray(point, dtype=float)[self.kept_cols]
+
+
+def _activity(rows, vals, low, high, n_rows):
+    """Finite part and number of infinite terms of sum(vals * bound) per row"""
+    terms = np.where(vals > 0, vals * low, vals * high)
+    infinite = ~np.isfinite(terms)
+    finite_sum = np.bincount(rows, weights=np.where(infinite, 0.0, terms), minlength=n_rows)
+    inf_count = np.bincount(rows, weights=infinite, minlength=n_rows)
+    return terms, infinite, finite_sum, inf_count
+
+
+def presolve(constraints, cost, integer=True, max_passes=20, tol=1e-9):
+    """
+    Reduce min c^T x s.t. A x <= b, lb <= x <= ub before solving
+    Singleton rows become bounds, bounds are tightened from row activities
+    (and rounded when the variables are integer), rows implied by the bounds
+    are dropped, variables are fixed by dual arguments or when their bounds
+    meet, and infeasibility found on the way is reported early.
+    Args:
+        constraints: Dictionary containing A (dense or CSRMatrix) and b, and optionally lb/ub
+        cost: Cost vector c
+        integer: Whether all variables are integer (allows rounding of bounds)
+    Returns:
+        PresolveResult
+    """
+    A = constraints['A']
+    sparse = isinstance(A, CSRMatrix)
+    if not sparse:
+        A = CSRMatrix.from_dense(A)
+    m, n = A.shape
+    rows, cols, vals = A.row_ids, A.indices, A.data
+    b = np.asarray(constraints['b'], dtype=float)
+    c = np.asarray(cost, dtype=float)
+    lb = constraints.get('lb')
+    ub = constraints.get('ub')
+    lb = np.full(n, -np.inf) if lb is None else np.array(lb, dtype=float)
+    ub = np.full(n, np.inf) if ub is None else np.array(ub, dtype=float)
+
+    active = np.ones(m, dtype=bool)
+    stats = {'rows_removed': 0, 'bounds_tightened': 0, 'variables_fixed': 0}
+
+    def tighten(new_lb, new_ub):
+        if integer:
+            new_lb = np.ceil(new_lb - 1e-6)
+            new_ub = np.floor(new_ub + 1e-6)
+        margin_lb = np.where(np.isfinite(lb), tol * np.maximum(1.0, np.abs(lb)), 0.0)
+        margin_ub = np.where(np.isfinite(ub), tol * np.maximum(1.0, np.abs(ub)), 0.0)
+        changed = (new_lb > lb + margin_lb) | (new_ub < ub - margin_ub)
+        np.maximum(lb, new_lb, out=lb)
+        np.minimum(ub, new_ub, out=ub)
+        stats['bounds_tightened'] += int(changed.sum())
+        return changed.any()
+
+    for _ in range(max_passes):
+        on = active[rows]
+        r, k, a = rows[on], cols[on], vals[on]
+        counts = np.bincount(r, minlength=m)
+
+        # Empty rows are either trivially satisfied or prove infeasibility
+        empty = active & (counts == 0)
+        if np.any(b[empty] < -tol):
+            return PresolveResult(INFEASIBLE, stats=stats)
+        active &= ~empty
+
+        # Singleton rows a x_k <= b are bounds
+        singleton = counts[r] == 1
+        ratio = b[r[singleton]] / a[singleton]
+        new_lb = np.full(n, -np.inf)
+        new_ub = np.full(n, np.inf)
+        positive = a[singleton] > 0
+        np.minimum.at(new_ub, k[singleton][positive], ratio[positive])
+        np.maximum.at(new_lb, k[singleton][~positive], ratio[~positive])
+        changed = tighten(new_lb, new_ub)
+        active[r[singleton]] = False
+
+        # Row activities under the current bounds
+        on = active[rows]
+        r, k, a = rows[on], cols[on], vals[on]
+        min_terms, min_inf, min_sum, min_count = _activity(r, a, lb[k], ub[k], m)
+        _, _, max_sum, max_count = _activity(r, a, ub[k], lb[k], m)
+        slack = tol * np.maximum(1.0, np.abs(b))
+        if np.any(active & (min_count == 0) & (min_sum > b + slack)):
+            return PresolveResult(INFEASIBLE, stats=stats)
+
+        # Rows whose largest possible activity fits are dominated by the bounds
+        redundant = active & (max_count == 0) & (max_sum <= b + slack)
+        active &= ~redundant
+
+        # Bound tightening: a_k x_k <= b - (min activity of the rest of the row)
+        rest = np.where(min_count[r] == 0, min_sum[r] - min_terms,
+                        np.where((min_count[r] == 1) & min_inf, min_sum[r], np.nan))
+        usable = np.isfinite(rest) & active[r]
+        limit = (b[r[usable]] - rest[usable]) / a[usable]
+        new_lb = np.full(n, -np.inf)
+        new_ub = np.full(n, np.inf)
+        positive = a[usable] > 0
+        np.minimum.at(new_ub, k[usable][positive], limit[positive])
+        np.maximum.at(new_lb, k[usable][~positive], limit[~positive])
+        changed = tighten(new_lb, new_ub) or changed
+
+        if np.any(lb > ub + tol * np.maximum(1.0, np.abs(ub))):
+            return PresolveResult(INFEASIBLE, stats=stats)
+        if not changed and not redundant.any():
+            break
+
+    # Dual fixing: a variable that only appears with one sign in <= rows
+    # moves to the bound that is both cheaper and looser for every row
+    on = active[rows]
+    has_pos = np.bincount(cols[on], weights=vals[on] > 0, minlength=n) > 0
+    has_neg = np.bincount(cols[on], weights=vals[on] < 0, minlength=n) > 0
+    to_lower = ~has_neg & (c >= 0) & np.isfinite(lb)
+    to_upper = ~has_pos & (c <= 0) & np.isfinite(ub) & ~to_lower
+    ub[to_lower] = lb[to_lower]
+    lb[to_upper] = ub[to_upper]
+
+    # Only finite bounds can meet: an infinite lb makes the tolerance infinite too
+    fixed = np.isfinite(lb) & np.isfinite(ub) & (ub - lb <= tol * np.maximum(1.0, np.abs(lb)))
+    stats['variables_fixed'] = int(fixed.sum())
+    fixed_values = np.where(fixed, lb, 0.0)
+    kept_cols = np.flatnonzero(~fixed)
+
+    # Move fixed variables to the right-hand side and drop rows left empty
+    on = active[rows]
+    b_reduced = b - np.bincount(rows[on], weights=vals[on] * fixed_values[cols[on]], minlength=m)
+    keep_nz = on & ~fixed[cols]
+    remaining = np.bincount(rows[keep_nz], minlength=m)
+    empty = active & (remaining == 0)
+    if np.any(b_reduced[empty] < -tol * np.maximum(1.0, np.abs(b[empty]))):
+        return PresolveResult(INFEASIBLE, stats=stats)
+    active &= ~empty
+    kept_rows = np.flatnonzero(active)
+    stats['rows_removed'] = m - len(kept_rows)
+
+    row_index = np.full(m, -1)
+    row_index[kept_rows] = np.arange(len(kept_rows))
+    col_index = np.full(n, -1)
+    col_index[kept_cols] = np.arange(len(kept_cols))
+    keep_nz &= active[rows]
+    A_reduced = CSRMatrix.from_coo(row_index[rows[keep_nz]], col_index[cols[keep_nz]], vals[keep_nz],
+                                   (len(kept_rows), len(kept_cols)))
+    if not sparse:
+        A_reduced = A_reduced.toarray()
+
+    reduced = dict(constraints, A=A_reduced, b=b_reduced[kept_rows],
+                   lb=lb[kept_cols], ub=ub[kept_cols])
+    offset = float(c @ fixed_values)
+    return PresolveResult(REDUCED, reduced, c[kept_cols], offset, kept_rows, kept_cols,
+                          fixed_values, stats)
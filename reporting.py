@@ -0,0 +1,194 @@
+# reporting.py
+import csv
+import json
+import numpy as np
+
+
+def format_cost(cost):
+    """Format cost with thousands separator and currency"""
+    return f"{cost:,.2f} SAR"
+
+
+def _count(value):
+    """Show whole numbers without a decimal point"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class SolutionReport:
+    """
+    Port -> hotel solution of one run, reshaped once into a ports x hotels
+    allocation matrix. The pair costs and the port and hotel totals are computed
+    from it with array operations, and every output (text, JSON, CSV, Parquet)
+    is produced from these arrays.
+    """
+    def __init__(self, title, point, value, ports, hotels, supply, capacity, costs,
+                 execution_time=None, stats=None):
+        self.title = title
+        self.ports = list(ports)
+        self.hotels = list(hotels)
+        self.supply = np.asarray(supply, dtype=float)
+        self.capacity = np.asarray(capacity, dtype=float)
+        self.costs = np.asarray(costs, dtype=float)
+        self.value = value
+        self.execution_time = execution_time
+        self.stats = stats
+        self.solved = point is not None
+
+        shape = (len(self.ports), len(self.hotels))
+        if self.solved:
+            self.allocation = np.trunc(np.asarray(point, dtype=float) + 1e-6).reshape(shape)
+        else:
+            self.allocation = np.zeros(shape)
+        self.pair_costs = self.allocation * self.costs
+        self.port_used = self.allocation.sum(axis=1)
+        self.hotel_used = self.allocation.sum(axis=0)
+        self.total_pilgrims = float(self.port_used.sum())
+
+    @classmethod
+    def from_instance(cls, title, point, value, instance, execution_time=None, stats=None):
+        """Build from an ArrayInstance (HajjData.as_arrays)"""
+        return cls(title, point, value, instance.ports, instance.hotels, instance.supply,
+                   instance.capacity, instance.costs, execution_time, stats)
+
+    def flows(self):
+        """Row and column of every used port -> hotel pair, in port-major order"""
+        return np.nonzero(self.allocation > 0)
+
+    def lines(self):
+        """Text report, one line at a time"""
+        yield "\n" + "=" * 80
+        yield f"HAJJ OPTIMIZATION REPORT - {self.title.upper()} EXAMPLE"
+        yield "=" * 80
+
+        yield "\nSUMMARY:"
+        if not self.solved:
+            yield "No solution found"
+            return
+        yield f"Total Cost: {format_cost(self.value)}"
+        if self.execution_time is not None:
+            yield f"Execution Time: {self.execution_time:.2f} seconds"
+        yield f"Number of Ports: {len(self.ports)}"
+        yield f"Number of Hotels: {len(self.hotels)}"
+
+        yield "\nDETAILED ALLOCATION:"
+        yield "-" * 80
+        yield f"{'From Port':<20} {'To Hotel':<20} {'Pilgrims':<10} {'Cost/Pilgrim':<15} {'Total Cost'}"
+        yield "-" * 80
+        rows, cols = self.flows()
+        for i, j, pilgrims, cost, total in zip(rows.tolist(), cols.tolist(),
+                                               self.allocation[rows, cols].astype(np.int64).tolist(),
+                                               self.costs[rows, cols].tolist(),
+                                               self.pair_costs[rows, cols].tolist()):
+            yield (f"{self.ports[i]:<20} {self.hotels[j]:<20} {pilgrims:<10} "
+                   f"{format_cost(cost):<15} {format_cost(total)}")
+        yield "-" * 80
+        yield f"Total Pilgrims: {int(self.total_pilgrims)}"
+        if self.total_pilgrims:
+            yield f"Average Cost per Pilgrim: {format_cost(self.value / self.total_pilgrims)}"
+
+        yield "\nCAPACITY UTILIZATION:"
+        yield "-" * 80
+        yield "PORTS:"
+        yield from self._utilization_lines(self.ports, self.port_used, self.supply)
+        yield "\nHOTELS:"
+        yield from self._utilization_lines(self.hotels, self.hotel_used, self.capacity)
+
+        if self.stats is not None:
+            yield "\nSOLVER STATISTICS:"
+            yield "-" * 80
+            yield from self.stats.summary()
+
+    def _utilization_lines(self, names, used, limit):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            utilization = used / limit * 100
+        for name, amount, total, percent in zip(names, used.astype(np.int64).tolist(),
+                                                limit.tolist(), utilization.tolist()):
+            yield f"{name:<20} {amount:>5}/{_count(total):<5} ({percent:>6.2f}%)"
+
+    def text(self):
+        return "\n".join(self.lines())
+
+    def write_text(self, path):
+        """Stream the text report to a file"""
+        with open(path, 'w') as f:
+            for i, line in enumerate(self.lines()):
+                if i:
+                    f.write("\n")
+                f.write(line)
+
+    def to_dict(self):
+        """Summary, per-port and per-hotel utilization and the used pairs, JSON-serializable"""
+        rows, cols = self.flows()
+        return {
+            'title': self.title,
+            'solved': self.solved,
+            'total_cost': self.value,
+            'execution_time': self.execution_time,
+            'total_pilgrims': self.total_pilgrims,
+            'ports': [{'name': name, 'used': used, 'capacity': total}
+                      for name, used, total in zip(self.ports, self.port_used.tolist(),
+                                                   self.supply.tolist())],
+            'hotels': [{'name': name, 'used': used, 'capacity': total}
+                       for name, used, total in zip(self.hotels, self.hotel_used.tolist(),
+                                                    self.capacity.tolist())],
+            'flows': [{'port': self.ports[i], 'hotel': self.hotels[j], 'pilgrims': pilgrims,
+                       'cost_per_pilgrim': cost, 'total_cost': total}
+                      for i, j, pilgrims, cost, total in zip(
+                          rows.tolist(), cols.tolist(), self.allocation[rows, cols].tolist(),
+                          self.costs[rows, cols].tolist(), self.pair_costs[rows, cols].tolist())],
+            'stats': self.stats.as_dict() if self.stats is not None else None,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def write_csv(self, path):
+        """Used pairs as port,hotel,pilgrims,cost_per_pilgrim,total_cost rows"""
+        rows, cols = self.flows()
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['port', 'hotel', 'pilgrims', 'cost_per_pilgrim', 'total_cost'])
+            writer.writerows(zip([self.ports[i] for i in rows.tolist()],
+                                 [self.hotels[j] for j in cols.tolist()],
+                                 self.allocation[rows, cols].tolist(),
+                                 self.costs[rows, cols].tolist(),
+                                 self.pair_costs[rows, cols].tolist()))
+
+    def write_parquet(self, path):
+        """Used pairs as a Parquet table (needs pyarrow)"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from None
+        rows, cols = self.flows()
+        table = pa.table({
+            'port': pa.array(np.array(self.ports, dtype=object)[rows]),
+            'hotel': pa.array(np.array(self.hotels, dtype=object)[cols]),
+            'pilgrims': self.allocation[rows, cols],
+            'cost_per_pilgrim': self.costs[rows, cols],
+            'total_cost': self.pair_costs[rows, cols],
+        })
+        pq.write_table(table, path)
+
+    def write(self, path_prefix, formats=('txt',)):
+        """
+        Write the report in several formats
+        Args:
+            path_prefix: Output path without extension
+            formats: Any of 'txt', 'json', 'csv' and 'parquet'
+        Returns:
+            The written paths
+        """
+        writers = {'txt': self.write_text, 'json': self.write_json, 'csv': self.write_csv,
+                   'parquet': self.write_parquet}
+        paths = []
+        for fmt in formats:
+            if fmt not in writers:
+                raise ValueError(f"Unknown report format '{fmt}', expected one of {tuple(writers)}")
+            path = f"{path_prefix}.{fmt}"
+            writers[fmt](path)
+            paths.append(path)
+        return paths
@@ -0,0 +1,442 @@
+# service.py
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from data.array_instance import ArrayInstance
+from data.sample_data import HajjData
+from simplex import INFEASIBLE
+from solve import ENGINES, EXAMPLES, solution_record
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Solver options a request may set for the 'ip' engine
+IP_OPTIONS = ('time_limit', 'node_limit', 'rel_gap')
+
+# Worker-side state, set once per process by _init_worker
+_worker = {}
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker():
+    from main import HajjOptimizationSystem
+    _worker['system'] = HajjOptimizationSystem()
+
+
+def _solve_batch(engine, options, instances):
+    """
+    Solve instances of one engine and options in a pool worker
+    Returns:
+        One (allocation or None, value, execution_time, status) per instance
+    """
+    results = []
+    for instance in instances:
+        point, value, execution_time, result = _worker['system'].solve(instance, engine, **options)
+        status = result.status if result is not None else INFEASIBLE
+        if point is not None:
+            point = np.asarray(point, dtype=float).reshape(len(instance.ports), len(instance.hotels))
+        results.append((point, value, execution_time, status))
+    return results
+
+
+def canonical_order(amounts, costs, column_order=None):
+    """
+    Order of the rows of costs: by amount, then by the sorted costs of the row,
+    so neither the row order nor the column order changes it. With column_order
+    (the columns' canonical order) rows that still tie are ordered by their
+    costs in that column order, otherwise they keep the order they were given in.
+    """
+    keys = tuple(np.sort(costs, axis=1).T[::-1])
+    if column_order is not None:
+        keys = tuple(costs[:, column_order].T[::-1]) + keys
+    return np.lexsort(keys + (amounts,))
+
+
+class CanonicalInstance:
+    """
+    Instance with its ports and hotels in canonical order, and its key: a hash
+    of the numbers and the solver settings only. Renamed or reordered copies of
+    an instance share the key and the cached solution, unless two hotels have
+    the same capacity and the same costs in a different arrangement over the
+    ports; such copies get different keys and are solved separately.
+    """
+    def __init__(self, instance, engine, options):
+        supply = np.asarray(instance.supply, dtype=float)
+        capacity = np.asarray(instance.capacity, dtype=float)
+        costs = np.asarray(instance.costs, dtype=float).reshape(len(supply), len(capacity))
+        self.original = instance
+        self.hotel_order = canonical_order(capacity, costs.T)
+        self.port_order = canonical_order(supply, costs, self.hotel_order)
+        self.instance = ArrayInstance(
+            [instance.ports[i] for i in self.port_order],
+            [instance.hotels[j] for j in self.hotel_order],
+            supply[self.port_order], capacity[self.hotel_order],
+            np.ascontiguousarray(costs[np.ix_(self.port_order, self.hotel_order)]),
+            instance.bus_capacity)
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps([engine, sorted(options.items()), float(instance.bus_capacity),
+                                  len(supply), len(capacity)]).encode())
+        for array in (self.instance.supply, self.instance.capacity, self.instance.costs):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        self.key = digest.hexdigest()
+
+    def restore(self, allocation):
+        """Allocation (ports x hotels) in the canonical order -> the request's order"""
+        if allocation is None:
+            return None
+        restored = np.empty_like(allocation)
+        restored[np.ix_(self.port_order, self.hotel_order)] = allocation
+        return restored
+
+
+class ResultCache:
+    """Least recently used cache of solutions with at most max_entries entries"""
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SolverService:
+    """
+    Long-running solver shared by several client processes
+
+    Requests are JSON lines over a local TCP or Unix socket. Every request is
+    resolved to a canonical instance; cached solutions are answered at once and
+    identical requests in flight share one solve. The rest is queued and a
+    batcher groups requests with the same engine and options into one task per
+    worker, collecting until a worker is free, so the queue drains in larger
+    batches under load.
+
+    Request: {"instance": name, directory or {"ports", "hotels", "supply",
+    "capacity", "costs", "bus_capacity"}, "engine": "ip" or "transport",
+    "options": {...}, "id": anything}, or {"op": "stats"}.
+    Response: the solution record of solve.py plus "cached" and the request "id",
+    or {"error": message}.
+    """
+    def __init__(self, workers=1, cache_size=1024, batch_size=16):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.cache = ResultCache(cache_size)
+        self.hajj_data = HajjData()
+        self.solved = 0
+        self.batches = 0
+        self._queue = None
+        self._free = None
+        self._pending = {}
+        self._pool = None
+        self._tasks = set()
+        self._failure = None
+
+    def _resolve(self, request):
+        """Canonical instance, engine and options of a request; ValueError if it is invalid"""
+        engine = request.get('engine', 'ip')
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {', '.join(ENGINES)}")
+        options = dict(request.get('options') or {})
+        allowed = IP_OPTIONS if engine == 'ip' else ()
+        unknown = sorted(set(options) - set(allowed))
+        if unknown:
+            raise ValueError(f"Unknown options for the '{engine}' engine: {', '.join(unknown)}")
+
+        instance = request.get('instance', 'small')
+        if isinstance(instance, dict):
+            instance = ArrayInstance(list(instance['ports']), list(instance['hotels']),
+                                     np.asarray(instance['supply'], dtype=float),
+                                     np.asarray(instance['capacity'], dtype=float),
+                                     np.asarray(instance['costs'], dtype=float),
+                                     instance['bus_capacity'])
+            if instance.costs.shape != (len(instance.ports), len(instance.hotels)):
+                raise ValueError(f"Costs of shape {instance.costs.shape} do not match "
+                                 f"{len(instance.ports)} ports x {len(instance.hotels)} hotels")
+        elif instance in EXAMPLES or (isinstance(instance, str) and os.path.isdir(instance)):
+            instance = self.hajj_data.as_arrays(instance)
+        else:
+            raise ValueError(f"{instance} is neither an example name nor an instance directory")
+        return CanonicalInstance(instance, engine, options), engine, options
+
+    def stats(self):
+        return {
+            'cache_entries': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'in_flight': len(self._pending),
+            'solved': self.solved,
+            'batches': self.batches,
+            'workers': self.workers,
+        }
+
+    async def handle(self, request):
+        """Answer one request (a dictionary) with its response dictionary"""
+        if not isinstance(request, dict):
+            return {'error': "A request must be a JSON object"}
+        if request.get('op') == 'stats':
+            return self.stats()
+        try:
+            canonical, engine, options = self._resolve(request)
+        except (KeyError, TypeError, ValueError) as error:
+            return {'error': str(error)}
+
+        entry = self.cache.get(canonical.key)
+        cached = entry is not None
+        if not cached:
+            future = self._pending.get(canonical.key)
+            if future is None and self._failure is not None:
+                return {'error': f"Solver service failed: {type(self._failure).__name__}: {self._failure}"}
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._pending[canonical.key] = future
+                self._queue.put_nowait((canonical, engine, options, future))
+            try:
+                entry = await asyncio.shield(future)
+            except Exception as error:
+                return {'error': f"{type(error).__name__}: {error}"}
+
+        allocation, value, execution_time, status = entry
+        original = canonical.original
+        name = request.get('name') or (request['instance'] if isinstance(request.get('instance'), str)
+                                       else 'instance')
+        record = solution_record(name, engine, original.ports, original.hotels,
+                                 canonical.restore(allocation), value, execution_time, status)
+        record['cached'] = cached
+        if 'id' in request:
+            record['id'] = request['id']
+        return record
+
+    async def _batcher(self):
+        """Group queued requests by engine and options and hand them to free workers"""
+        while True:
+            await self._free.acquire()
+            batch = [await self._queue.get()]
+            while not self._queue.empty() and len(batch) < self.batch_size * self.workers:
+                batch.append(self._queue.get_nowait())
+
+            groups = {}
+            for item in batch:
+                canonical, engine, options, future = item
+                groups.setdefault((engine, json.dumps(sorted(options.items()))), []).append(item)
+            # One task per free worker; the first takes the slot acquired above
+            chunks = []
+            for items in groups.values():
+                size = -(-len(items) // self.workers)
+                chunks += [items[i:i + size] for i in range(0, len(items), size)]
+            for index, chunk in enumerate(chunks):
+                if index > 0:
+                    await self._free.acquire()
+                task = asyncio.create_task(self._run(chunk))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    def _batcher_done(self, task):
+        """Fail the waiting requests, and every later one, if the batcher stops on an error"""
+        if task.cancelled() or task.exception() is None:
+            return
+        self._failure = task.exception()
+        logger.error("Request batcher stopped", exc_info=self._failure)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(self._failure)
+        self._pending.clear()
+
+    async def _run(self, items):
+        _, engine, options, _ = items[0]
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._pool, _solve_batch, engine, options,
+                                                 [item[0].instance for item in items])
+            self.batches += 1
+            for (canonical, _, _, future), entry in zip(items, results):
+                self.cache.put(canonical.key, entry)
+                self.solved += 1
+                future.set_result(entry)
+        except Exception as error:
+            for _, _, _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            for canonical, _, _, _ in items:
+                self._pending.pop(canonical.key, None)
+            self._free.release()
+
+    async def _connection(self, reader, writer):
+        """Answer the JSON lines of one client, concurrently and in completion order"""
+        lock = asyncio.Lock()
+
+        async def answer(line):
+            try:
+                response = await self.handle(json.loads(line))
+            except json.JSONDecodeError as error:
+                response = {'error': f"Invalid JSON: {error}"}
+            async with lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        answers = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(answer(line))
+                    answers.add(task)
+                    task.add_done_callback(answers.discard)
+            if answers:
+                await asyncio.gather(*answers)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, ready=None):
+        """
+        Serve until cancelled
+        Args:
+            host, port: Local TCP address
+            path: Serve on this Unix socket instead
+            ready: Optional callable, called once the socket accepts connections
+        """
+        self._queue = asyncio.Queue()
+        self._free = asyncio.Semaphore(self.workers)
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        if path is not None:
+            server = await asyncio.start_unix_server(self._connection, path)
+        else:
+            server = await asyncio.start_server(self._connection, host, port)
+        batcher = asyncio.create_task(self._batcher())
+        batcher.add_done_callback(self._batcher_done)
+        try:
+            async with server:
+                if ready is not None:
+                    ready()
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self._pool.shutdown(cancel_futures=True)
+
+
+def instance_payload(instance):
+    """
+    JSON-serializable instance for a request
+    Args:
+        instance: An instance dictionary in the HajjData format, an ArrayInstance
+                  or a payload, which is returned as is
+    """
+    if isinstance(instance, dict):
+        if 'supply' in instance:
+            return instance
+        instance = HajjData().as_arrays(instance)
+    return {
+        'ports': list(instance.ports),
+        'hotels': list(instance.hotels),
+        'supply': np.asarray(instance.supply).tolist(),
+        'capacity': np.asarray(instance.capacity).tolist(),
+        'costs': np.asarray(instance.costs).tolist(),
+        'bus_capacity': instance.bus_capacity,
+    }
+
+
+class SolverClient:
+    """
+    Blocking client of a SolverService; keeps one connection open for all requests
+    """
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, timeout=None):
+        if path is not None:
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(path)
+        else:
+            self.socket = socket.create_connection((host, port))
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.settimeout(timeout)
+        self.stream = self.socket.makefile('rb')
+
+    def request(self, request):
+        self.socket.sendall(json.dumps(request).encode() + b'\n')
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError("Solver service closed the connection")
+        return json.loads(line)
+
+    def solve(self, instance='small', engine='ip', **options):
+        """
+        Solve an instance on the service
+        Args:
+            instance: Example name or directory (as seen by the service), or
+                      anything instance_payload accepts
+            engine: 'ip' or 'transport'
+            options: time_limit, node_limit and rel_gap for the 'ip' engine
+        Returns:
+            Solution record as written by solve.py, with 'cached'
+        """
+        if not isinstance(instance, str):
+            instance = instance_payload(instance)
+        response = self.request({'instance': instance, 'engine': engine, 'options': options})
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    def stats(self):
+        return self.request({'op': 'stats'})
+
+    def close(self):
+        self.stream.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local Hajj solver service')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', default=None, help='Serve on this Unix socket path instead')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--cache-size', type=int, default=1024, help='Solutions kept in the cache')
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help='Requests per worker task at most')
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.workers, args.cache_size, args.batch_size)
+    address = args.unix or f'{args.host}:{args.port}'
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix,
+                                  ready=lambda: print(f"Serving on {address}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# session.py
+import numpy as np
+from branch_and_bound import BranchAndBound
+from data.sample_data import HajjData
+from simplex import RevisedSimplex, solve_lp
+
+
+class SolverSession:
+    """
+    Live port -> hotel allocation that is re-optimized as the data changes
+    The model is built once and its simplex engine kept between updates, so
+    every change re-optimizes from the current basis and factorization instead
+    of solving from scratch. The port/hotel model is totally unimodular, so with
+    whole pilgrim counts the optimal vertex is already integral.
+
+    Instead of a fixed service total, every moved pilgrim earns a reward above
+    any rerouting cost, so each plan moves as many pilgrims as the closures and
+    bus capacities allow, at least cost; the rest are counted in unserved.
+    """
+    def __init__(self, example='large', hajj_data=None):
+        hajj_data = hajj_data or HajjData()
+        self.ports, self.hotels = hajj_data.get_names(example)
+        self._port_index = {port: i for i, port in enumerate(self.ports)}
+        self._hotel_index = {hotel: j for j, hotel in enumerate(self.hotels)}
+
+        A, b, c, lb, ub = hajj_data.get_problem_matrices(example, sparse=True, bounds=True)
+        n_ports, n_hotels = len(self.ports), len(self.hotels)
+        self.A = A
+        self.supply = b[:n_ports].copy()
+        self.capacity = b[n_ports:n_ports + n_hotels].copy()
+        self.costs = c.reshape(n_ports, n_hotels).copy()
+        self.bus_capacity = ub.reshape(n_ports, n_hotels).copy()
+        self.closed = np.zeros((n_ports, n_hotels), dtype=bool)
+        self.lb = lb
+
+        self.engine = RevisedSimplex(A, self._rhs(), self._engine_costs(), lb, self._upper_bounds())
+        self.status = None
+        self.allocation = np.zeros((n_ports, n_hotels))
+        self.value = 0.0
+        self.unserved = float(self.supply.sum())
+        self._accept(self.engine.solve())
+
+    def _rhs(self):
+        # Pilgrim counts are whole, so floor() is exact for the integer model. The
+        # service row is left slack: the reward below moves everyone who can move.
+        return np.floor(np.concatenate([self.supply, self.capacity, [0.0]]) + 1e-9)
+
+    def _upper_bounds(self):
+        return np.where(self.closed, 0.0, self.bus_capacity).ravel()
+
+    def _engine_costs(self):
+        """
+        Costs less a reward per moved pilgrim, above what serving one more
+        pilgrim can add by rerouting along a path through every port and hotel
+        """
+        n_ports, n_hotels = self.costs.shape
+        reward = (np.abs(self.costs).max(initial=0.0) + 1.0) * (n_ports + n_hotels + 2)
+        return self.costs.ravel() - reward
+
+    def _accept(self, result):
+        """Take over the solution of a solve; without one, solve again from scratch"""
+        if result.point is None:
+            self.engine = RevisedSimplex(self.A, self._rhs(), self.engine.c, self.lb, self._upper_bounds())
+            result = self.engine.solve()
+        if result.point is not None and np.any(np.abs(result.point - np.round(result.point)) > 1e-6):
+            # Fractional vertex (fractional bus capacities): Branch and Bound
+            constraints = {'A': self.A, 'b': self.engine.b, 'lb': self.lb, 'ub': self._upper_bounds()}
+            result = BranchAndBound(solve_lp, constraints, self.engine.c).solve()
+        self.status = result.status
+        # Moving nobody fits any data, so a plan that may use closed pairs is never kept
+        point = result.point if result.point is not None else np.zeros(self.costs.size)
+        self.allocation = np.round(point).reshape(self.costs.shape)
+        self.value = float(self.costs.ravel() @ self.allocation.ravel())
+        self.unserved = float(self.supply.sum() - self.allocation.sum())
+
+    def update(self, supply=None, capacity=None, costs=None, close=None, reopen=None):
+        """
+        Apply changes to the data and re-optimize from the current solution
+        Args:
+            supply: {port: pilgrims waiting} for the ports whose supply changed
+            capacity: {hotel: capacity} for the hotels whose capacity changed
+            costs: {(port, hotel): cost per pilgrim} for the costs that changed
+            close: (port, hotel) pairs that can no longer be served
+            reopen: Closed (port, hotel) pairs that are available again
+        Returns:
+            List of (port, hotel, previous, new) for every pair whose allocation
+            changed. The new plan moves as many pilgrims as the data allows;
+            unserved counts the ones left at their ports.
+        """
+        for port, value in (supply or {}).items():
+            self.supply[self._port_index[port]] = value
+        for hotel, value in (capacity or {}).items():
+            self.capacity[self._hotel_index[hotel]] = value
+        new_costs = None
+        if costs:
+            for (port, hotel), value in costs.items():
+                self.costs[self._port_index[port], self._hotel_index[hotel]] = value
+            new_costs = self._engine_costs()
+        for port, hotel in close or ():
+            self.closed[self._port_index[port], self._hotel_index[hotel]] = True
+        for port, hotel in reopen or ():
+            self.closed[self._port_index[port], self._hotel_index[hotel]] = False
+
+        previous = self.allocation
+        self._accept(self.engine.modify(b=self._rhs(), c=new_costs, ub=self._upper_bounds()))
+        changed = np.argwhere(previous != self.allocation)
+        return [(self.ports[i], self.hotels[j], previous[i, j], self.allocation[i, j])
+                for i, j in changed]
@@ -0,0 +1,666 @@
+# simplex.py
+import numpy as np
+from sparse import CSRMatrix
+
+# Solver status codes
+OPTIMAL = 'optimal'
+INFEASIBLE = 'infeasible'
+UNBOUNDED = 'unbounded'
+ITERATION_LIMIT = 'iteration_limit'
+
+# Variable status codes
+BASIC = 0
+AT_LOWER = 1
+AT_UPPER = 2
+FREE = 3  # nonbasic free variable held at zero
+
+# Weight of the real costs, relative to the largest one, in the phase 1 objective
+PHASE1_COST_WEIGHT = 1e-4
+
+
+class LPResult(tuple):
+    """
+    Result of an LP solve. Unpacks as (optimal_point, optimal_value) so it can be
+    used wherever the old vertex enumeration result was, and also carries the
+    solver status, the final basis and the number of simplex iterations.
+    """
+    def __new__(cls, point, value, status, basis=None, iterations=0):
+        result = super().__new__(cls, (point, value))
+        result.status = status
+        result.basis = basis
+        result.iterations = iterations
+        return result
+
+    @property
+    def point(self):
+        return self[0]
+
+    @property
+    def value(self):
+        return self[1]
+
+
+class Basis:
+    """
+    Simplex basis: the basic column of every row plus the status of every column
+    Columns are the structural variables followed by one slack per row.
+    """
+    def __init__(self, basic, status):
+        self.basic = np.asarray(basic, dtype=np.int32)
+        self.status = np.asarray(status, dtype=np.int8)
+
+    def copy(self):
+        return Basis(self.basic.copy(), self.status.copy())
+
+    def resized(self, n, kept_rows, added_rows):
+        """
+        Basis of the model with only kept_rows of the old rows followed by
+        added_rows new ones, whose slacks enter the basis
+        Args:
+            n: Number of structural variables
+            kept_rows: Old row indices that stay, in order
+            added_rows: Number of rows appended after them
+        Returns:
+            The new Basis, or None when a dropped row's slack is nonbasic
+        """
+        m = len(self.basic)
+        kept_rows = np.asarray(kept_rows, dtype=np.int64)
+        dropped = np.setdiff1d(np.arange(m), kept_rows)
+        if np.any(self.status[n + dropped] != BASIC):
+            return None
+        index = np.full(n + m, -1)
+        index[:n] = np.arange(n)
+        index[n + kept_rows] = n + np.arange(len(kept_rows))
+        basic = index[self.basic]
+        basic = np.concatenate([basic[basic >= 0], n + len(kept_rows) + np.arange(added_rows)])
+        status = np.concatenate([self.status[:n], self.status[n + kept_rows],
+                                 np.full(added_rows, BASIC, dtype=np.int8)])
+        return Basis(basic, status)
+
+
+_lapack = None
+
+
+def _lapack_lu():
+    """
+    SciPy's LAPACK LU routines (dgetrf, dgetrs), or None without SciPy. SciPy
+    is imported on the first factorization, not with this module, since it
+    takes longer to import than most solves take to run.
+    """
+    global _lapack
+    if _lapack is None:
+        try:
+            from scipy.linalg.lapack import dgetrf, dgetrs
+            _lapack = dgetrf, dgetrs
+        except ImportError:  # NumPy-only: the basis kernel is inverted instead
+            _lapack = ()
+    return _lapack or None
+
+
+class LUFactor:
+    """
+    LU factorization of a basis matrix, kept up to date between refactorizations
+    with product-form eta updates. Unit (slack) columns are pivoted out first, so
+    only the kernel formed by the structural columns is factorized, with partial
+    pivoting. With SciPy installed the kernel is solved with its triangular
+    factors; without it NumPy's LAPACK inverse of the kernel is used instead.
+    """
+    def __init__(self, B):
+        B = np.asarray(B, dtype=float)
+        m = B.shape[0]
+        nonzero = B != 0
+
+        # Singleton columns pivot on their only nonzero row, the first one per row
+        candidates = np.flatnonzero(nonzero.sum(axis=0) == 1)
+        rows = np.argmax(nonzero[:, candidates], axis=0) if m else candidates
+        _, first = np.unique(rows, return_index=True)
+        singleton_cols = np.sort(candidates[first])
+        singleton_rows = np.argmax(nonzero[:, singleton_cols], axis=0) if m else singleton_cols
+        covered = np.zeros(m, dtype=bool)
+        covered[singleton_rows] = True
+
+        self.m = m
+        self.singleton_cols = singleton_cols
+        self.singleton_rows = singleton_rows
+        self.diagonal = B[singleton_rows, singleton_cols]
+        self.kernel_cols = np.setdiff1d(np.arange(m), singleton_cols)
+        self.kernel_rows = np.flatnonzero(~covered)
+        self.E = B[np.ix_(singleton_rows, self.kernel_cols)]
+
+        kernel = B[np.ix_(self.kernel_rows, self.kernel_cols)]
+        self.lapack = _lapack_lu() if len(kernel) else None
+        if len(kernel) == 0:
+            self.kernel = None
+        elif self.lapack is not None:
+            lu, piv, _ = self.lapack[0](kernel)
+            if np.abs(np.diagonal(lu)).min() < 1e-11:
+                raise np.linalg.LinAlgError("Singular basis matrix")
+            self.kernel = lu, piv
+        else:
+            self.kernel = np.linalg.inv(kernel)
+        self.etas = []
+
+    def _solve_kernel(self, v, trans=0):
+        """Solve K z = v (trans=0) or K^T z = v (trans=1) for the kernel K"""
+        if self.kernel is None:
+            return v
+        if self.lapack is not None:
+            return self.lapack[1](*self.kernel, v, trans=trans)[0]
+        return (self.kernel.T if trans else self.kernel) @ v
+
+    def ftran(self, v):
+        """Solve B x = v"""
+        v = np.asarray(v, dtype=float)
+        x = np.empty(self.m)
+        z = self._solve_kernel(v[self.kernel_rows])
+        x[self.kernel_cols] = z
+        x[self.singleton_cols] = (v[self.singleton_rows] - self.E @ z) / self.diagonal
+        for r, alpha in self.etas:
+            t = x[r] / alpha[r]
+            x -= t * alpha
+            x[r] = t
+        return x
+
+    def btran(self, v):
+        """Solve B^T y = v"""
+        w = np.array(v, dtype=float)
+        for r, alpha in reversed(self.etas):
+            w[r] = (w[r] - (w @ alpha - w[r] * alpha[r])) / alpha[r]
+        y = np.empty(self.m)
+        y_singleton = w[self.singleton_cols] / self.diagonal
+        y[self.singleton_rows] = y_singleton
+        y[self.kernel_rows] = self._solve_kernel(w[self.kernel_cols] - self.E.T @ y_singleton, trans=1)
+        return y
+
+    def update(self, r, alpha):
+        """Replace basis column r, given alpha = B^-1 a_q of the entering column"""
+        self.etas.append((r, np.array(alpha, dtype=float)))
+
+
+class RevisedSimplex:
+    """
+    Bounded-variable revised simplex method for
+        min c^T x  s.t.  A x <= b,  lb <= x <= ub
+    A may be a dense array or a CSRMatrix. A slack is added to every row,
+    phase 1 drives artificial variables out of the basis for rows whose slack
+    would start negative, and phase 2 optimizes the real objective. The basis
+    is kept as an LU factorization with eta updates.
+    """
+    def __init__(self, A, b, c, lb=None, ub=None, tol=1e-9, max_iter=None, refactor_every=64):
+        self._set_rows(A)
+        self.b = np.asarray(b, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.lb = np.full(self.n, -np.inf) if lb is None else np.asarray(lb, dtype=float)
+        self.ub = np.full(self.n, np.inf) if ub is None else np.asarray(ub, dtype=float)
+        self.tol = tol
+        self.max_iter = max_iter if max_iter is not None else 50 * (self.m + self.n) + 1000
+        self.refactor_every = refactor_every
+        self.lu = None
+
+    def _set_rows(self, A):
+        self.A = A if isinstance(A, CSRMatrix) else np.asarray(A, dtype=float)
+        self.AT = self.A.T  # rows of AT are the columns of A
+        self.m, self.n = self.A.shape
+        # Largest entry of every column: reduced costs and pivots are compared
+        # against tolerances scaled by it and by the largest cost
+        if isinstance(self.A, CSRMatrix):
+            self.column_scale = np.ones(self.n)
+            np.maximum.at(self.column_scale, self.A.indices, np.abs(self.A.data))
+        else:
+            self.column_scale = np.maximum(1.0, np.abs(self.A).max(axis=0, initial=0.0))
+
+    # ------------------------------------------------------------------
+    # Column access over [A | unit columns]
+    # ------------------------------------------------------------------
+    def _column(self, j):
+        if j < self.n:
+            return self.AT[j]
+        col = np.zeros(self.m)
+        col[self._unit_row[j - self.n]] = self._unit_sign[j - self.n]
+        return col
+
+    def _basis_matrix(self, basic):
+        B = np.zeros((self.m, self.m))
+        structural = np.flatnonzero(basic < self.n)
+        if isinstance(self.AT, CSRMatrix):
+            B[:, structural] = self.AT.take_rows(basic[structural]).T
+        else:
+            B[:, structural] = self.AT[basic[structural]].T
+        unit = np.flatnonzero(basic >= self.n)
+        B[self._unit_row[basic[unit] - self.n], unit] = self._unit_sign[basic[unit] - self.n]
+        return B
+
+    def _matvec(self, x):
+        """[A | unit columns] @ x"""
+        result = self.A @ x[:self.n]
+        np.add.at(result, self._unit_row, self._unit_sign * x[self.n:])
+        return result
+
+    def _pricing(self, y, cost):
+        """Reduced costs of every column"""
+        d = np.empty(len(cost))
+        d[:self.n] = cost[:self.n] - self.AT @ y
+        d[self.n:] = cost[self.n:] - self._unit_sign * y[self._unit_row]
+        return d
+
+    # ------------------------------------------------------------------
+    # Basis handling
+    # ------------------------------------------------------------------
+    def _factor(self):
+        self.lu = LUFactor(self._basis_matrix(self.basic))
+        self._recompute_basic_values()
+
+    def _recompute_basic_values(self):
+        x_nonbasic = self.x.copy()
+        x_nonbasic[self.basic] = 0.0
+        self.x[self.basic] = self.lu.ftran(self.b - self._matvec(x_nonbasic))
+
+    def _cost_tolerance(self, cost):
+        """Reduced-cost tolerance of every column: tol relative to the costs and the column's scale"""
+        scale = np.ones(len(cost))
+        scale[:self.n] = self.column_scale
+        return self.tol * max(1.0, np.abs(cost).max(initial=0.0)) * scale
+
+    def _pivot_tolerance(self, alpha):
+        """Smallest usable pivot: tol relative to the largest entry of alpha"""
+        return self.tol * max(1.0, np.abs(alpha).max(initial=0.0))
+
+    def _nonbasic_value(self, j):
+        if self.lower[j] > -np.inf:
+            return self.lower[j], AT_LOWER
+        if self.upper[j] < np.inf:
+            return self.upper[j], AT_UPPER
+        return 0.0, FREE
+
+    def duals(self):
+        """
+        Row prices y = c_B B^-1 of the current basis; at an optimum y <= 0 and -y[i]
+        is how much the objective falls per unit added to b[i]
+        """
+        cost = np.concatenate([self.c, np.zeros(len(self.x) - self.n)])
+        return self.lu.btran(cost[self.basic])
+
+    def tableau_row(self, r):
+        """Row r of B^-1 [A | unit columns]: how the basic variable of row r moves with every column"""
+        rho = self.lu.btran(np.eye(1, self.m, r).ravel())
+        row = np.empty(len(self.x))
+        row[:self.n] = self.AT @ rho
+        row[self.n:] = self._unit_sign * rho[self._unit_row]
+        return row
+
+    # ------------------------------------------------------------------
+    # Primal simplex
+    # ------------------------------------------------------------------
+    def _primal(self, cost):
+        """Run primal simplex iterations from a primal feasible basis"""
+        tol = self.tol
+        cost_tol = self._cost_tolerance(cost)
+        degenerate_run = 0
+        while True:
+            if self.iterations >= self.max_iter:
+                return ITERATION_LIMIT
+            if len(self.lu.etas) >= self.refactor_every:
+                self._factor()
+
+            y = self.lu.btran(cost[self.basic])
+            d = self._pricing(y, cost)
+
+            status = self.status
+            movable = self.upper > self.lower
+            violation = np.zeros(len(d))
+            at_lower = (status == AT_LOWER) & movable
+            at_upper = (status == AT_UPPER) & movable
+            free = status == FREE
+            violation[at_lower] = -d[at_lower]
+            violation[at_upper] = d[at_upper]
+            violation[free] = np.abs(d[free])
+
+            candidates = np.flatnonzero(violation > cost_tol)
+            if len(candidates) == 0:
+                return OPTIMAL
+            if degenerate_run > 50:
+                q = candidates[0]  # Bland's rule to break cycling
+            else:
+                q = candidates[np.argmax(violation[candidates])]
+            direction = 1.0 if d[q] < 0 else -1.0
+
+            alpha = self.lu.ftran(self._column(q))
+            x_B = self.x[self.basic]
+            delta = -direction * alpha
+            lo = self.lower[self.basic]
+            hi = self.upper[self.basic]
+
+            ratios = np.full(self.m, np.inf)
+            pivot_tol = self._pivot_tolerance(delta)
+            dec = delta < -pivot_tol
+            inc = delta > pivot_tol
+            ratios[dec] = (x_B[dec] - lo[dec]) / -delta[dec]
+            ratios[inc] = (hi[inc] - x_B[inc]) / delta[inc]
+            ratios = np.maximum(ratios, 0.0)
+
+            theta = ratios.min() if self.m else np.inf
+            flip = self.upper[q] - self.lower[q]
+            if flip == np.inf and theta == np.inf:
+                return UNBOUNDED
+            if flip <= theta:
+                theta = flip
+                r = -1
+            else:
+                ties = np.flatnonzero(ratios <= theta + tol)
+                if degenerate_run > 50:
+                    r = ties[np.argmin(self.basic[ties])]
+                else:
+                    r = ties[np.argmax(np.abs(alpha[ties]))]
+
+            self.iterations += 1
+            degenerate_run = degenerate_run + 1 if theta <= tol else 0
+            self.x[self.basic] = x_B + theta * delta
+            self.x[q] += direction * theta
+
+            if r < 0:
+                self.status[q] = AT_UPPER if direction > 0 else AT_LOWER
+                continue
+
+            leaving = self.basic[r]
+            if delta[r] < 0:
+                self.x[leaving] = self.lower[leaving]
+                self.status[leaving] = AT_LOWER
+            else:
+                self.x[leaving] = self.upper[leaving]
+                self.status[leaving] = AT_UPPER
+            self.basic[r] = q
+            self.status[q] = BASIC
+            self.lu.update(r, alpha)
+
+    # ------------------------------------------------------------------
+    # Dual simplex
+    # ------------------------------------------------------------------
+    def _dual(self, cost):
+        """Run dual simplex iterations from a dual feasible basis"""
+        tol = self.tol
+        cost_tol = self._cost_tolerance(cost)
+        while True:
+            if self.iterations >= self.max_iter:
+                return ITERATION_LIMIT
+            if len(self.lu.etas) >= self.refactor_every:
+                self._factor()
+
+            # Leaving row: the most infeasible basic variable
+            x_B = self.x[self.basic]
+            lo = self.lower[self.basic]
+            hi = self.upper[self.basic]
+            below = lo - x_B
+            above = x_B - hi
+            infeasibility = np.maximum(below, above)
+            r = int(np.argmax(infeasibility)) if self.m else 0
+            if not self.m or infeasibility[r] <= tol * max(1.0, abs(x_B[r])):
+                return OPTIMAL
+            to_lower = below[r] > 0
+            target = lo[r] if to_lower else hi[r]
+
+            alpha_row = self.tableau_row(r)
+
+            y = self.lu.btran(cost[self.basic])
+            d = self._pricing(y, cost)
+
+            # Entering candidates keep the basic variable moving toward its bound
+            status = self.status
+            movable = (status != BASIC) & (self.upper > self.lower)
+            sign = 1.0 if to_lower else -1.0
+            pivot_tol = self._pivot_tolerance(alpha_row[movable])
+            eligible = movable & (
+                ((status == AT_LOWER) & (sign * alpha_row < -pivot_tol)) |
+                ((status == AT_UPPER) & (sign * alpha_row > pivot_tol)) |
+                ((status == FREE) & (np.abs(alpha_row) > pivot_tol)))
+            candidates = np.flatnonzero(eligible)
+            if len(candidates) == 0:
+                return INFEASIBLE
+
+            ratios = np.abs(d[candidates]) / np.abs(alpha_row[candidates])
+            best = ratios.min()
+            ties = candidates[ratios <= best + cost_tol[candidates] / np.abs(alpha_row[candidates])]
+            q = ties[np.argmax(np.abs(alpha_row[ties]))]
+
+            alpha = self.lu.ftran(self._column(q))
+            theta = (x_B[r] - target) / alpha[r]
+            self.iterations += 1
+            self.x[self.basic] = x_B - theta * alpha
+            self.x[q] += theta
+
+            leaving = self.basic[r]
+            self.x[leaving] = target
+            self.status[leaving] = AT_LOWER if to_lower else AT_UPPER
+            self.basic[r] = q
+            self.status[q] = BASIC
+            self.lu.update(r, alpha)
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+    def _setup(self):
+        """Slack basis with artificial columns on the rows that start infeasible"""
+        m, n = self.m, self.n
+        self.lower = np.concatenate([self.lb, np.zeros(m)])
+        self.upper = np.concatenate([self.ub, np.full(m, np.inf)])
+        self.x = np.zeros(n + m)
+        self.status = np.empty(n + m, dtype=np.int8)
+        for j in range(n):
+            self.x[j], self.status[j] = self._nonbasic_value(j)
+
+        self._unit_row = np.arange(m)
+        self._unit_sign = np.ones(m)
+        slack = self.b - self.A @ self.x[:n]
+        infeasible_rows = np.flatnonzero(slack < -self.tol)
+
+        self.basic = n + np.arange(m)
+        self.status[n:] = BASIC
+        self.x[n:] = slack
+        if len(infeasible_rows):
+            # Artificial column -e_i replaces the slack of every infeasible row
+            k = len(infeasible_rows)
+            self._unit_row = np.concatenate([self._unit_row, infeasible_rows])
+            self._unit_sign = np.concatenate([self._unit_sign, -np.ones(k)])
+            self.lower = np.concatenate([self.lower, np.zeros(k)])
+            self.upper = np.concatenate([self.upper, np.full(k, np.inf)])
+            self.x = np.concatenate([self.x, -slack[infeasible_rows]])
+            self.status = np.concatenate([self.status, np.full(k, BASIC, dtype=np.int8)])
+            self.x[n + infeasible_rows] = 0.0
+            self.status[n + infeasible_rows] = AT_LOWER
+            self.basic[infeasible_rows] = n + m + np.arange(k)
+        return len(infeasible_rows)
+
+    def _drop_artificials(self):
+        """Swap basic artificials (all at zero) for the slack of the same row"""
+        n, m = self.n, self.m
+        for r, j in enumerate(self.basic):
+            if j >= n + m:
+                row = self._unit_row[j - n]
+                self.basic[r] = n + row
+                self.status[n + row] = BASIC
+                self.x[n + row] = 0.0
+        self._unit_row = self._unit_row[:m]
+        self._unit_sign = self._unit_sign[:m]
+        self.lower = self.lower[:n + m]
+        self.upper = self.upper[:n + m]
+        self.x = self.x[:n + m]
+        self.status = self.status[:n + m]
+
+    def _warm_start(self, basis):
+        """
+        Load a basis from an earlier solve of the same model, whose bounds may since
+        have changed. Nonbasic variables are put back on their (new) bounds.
+        Returns:
+            False when the basis cannot be used
+        """
+        m, n = self.m, self.n
+        if len(basis.basic) != m or len(basis.status) != n + m:
+            return False
+        self.lower = np.concatenate([self.lb, np.zeros(m)])
+        self.upper = np.concatenate([self.ub, np.full(m, np.inf)])
+        self._unit_row = np.arange(m)
+        self._unit_sign = np.ones(m)
+        self.basic = basis.basic.copy()
+        self.status = basis.status.copy()
+        self.x = np.zeros(n + m)
+        self._place_nonbasic()
+        try:
+            self._factor()
+        except np.linalg.LinAlgError:
+            return False
+        return True
+
+    def _place_nonbasic(self):
+        """Put every nonbasic variable on its bound, switching sides when that bound is gone"""
+        nonbasic = np.flatnonzero(self.status != BASIC)
+        lower_ok = np.isfinite(self.lower[nonbasic])
+        upper_ok = np.isfinite(self.upper[nonbasic])
+        status = self.status[nonbasic]
+        status = np.where((status == AT_UPPER) & ~upper_ok, AT_LOWER, status)
+        status = np.where((status == AT_LOWER) & ~lower_ok, np.where(upper_ok, AT_UPPER, FREE), status)
+        status = np.where((status == FREE) & lower_ok, AT_LOWER, status)
+        status = np.where((status == FREE) & upper_ok, AT_UPPER, status)
+        self.status[nonbasic] = status
+        self.x[nonbasic] = np.select([status == AT_LOWER, status == AT_UPPER],
+                                     [self.lower[nonbasic], self.upper[nonbasic]], 0.0)
+
+    def _is_primal_feasible(self):
+        x_B = self.x[self.basic]
+        slack = self.tol * np.maximum(1.0, np.abs(x_B))
+        return bool(np.all(x_B >= self.lower[self.basic] - slack) and
+                    np.all(x_B <= self.upper[self.basic] + slack))
+
+    def _is_dual_feasible(self, cost):
+        d = self._pricing(self.lu.btran(cost[self.basic]), cost)
+        movable = self.upper > self.lower
+        tol = 100 * self._cost_tolerance(cost)
+        return not (np.any(movable & (self.status == AT_LOWER) & (d < -tol)) or
+                    np.any(movable & (self.status == AT_UPPER) & (d > tol)) or
+                    np.any((self.status == FREE) & (np.abs(d) > tol)))
+
+    def _artificial_left(self):
+        return self.x[self.n + self.m:].sum() > 1e-7 * max(1.0, np.abs(self.b).max(initial=0.0))
+
+    def solve(self, basis=None):
+        """
+        Solve the LP, from a slack starting basis or warm-started from an earlier basis
+        A warm start that is still primal feasible continues with the primal
+        simplex; one that is only dual feasible (e.g. after tightening a bound or
+        changing b) re-optimizes with the dual simplex.
+        Args:
+            basis: Optional Basis from an earlier solve of the same model
+        Returns:
+            LPResult (optimal_point, optimal_value) with status, basis and iterations
+        """
+        self.iterations = 0
+        if basis is not None and self._warm_start(basis):
+            cost = np.concatenate([self.c, np.zeros(self.m)])
+            if self._is_primal_feasible():
+                return self._result(self._primal(cost))
+            if self._is_dual_feasible(cost):
+                status = self._dual(cost)
+                if status == OPTIMAL:
+                    status = self._primal(cost)  # clean up any tolerance-level dual infeasibility
+                return self._result(status)
+
+        n_artificial = self._setup()
+        self._factor()
+
+        if n_artificial:
+            # A small share of the real costs steers phase 1 towards cheap vertices;
+            # if that leaves artificials behind, the pure phase 1 objective finishes
+            phase1_cost = np.zeros(len(self.x))
+            phase1_cost[self.n + self.m:] = 1.0
+            phase1_cost[:self.n] = PHASE1_COST_WEIGHT * self.c / max(1.0, np.abs(self.c).max(initial=0.0))
+            status = self._primal(phase1_cost)
+            if status != ITERATION_LIMIT and (status == UNBOUNDED or self._artificial_left()):
+                phase1_cost[:self.n] = 0.0
+                status = self._primal(phase1_cost)
+            if status == ITERATION_LIMIT:
+                return LPResult(None, None, status, iterations=self.iterations)
+            if self._artificial_left():
+                return LPResult(None, None, INFEASIBLE, iterations=self.iterations)
+            self._drop_artificials()
+            self._factor()
+
+        cost = np.concatenate([self.c, np.zeros(self.m)])
+        status = self._primal(cost)
+        return self._result(status)
+
+    def modify(self, b=None, c=None, lb=None, ub=None, A=None, kept_rows=None):
+        """
+        Change part of the data and solve again from the basis and LU factorization
+        of the previous solve. Right-hand side and bound changes leave the basis
+        dual feasible for the old costs, so the dual simplex restores primal
+        feasibility under those; the primal simplex then optimizes the new costs.
+        New rows (e.g. cuts) start with their slacks basic, which keeps the basis
+        dual feasible as well.
+        Args:
+            b: New right-hand side
+            c: New cost vector
+            lb, ub: New variable bounds
+            A: New constraint matrix: the old rows in kept_rows followed by any new
+               rows; b must be given with it
+            kept_rows: Old row indices that stay in A, in order (default all of them).
+                       The slack of a dropped row must be basic.
+        Returns:
+            LPResult (optimal_point, optimal_value) with status, basis and iterations
+        """
+        n = self.n
+        old_cost = np.concatenate([self.c, np.zeros(self.m)])
+        solved = self.lu is not None and len(self.x) == n + self.m
+        basis = None
+        if A is not None:
+            if b is None:
+                raise ValueError("New rows need a new right-hand side")
+            kept_rows = np.arange(self.m) if kept_rows is None else kept_rows
+            if solved:
+                basis = Basis(self.basic, self.status).resized(n, kept_rows, A.shape[0] - len(kept_rows))
+            self._set_rows(A)
+            old_cost = np.concatenate([self.c, np.zeros(self.m)])
+        if b is not None:
+            self.b = np.asarray(b, dtype=float)
+        if c is not None:
+            self.c = np.asarray(c, dtype=float)
+        if lb is not None:
+            self.lb = np.asarray(lb, dtype=float)
+        if ub is not None:
+            self.ub = np.asarray(ub, dtype=float)
+        if A is not None:
+            solved = basis is not None and self._warm_start(basis)
+        if not solved or not self._is_dual_feasible(old_cost):
+            return self.solve()
+
+        m = self.m
+        self.iterations = 0
+        self.lower[:n] = self.lb
+        self.upper[:n] = self.ub
+        self._place_nonbasic()
+        self._recompute_basic_values()
+        status = OPTIMAL
+        if not self._is_primal_feasible():
+            status = self._dual(old_cost)
+        if status == OPTIMAL:
+            status = self._primal(np.concatenate([self.c, np.zeros(m)]))
+        return self._result(status)
+
+    def _result(self, status):
+        basis = Basis(self.basic.copy(), self.status.copy())
+        if status != OPTIMAL:
+            return LPResult(None, None, status, basis, self.iterations)
+        point = self.x[:self.n].copy()
+        return LPResult(point, float(self.c @ point), status, basis, self.iterations)
+
+
+def solve_lp(constraints, cost, basis=None):
+    """
+    LP solver with the signature Branch and Bound expects
+    Args:
+        constraints: Dictionary containing A and b, and optionally lb/ub variable bounds
+        cost: Cost vector c
+        basis: Optional basis to warm-start from
+    Returns:
+        LPResult
+    """
+    engine = RevisedSimplex(constraints['A'], constraints['b'], cost,
+                            constraints.get('lb'), constraints.get('ub'))
+    return engine.solve(basis)
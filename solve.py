@@ -0,0 +1,100 @@
+# solve.py
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from main import HajjOptimizationSystem
+from simplex import INFEASIBLE
+
+EXAMPLES = ('small', 'medium', 'large')
+ENGINES = ('ip', 'transport')
+REPORT_FORMATS = ('txt', 'json', 'csv', 'parquet')
+
+
+def _instance_name(instance):
+    """'small', 'medium', 'large' or the directory name of an array instance"""
+    return os.path.basename(os.path.normpath(instance))
+
+
+def solution_record(name, engine, ports, hotels, point, value, execution_time, status):
+    """
+    Solution as a JSON-serializable dictionary, built with array operations only
+    Returns:
+        Dictionary with the status, total cost, time and [port, hotel, pilgrims] flows
+    """
+    flows = []
+    if point is not None:
+        allocation = np.trunc(np.asarray(point, dtype=float) + 1e-6).reshape(len(ports), len(hotels))
+        rows, cols = np.nonzero(allocation > 0)
+        pilgrims = allocation[rows, cols].astype(np.int64)
+        flows = [[ports[i], hotels[j], amount] for i, j, amount in
+                 zip(rows.tolist(), cols.tolist(), pilgrims.tolist())]
+    return {
+        'instance': name,
+        'engine': engine,
+        'status': status,
+        'total_cost': float(value) if value is not None else None,
+        'execution_time': execution_time,
+        'n_ports': len(ports),
+        'n_hotels': len(hotels),
+        'flows': flows,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Solve one Hajj instance and write the solution. Reports and charts '
+                    'are only built when asked for.')
+    parser.add_argument('instance', help="'small', 'medium', 'large' or an array instance directory")
+    parser.add_argument('--engine', choices=ENGINES, default='ip')
+    parser.add_argument('--output', default=None,
+                        help='Output path without extension (default: results/<instance>)')
+    parser.add_argument('--report', nargs='+', choices=REPORT_FORMATS, default=[],
+                        help='Also write the solution report in these formats')
+    parser.add_argument('--plot', action='store_true',
+                        help='Also render the flow and capacity charts next to the output, '
+                             'named after it')
+    parser.add_argument('--time-limit', type=float, default=None)
+    parser.add_argument('--node-limit', type=int, default=None)
+    parser.add_argument('--rel-gap', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args(argv)
+    if args.instance not in EXAMPLES and not os.path.isdir(args.instance):
+        parser.error(f"{args.instance} is neither an example name nor an instance directory")
+
+    name = _instance_name(args.instance)
+    prefix = args.output or os.path.join('results', name)
+    os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+
+    system = HajjOptimizationSystem()
+    options = {}
+    if args.engine == 'ip':
+        options = dict(time_limit=args.time_limit, node_limit=args.node_limit,
+                       rel_gap=args.rel_gap, workers=args.workers)
+    point, value, execution_time, result = system.solve(args.instance, args.engine, **options)
+    status = result.status if result is not None else INFEASIBLE
+
+    ports, hotels = system.hajj_data.get_names(args.instance)
+    record = solution_record(name, args.engine, ports, hotels, point, value, execution_time, status)
+    paths = [f'{prefix}.solution.json']
+    with open(paths[0], 'w') as f:
+        json.dump(record, f, indent=2)
+
+    if args.report or args.plot:
+        report = system.build_report(name, point, value, execution_time, args.instance,
+                                     getattr(result, 'stats', None))
+        paths += report.write(prefix, args.report)
+        if args.plot:
+            from plotting import render_report
+            paths += render_report(report, os.path.basename(prefix), os.path.dirname(prefix) or '.')
+
+    cost = f"{record['total_cost']:,.2f}" if point is not None else '-'
+    print(f"{name}: {status}, cost {cost}, {execution_time:.3f} s")
+    for path in paths:
+        print(f"  {path}")
+    return 0 if point is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
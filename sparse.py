@@ -0,0 +1,96 @@
+# sparse.py
+import numpy as np
+
+
+class CSRMatrix:
+    """
+    Minimal compressed sparse row matrix: just what the solvers need
+    (matrix-vector products, transposes, row access and stacking), so memory
+    grows with the number of nonzeros instead of rows x columns.
+    """
+    def __init__(self, data, indices, indptr, shape):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self._transpose = None
+        self._row_ids = None
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape):
+        """Build from coordinate triplets (duplicates are not summed)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(values, dtype=float), rows.shape)
+        order = np.lexsort((cols, rows))
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(values[order], cols[order], indptr, shape)
+
+    @classmethod
+    def from_dense(cls, dense):
+        dense = np.atleast_2d(np.asarray(dense, dtype=float))
+        rows, cols = np.nonzero(dense)
+        return cls.from_coo(rows, cols, dense[rows, cols], dense.shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def row_ids(self):
+        """Row index of every stored nonzero"""
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return self._row_ids
+
+    @property
+    def T(self):
+        if self._transpose is None:
+            transpose = CSRMatrix.from_coo(self.indices, self.row_ids, self.data,
+                                           (self.shape[1], self.shape[0]))
+            transpose._transpose = self
+            self._transpose = transpose
+        return self._transpose
+
+    def __matmul__(self, x):
+        x = np.asarray(x, dtype=float)
+        return np.bincount(self.row_ids, weights=self.data * x[self.indices],
+                           minlength=self.shape[0])
+
+    def __getitem__(self, i):
+        """Row i as a dense vector"""
+        start, end = self.indptr[i], self.indptr[i + 1]
+        row = np.zeros(self.shape[1])
+        row[self.indices[start:end]] = self.data[start:end]
+        return row
+
+    def take_rows(self, rows):
+        """Dense matrix of the given rows, in order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        lengths = ends - starts
+        positions = np.repeat(ends - np.cumsum(lengths), lengths) + np.arange(lengths.sum())
+        dense = np.zeros((len(rows), self.shape[1]))
+        dense[np.repeat(np.arange(len(rows)), lengths), self.indices[positions]] = self.data[positions]
+        return dense
+
+    def toarray(self):
+        dense = np.zeros(self.shape)
+        dense[self.row_ids, self.indices] = self.data
+        return dense
+
+
+def vstack(blocks):
+    """Stack dense arrays and CSRMatrix blocks; the result is sparse if any block is"""
+    if not any(isinstance(block, CSRMatrix) for block in blocks):
+        return np.vstack(blocks)
+    blocks = [block if isinstance(block, CSRMatrix) else CSRMatrix.from_dense(block)
+              for block in blocks]
+    data = np.concatenate([block.data for block in blocks])
+    indices = np.concatenate([block.indices for block in blocks])
+    offsets = np.cumsum([0] + [block.nnz for block in blocks[:-1]])
+    indptr = np.concatenate([[0]] + [block.indptr[1:] + offset
+                                     for block, offset in zip(blocks, offsets)])
+    shape = (sum(block.shape[0] for block in blocks), blocks[0].shape[1])
+    return CSRMatrix(data, indices, indptr, shape)
@@ -0,0 +1,76 @@
+# stats.py
+import time
+import numpy as np
+
+# Counters that are summed when statistics from several searches are merged
+COUNTERS = ('nodes_created', 'nodes_solved', 'pruned_by_bound', 'pruned_infeasible',
+            'integral_nodes', 'lp_calls', 'pivots', 'lp_time', 'branching_time',
+            'heuristic_solutions', 'heuristic_lps', 'heuristic_time')
+
+
+class SolverStats:
+    """
+    Statistics of one Branch and Bound run: node and LP counters, time split
+    into LP solves, branching, primal heuristics and bookkeeping, and the incumbent and global
+    bound over time as (seconds, incumbent, bound) entries when history is on.
+    """
+    def __init__(self, history=True):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.start = time.perf_counter()
+        self.total_time = 0.0
+        self.incumbent = np.inf
+        self.bound = -np.inf
+        self.keep_history = history
+        self.history = []
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    @property
+    def bookkeeping_time(self):
+        return max(0.0, self.total_time - self.lp_time - self.branching_time - self.heuristic_time)
+
+    @property
+    def gap(self):
+        """Relative gap between the incumbent and the global bound"""
+        if not np.isfinite(self.incumbent):
+            return np.inf
+        return (self.incumbent - self.bound) / max(1.0, abs(self.incumbent))
+
+    def record(self, incumbent, bound):
+        """Snapshot the incumbent and the global bound"""
+        self.incumbent = incumbent
+        self.bound = bound
+        if self.keep_history:
+            self.history.append((self.elapsed, incumbent, bound))
+
+    def merge(self, counters):
+        """Add the counters of another search, e.g. a parallel worker"""
+        for name in COUNTERS:
+            setattr(self, name, getattr(self, name) + counters[name])
+
+    def counters(self):
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def as_dict(self):
+        data = self.counters()
+        data.update(total_time=self.total_time, bookkeeping_time=self.bookkeeping_time,
+                    incumbent=self.incumbent, bound=self.bound, history=list(self.history))
+        return data
+
+    def summary(self):
+        """Report lines describing the run"""
+        return [
+            f"Nodes: {self.nodes_created} created, {self.nodes_solved} solved, "
+            f"{self.pruned_by_bound} pruned by bound, {self.pruned_infeasible} infeasible, "
+            f"{self.integral_nodes} integral",
+            f"LP: {self.lp_calls} calls, {self.pivots} pivots",
+            f"Time: {self.total_time:.3f} s total, {self.lp_time:.3f} s LP, "
+            f"{self.branching_time:.3f} s branching, {self.heuristic_time:.3f} s heuristics, "
+            f"{self.bookkeeping_time:.3f} s bookkeeping",
+            f"Heuristics: {self.heuristic_solutions} incumbents, {self.heuristic_lps} dive LPs",
+            f"Incumbent: {self.incumbent:,.2f}, bound: {self.bound:,.2f}, "
+            f"{len(self.history)} history snapshots",
+        ]
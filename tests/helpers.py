@@ -0,0 +1,43 @@
+# tests/helpers.py
+import numpy as np
+
+
+def linprog_bounds(lb, ub):
+    """Bounds in the (low, high) pairs of scipy's linprog, None for infinite"""
+    return [(None if np.isinf(low) else low, None if np.isinf(high) else high)
+            for low, high in zip(lb, ub)]
+
+
+def random_lp(rng, max_rows=15, max_cols=12):
+    """Small LP min c x, A x <= b with a mix of bounded, one-sided and free variables"""
+    m, n = int(rng.integers(1, max_rows)), int(rng.integers(1, max_cols))
+    A = rng.integers(-5, 6, (m, n)).astype(float)
+    b = rng.integers(-10, 20, m).astype(float)
+    c = rng.integers(-5, 6, n).astype(float)
+    lb = np.where(rng.random(n) < 0.7, rng.integers(-3, 2, n), -np.inf)
+    ub = np.where(rng.random(n) < 0.7, lb + rng.integers(0, 8, n), np.inf)
+    ub = np.where(np.isinf(lb), np.where(rng.random(n) < 0.5, rng.integers(-3, 5, n), np.inf), ub)
+    return A, b, c, lb, ub
+
+
+def random_ip(rng, m=None, n=None):
+    """Small bounded IP min c x, A x <= b, 0 <= x <= ub with negative costs"""
+    m = m or int(rng.integers(2, 8))
+    n = n or int(rng.integers(2, 8))
+    A = rng.integers(-3, 9, (m, n)).astype(float)
+    b = rng.integers(5, 40, m).astype(float)
+    c = -rng.integers(1, 20, n).astype(float)
+    return A, b, c, np.zeros(n), rng.integers(3, 15, n).astype(float)
+
+
+def milp_value(A, b, c, lb, ub):
+    """Optimal value of min c x, A x <= b, lb <= x <= ub, x integer with scipy, or None"""
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    result = milp(c, constraints=LinearConstraint(A, -np.inf, b), bounds=Bounds(lb, ub),
+                  integrality=np.ones(len(c)))
+    return result.fun if result.status == 0 else None
+
+
+def linprog_status(result):
+    """Status name of a linprog result, as used by simplex.py"""
+    return {0: 'optimal', 2: 'infeasible', 3: 'unbounded'}[result.status]
@@ -0,0 +1,110 @@
+# tests/test_array_instance.py
+import csv
+import json
+import os
+import numpy as np
+import pytest
+from data.array_instance import ArrayInstance, import_csv, load_instance, save_instance
+from data.generator import generate_instance
+from data.sample_data import HajjData
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def csv_files(tmp_path, instance, cost_rows=None):
+    ports = write_csv(tmp_path / 'ports.csv', ['port', 'supply'], zip(instance.ports, instance.supply))
+    hotels = write_csv(tmp_path / 'hotels.csv', ['hotel', 'capacity'], zip(instance.hotels, instance.capacity))
+    if cost_rows is None:
+        cost_rows = [(port, hotel, instance.costs[i, j]) for i, port in enumerate(instance.ports)
+                     for j, hotel in enumerate(instance.hotels)]
+    costs = write_csv(tmp_path / 'costs.csv', ['port', 'hotel', 'cost'], cost_rows)
+    return ports, hotels, costs
+
+
+def assert_same_instance(a, b):
+    assert a.ports == b.ports and a.hotels == b.hotels and a.bus_capacity == b.bus_capacity
+    for name in ('supply', 'capacity', 'costs'):
+        assert np.array_equal(getattr(a, name), getattr(b, name))
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_and_load_round_trip(tmp_path, mmap):
+    instance = generate_instance(5, 9, seed=4, as_arrays=True)
+    save_instance(instance, tmp_path / 'instance')
+    loaded = load_instance(str(tmp_path / 'instance'), mmap=mmap)
+    assert_same_instance(loaded, instance)
+    assert isinstance(loaded.costs, np.memmap) == mmap
+    if mmap:
+        assert not loaded.costs.flags.writeable
+
+
+def test_dictionary_round_trip():
+    data = HajjData().get_example('large')
+    instance = ArrayInstance.from_dict(data)
+    assert instance.to_dict() == data
+    with pytest.raises(ValueError):
+        ArrayInstance(['p'], ['h1', 'h2'], np.ones(1), np.ones(2), np.ones((2, 1)), 50)
+
+
+def test_saved_directory_builds_the_same_model(tmp_path):
+    example = generate_instance(4, 6, seed=5)
+    save_instance(example, tmp_path / 'instance')
+    data = HajjData()
+    for a, b in zip(data.get_problem_matrices(example), data.get_problem_matrices(str(tmp_path / 'instance'))):
+        assert np.array_equal(a, b)
+
+
+def test_unknown_format_version(tmp_path):
+    save_instance(generate_instance(2, 3, as_arrays=True), tmp_path)
+    meta = json.loads((tmp_path / 'meta.json').read_text())
+    (tmp_path / 'meta.json').write_text(json.dumps(dict(meta, version=99)))
+    with pytest.raises(ValueError, match='version'):
+        load_instance(str(tmp_path))
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 100000])
+def test_import_csv(tmp_path, chunk_rows):
+    instance = generate_instance(4, 6, seed=6, as_arrays=True)
+    imported = import_csv(*csv_files(tmp_path, instance), str(tmp_path / 'out'), 50, chunk_rows)
+    assert_same_instance(imported, instance)
+
+
+def test_import_csv_rejects_missing_and_unknown_pairs(tmp_path):
+    instance = generate_instance(3, 4, seed=7, as_arrays=True)
+    rows = [(port, hotel, 1.0) for port in instance.ports for hotel in instance.hotels]
+    with pytest.raises(ValueError, match='no cost for 1'):
+        import_csv(*csv_files(tmp_path, instance, rows[1:]), str(tmp_path / 'out'), 50)
+    with pytest.raises(ValueError, match='unknown'):
+        import_csv(*csv_files(tmp_path, instance, rows + [('Nowhere', instance.hotels[0], 1.0)]),
+                   str(tmp_path / 'out'), 50)
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 100000])
+def test_import_csv_rejects_duplicate_pairs(tmp_path, chunk_rows):
+    # The duplicate lands in a later chunk with chunk_rows=1 and in the same one otherwise
+    instance = generate_instance(3, 4, seed=8, as_arrays=True)
+    rows = [(port, hotel, 1.0) for port in instance.ports for hotel in instance.hotels]
+    rows.append((instance.ports[1], instance.hotels[2], 99.0))
+    with pytest.raises(ValueError, match=f'more than one cost for {instance.ports[1]},{instance.hotels[2]}'):
+        import_csv(*csv_files(tmp_path, instance, rows), str(tmp_path / 'out'), 50, chunk_rows)
+
+
+def test_failed_import_leaves_nothing_behind(tmp_path):
+    instance = generate_instance(3, 4, seed=9, as_arrays=True)
+    rows = [(port, hotel, 1.0) for port in instance.ports for hotel in instance.hotels]
+    files = csv_files(tmp_path, instance, rows[1:])
+    before = sorted(os.listdir(tmp_path))
+    with pytest.raises(ValueError, match='no cost'):
+        import_csv(*files, str(tmp_path / 'out'), 50)
+    assert sorted(os.listdir(tmp_path)) == before
+    # A failed re-import keeps the instance that is already there
+    save_instance(instance, tmp_path / 'out')
+    with pytest.raises(ValueError, match='no cost'):
+        import_csv(*files, str(tmp_path / 'out'), 50)
+    assert_same_instance(load_instance(str(tmp_path / 'out')), instance)
@@ -0,0 +1,63 @@
+# tests/test_batch.py
+import numpy as np
+import pytest
+from batch import solve_batch
+from data.sample_data import HajjData
+from helpers import linprog_bounds, linprog_status
+from simplex import OPTIMAL
+
+linprog = pytest.importorskip('scipy.optimize').linprog
+
+
+def scenarios(example, n_scenarios, seed):
+    data = HajjData()
+    supply, capacity, _, _ = data.get_transport_problem(example)
+    rng = np.random.default_rng(seed)
+    supply = np.floor(supply * rng.uniform(0.6, 1.3, (n_scenarios, len(supply))))
+    capacity = np.floor(capacity * rng.uniform(0.8, 1.1, (n_scenarios, len(capacity))))
+    A, _, c, lb, ub = data.get_problem_matrices(example, sparse=True, bounds=True)
+    return {'A': A, 'lb': lb, 'ub': ub}, c, data.get_scenario_rhs(example, supply, capacity, bounds=True)
+
+
+@pytest.mark.parametrize('example', ['medium', 'large'])
+def test_scenarios_match_independent_solves(example):
+    constraints, c, rhs = scenarios(example, 12, seed=60)
+    batch = solve_batch(constraints, c, rhs)
+    assert len(batch) == len(rhs)
+    A, bounds = constraints['A'].toarray(), linprog_bounds(constraints['lb'], constraints['ub'])
+    for k, b in enumerate(rhs):
+        # The transport model is totally unimodular: the LP optimum is the IP optimum
+        reference = linprog(c, A_ub=A, b_ub=b, bounds=bounds, method='highs')
+        assert batch.status[k] == linprog_status(reference)
+        if batch.status[k] != OPTIMAL:
+            assert np.all(np.isnan(batch.points[k]))
+            continue
+        assert batch.values[k] == pytest.approx(reference.fun)
+        assert np.array_equal(batch.points[k], np.round(batch.points[k]))
+        assert np.all(A @ batch.points[k] <= b + 1e-9)
+
+
+def test_workers_give_the_same_results():
+    constraints, c, rhs = scenarios('large', 8, seed=61)
+    serial = solve_batch(constraints, c, rhs)
+    parallel = solve_batch(constraints, c, rhs, workers=2)
+    assert list(parallel.status) == list(serial.status)
+    assert np.allclose(parallel.values, serial.values, equal_nan=True)
+
+
+def test_warm_started_scenarios_need_fewer_pivots():
+    constraints, c, rhs = scenarios('large', 10, seed=62)
+    batch = solve_batch(constraints, c, rhs)
+    assert batch.iterations[1:].mean() < batch.iterations[0]
+
+
+def test_scenarios_where_the_buses_bind_stay_feasible():
+    data = HajjData()
+    supply, capacity, _, bus_capacity = data.get_transport_problem('medium')
+    # Ten times the pilgrims and beds: more than one bus per pair can carry
+    scale = np.array([[1.0], [10.0]])
+    rhs = data.get_scenario_rhs('medium', scale * supply, scale * capacity, bounds=True)
+    A, _, c, lb, ub = data.get_problem_matrices('medium', sparse=True, bounds=True)
+    batch = solve_batch({'A': A, 'lb': lb, 'ub': ub}, c, rhs)
+    assert list(batch.status) == [OPTIMAL, OPTIMAL]
+    assert batch.points[1].sum() == -rhs[1, -1] == len(supply) * len(capacity) * bus_capacity
@@ -0,0 +1,51 @@
+# tests/test_benchmark.py
+import json
+import time
+import benchmark
+from benchmark import compare, run_case
+
+
+def test_run_case_records_a_solve():
+    record = run_case('transport', 5, 8, repeat=2, memory=True)
+    assert record['status'] == 'optimal'
+    assert record['time_s'] >= 0 and record['peak_mb'] > 0
+    assert (record['n_ports'], record['n_hotels'], record['seed']) == (5, 8, 0)
+    ip = run_case('ip', 3, 4, repeat=1, memory=False)
+    assert ip['status'] == 'optimal'
+    assert ip['nodes'] is not None and ip['peak_mb'] is None
+
+
+def test_first_solve_is_not_timed(monkeypatch):
+    # A first solve that pays a one-off cost must not set the reported time
+    calls = []
+    real_solve = benchmark._solve
+
+    def solve(*args):
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.2)
+        return real_solve(*args)
+
+    monkeypatch.setattr(benchmark, '_solve', solve)
+    record = run_case('transport', 3, 4, repeat=3, memory=False)
+    assert len(calls) == 4
+    assert record['time_s'] < 0.1
+
+
+def test_compare_flags_only_real_regressions():
+    base = {'engine': 'ip', 'n_ports': 2, 'n_hotels': 2, 'seed': 0, 'status': 'optimal',
+            'value': 10.0, 'time_s': 0.001, 'peak_mb': 1.0, 'nodes': 5}
+    noise = dict(base, time_s=0.005)           # slower, but below min_time
+    assert compare([noise], [base]) == []
+    worse = dict(base, value=11.0, time_s=0.5, peak_mb=2.0, nodes=9)
+    metrics = {regression['metric'] for regression in compare([worse], [base])}
+    assert metrics == {'value', 'time_s', 'peak_mb', 'nodes'}
+
+
+def test_main_writes_results_and_checks_the_baseline(tmp_path):
+    output = tmp_path / 'run.json'
+    argv = ['--sizes', '2x3', '--engines', 'transport', '--repeat', '1', '--output', str(output)]
+    assert benchmark.main(argv) == 0
+    results = json.loads(output.read_text())['results']
+    assert len(results) == 1
+    assert benchmark.main(argv + ['--baseline', str(output)]) == 0
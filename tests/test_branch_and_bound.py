@@ -0,0 +1,80 @@
+# tests/test_branch_and_bound.py
+import numpy as np
+import pytest
+from branch_and_bound import BRANCHING_RULES, NODE_SELECTIONS, BoundChange, BranchAndBound, Node
+from helpers import milp_value, random_ip
+from optimizer import Optimizer
+from simplex import INFEASIBLE, OPTIMAL
+
+pytest.importorskip('scipy.optimize')
+
+
+def search(A, b, c, lb, ub, **options):
+    return BranchAndBound(Optimizer().optimizerLP, {'A': A, 'b': b, 'lb': lb, 'ub': ub}, c, **options).solve()
+
+
+@pytest.mark.parametrize('node_selection', NODE_SELECTIONS)
+@pytest.mark.parametrize('branching', BRANCHING_RULES)
+def test_random_ips_match_milp(node_selection, branching):
+    rng = np.random.default_rng(NODE_SELECTIONS.index(node_selection) * 3 + BRANCHING_RULES.index(branching))
+    for _ in range(15):
+        A, b, c, lb, ub = random_ip(rng)
+        result = search(A, b, c, lb, ub, node_selection=node_selection, branching=branching)
+        assert result.status == OPTIMAL
+        assert result.value == pytest.approx(milp_value(A, b, c, lb, ub))
+        assert np.array_equal(result.point, np.round(result.point))
+        assert np.all(A @ result.point <= b + 1e-9)
+        assert result.bound == pytest.approx(result.value)
+
+
+def test_integer_infeasible():
+    # 2x = 1 has an LP solution but no integer one
+    A, b = np.array([[2.0], [-2.0]]), np.array([1.0, -1.0])
+    result = search(A, b, np.array([1.0]), np.zeros(1), np.full(1, 5.0))
+    assert result.status == INFEASIBLE
+    assert result.point is None
+
+
+def test_children_warm_start_from_the_parent_basis():
+    lp = Optimizer().optimizerLP
+    pivots = {'warm': 0, 'cold': 0}
+
+    def counted(name, warm_start):
+        def solve(constraints, cost, basis=None):
+            result = lp(constraints, cost, basis if warm_start else None)
+            pivots[name] += result.iterations
+            return result
+        return solve
+
+    rng = np.random.default_rng(20)
+    for _ in range(15):
+        A, b, c, lb, ub = random_ip(rng, 6, 8)
+        constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+        options = dict(node_selection='depth_first', heuristics=False)
+        warm = BranchAndBound(counted('warm', True), constraints, c, **options).solve()
+        reference = BranchAndBound(counted('cold', False), constraints, c, **options).solve()
+        assert warm.value == pytest.approx(reference.value)
+    assert pivots['warm'] < pivots['cold']
+
+
+def test_node_bounds_apply_the_newest_change_of_each_variable():
+    lb, ub = np.zeros(3), np.full(3, 10.0)
+    constraints = {'A': np.ones((1, 3)), 'b': np.array([20.0]), 'lb': lb, 'ub': ub}
+    search = BranchAndBound(Optimizer().optimizerLP, constraints, np.ones(3))
+    root = BoundChange(0, 0.0, 6.0, None)
+    middle = BoundChange(1, 2.0, 10.0, root)
+    newest = BoundChange(0, 3.0, 6.0, middle)
+    node_lb, node_ub = search._node_bounds(Node(0.0, 3, newest))
+    assert np.array_equal(node_lb, [3.0, 2.0, 0.0])
+    assert np.array_equal(node_ub, [6.0, 10.0, 10.0])
+    with pytest.raises(ValueError):
+        search.base_lb[0] = 1.0  # shared by every node
+
+
+def test_branching_leaves_the_model_unchanged():
+    rng = np.random.default_rng(21)
+    A, b, c, lb, ub = random_ip(rng, 5, 6)
+    constraints = {'A': A.copy(), 'b': b.copy(), 'lb': lb.copy(), 'ub': ub.copy()}
+    BranchAndBound(Optimizer().optimizerLP, constraints, c).solve()
+    assert np.array_equal(constraints['A'], A) and np.array_equal(constraints['b'], b)
+    assert np.array_equal(constraints['lb'], lb) and np.array_equal(constraints['ub'], ub)
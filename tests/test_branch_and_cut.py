@@ -0,0 +1,43 @@
+# tests/test_branch_and_cut.py
+import itertools
+import numpy as np
+import pytest
+from branch_and_cut import BranchAndCut
+from helpers import milp_value, random_ip
+from optimizer import Optimizer
+from simplex import OPTIMAL
+
+pytest.importorskip('scipy.optimize')
+
+
+@pytest.mark.parametrize('cut_depth', [0, 2])
+def test_branch_and_cut_matches_milp(cut_depth):
+    rng = np.random.default_rng(50 + cut_depth)
+    for _ in range(15):
+        A, b, c, lb, ub = random_ip(rng)
+        constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+        search = BranchAndCut(Optimizer().optimizerLP, constraints, c, cut_depth=cut_depth)
+        result = search.solve()
+        assert result.status == OPTIMAL
+        assert result.value == pytest.approx(milp_value(A, b, c, lb, ub))
+        assert np.all(A @ result.point <= b + 1e-9)
+        summary = result.cuts
+        if summary['root_cut_bound'] is not None:
+            assert summary['root_cut_bound'] >= summary['root_lp_bound'] - 1e-6
+
+
+def test_cuts_keep_every_integer_point():
+    rng = np.random.default_rng(52)
+    checked = 0
+    for _ in range(20):
+        A, b, c, lb, ub = random_ip(rng, 3, 3)
+        search = BranchAndCut(Optimizer().optimizerLP, {'A': A, 'b': b, 'lb': lb, 'ub': ub}, c)
+        search.cut_root()
+        if not len(search.pool):
+            continue
+        points = np.array(list(itertools.product(*[range(int(high) + 1) for high in ub])), dtype=float)
+        feasible = points[np.all(points @ A.T <= b + 1e-9, axis=1)]
+        coefficients, rhs = search.pool.rows()
+        assert np.all(feasible @ coefficients.T <= rhs + 1e-6)
+        checked += 1
+    assert checked > 0
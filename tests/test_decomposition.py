@@ -0,0 +1,95 @@
+# tests/test_decomposition.py
+import numpy as np
+import pytest
+import decomposition
+from data.sample_data import HajjData
+from decomposition import MASTER_FAILED, LagrangianDecomposition, greedy_buses, rolling_horizon
+from helpers import milp_value
+from simplex import ITERATION_LIMIT, LPResult
+
+
+def multiday_problem(example='medium', n_days=5, **options):
+    return HajjData().get_multiday_problem(example, n_days=n_days, stay_days=3, seed=1, **options)
+
+
+def assert_feasible(multiday, flows, buses):
+    bus_capacity = multiday.instance.bus_capacity
+    assert np.all(flows >= 0) and np.array_equal(flows, np.round(flows))
+    assert np.all(flows.sum(axis=2) <= multiday.arrivals + 1e-6)
+    assert np.all(multiday.occupancy(flows) <= multiday.capacity + 1e-6)
+    assert np.all(buses.sum(axis=(1, 2)) <= multiday.fleet + 1e-6)
+    assert np.all(flows <= buses * bus_capacity + 1e-6)
+
+
+def milp_optimum(multiday):
+    A, b, c, lb, ub = multiday.problem_matrices()
+    return milp_value(A.toarray(), b, c, lb, ub) + multiday.constant
+
+
+@pytest.mark.parametrize('example, bus_cost', [('small', 0.0), ('medium', 0.0), ('medium', 50.0)])
+def test_bound_and_plan_bracket_the_milp_optimum(example, bus_cost):
+    pytest.importorskip('scipy.optimize')
+    multiday = multiday_problem(example, bus_cost=bus_cost)
+    result = LagrangianDecomposition(multiday).solve()
+    optimum = milp_optimum(multiday)
+    assert result.bound <= optimum + 1e-6 * abs(optimum)
+    assert optimum <= result.value + 1e-6 * abs(optimum)
+    assert result.value == pytest.approx(multiday.total_cost(result.flows, result.buses))
+    assert result.gap >= 0
+    assert_feasible(multiday, result.flows, result.buses)
+    assert np.array_equal(result.unserved, multiday.arrivals - result.flows.sum(axis=2))
+
+
+def test_tight_fleet_plans_stay_feasible():
+    multiday = multiday_problem(fleet=2)
+    result = LagrangianDecomposition(multiday).solve()
+    assert_feasible(multiday, result.flows, result.buses)
+    assert np.any(result.unserved > 0)
+
+
+def test_rolling_horizon_fits_the_hotels():
+    multiday = multiday_problem()
+    penalties = np.random.default_rng(0).uniform(0, 100, (multiday.n_days, multiday.n_hotels))
+    for plan in (rolling_horizon(multiday), rolling_horizon(multiday, penalties)):
+        assert_feasible(multiday, *plan)
+
+
+def test_greedy_buses_respects_the_fleet():
+    costs = -np.array([[5.0, 1.0], [3.0, 2.0]])
+    flows, buses = greedy_buses(costs, 0.0, np.array([60.0, 30.0]), np.array([70.0, 70.0]), 25, 3)
+    assert buses.sum() == 3
+    assert np.all(flows <= buses * 25)
+    assert flows[0, 0] == 50
+
+
+def test_workers_give_the_same_plan():
+    multiday = multiday_problem('small', n_days=4)
+    serial = LagrangianDecomposition(multiday).solve()
+    parallel = LagrangianDecomposition(multiday, workers=2).solve()
+    assert parallel.value == pytest.approx(serial.value)
+    assert parallel.bound == pytest.approx(serial.bound)
+
+
+def test_unsolved_master_keeps_the_last_multipliers(monkeypatch):
+    class StalledSimplex(decomposition.RevisedSimplex):
+        def solve(self, basis=None):
+            return LPResult(None, None, ITERATION_LIMIT)
+
+    monkeypatch.setattr(decomposition, 'RevisedSimplex', StalledSimplex)
+    multiday = multiday_problem('small', n_days=4)
+    search = LagrangianDecomposition(multiday)
+    result = search.solve()
+    assert result.status == MASTER_FAILED and result.iterations == 1
+    assert np.array_equal(search.multipliers, np.zeros((multiday.n_days, multiday.n_hotels)))
+    assert_feasible(multiday, result.flows, result.buses)
+
+
+def test_plan_without_a_feasible_rolling_horizon(monkeypatch):
+    # A rolling-horizon plan that overfills the hotels is rejected; moving nobody is the fallback
+    multiday = multiday_problem('small', n_days=4)
+    shape = (multiday.n_days, multiday.n_ports, multiday.n_hotels)
+    monkeypatch.setattr(decomposition, 'rolling_horizon',
+                        lambda *args, **kwargs: (np.full(shape, 1e6), np.full(shape, 1e6)))
+    result = LagrangianDecomposition(multiday, max_iterations=1, repair_interval=5).solve()
+    assert_feasible(multiday, result.flows, result.buses)
+    assert result.value <= multiday.total_cost(np.zeros(shape), np.zeros(shape))
@@ -0,0 +1,49 @@
+# tests/test_generator.py
+import numpy as np
+import pytest
+from data.generator import generate_arrays, generate_arrivals, generate_instance
+from data.sample_data import HajjData
+from simplex import OPTIMAL, solve_lp
+
+
+def test_same_seed_same_instance():
+    first = generate_arrays(8, 15, seed=3)
+    again = generate_arrays(8, 15, seed=3)
+    other = generate_arrays(8, 15, seed=4)
+    for a, b in zip(first[:3], again[:3]):
+        assert np.array_equal(a, b)
+    assert not np.array_equal(first[2], other[2])
+
+
+def test_instance_shapes_and_load():
+    supply, capacity, costs, ports, hotels, locations = generate_arrays(12, 30, seed=1, load=0.8)
+    assert costs.shape == (12, 30) and len(ports) == 12 and len(hotels) == 30
+    assert locations['ports'].shape == (12, 2) and locations['hotels'].shape == (30, 2)
+    assert np.all(supply >= 0) and np.all(costs >= 10)
+    assert supply.sum() <= 0.8 * capacity.sum()
+    assert np.array_equal(supply, np.floor(supply)) and np.array_equal(costs, np.round(costs))
+
+
+def test_busy_ports_beyond_the_buses_still_solve():
+    # Few hotels: the busiest ports have more pilgrims than their buses can carry
+    instance = generate_instance(6, 3, seed=5, bus_capacity=20)
+    assert max(instance['ports'].values()) > 20 * 3
+    A, b, c, lb, ub = HajjData().get_problem_matrices(instance, bounds=True)
+    result = solve_lp({'A': A, 'b': b, 'lb': lb, 'ub': ub}, c)
+    assert result.status == OPTIMAL
+    assert result.point.sum() == pytest.approx(-b[-1])
+
+
+def test_dictionary_and_array_formats_agree():
+    data = HajjData()
+    as_dict = data.get_problem_matrices(generate_instance(4, 7, seed=2))
+    as_arrays = data.get_problem_matrices(generate_instance(4, 7, seed=2, as_arrays=True))
+    for a, b in zip(as_dict, as_arrays):
+        assert np.array_equal(a, b)
+
+
+def test_arrivals_are_whole_and_peak_late():
+    arrivals = generate_arrivals(np.array([100.0, 250.0]), n_days=12, stay_days=4, seed=0)
+    assert arrivals.shape == (12, 2)
+    assert np.array_equal(arrivals, np.round(arrivals))
+    assert np.argmax(arrivals.sum(axis=1)) > 12 // 3
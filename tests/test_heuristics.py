@@ -0,0 +1,75 @@
+# tests/test_heuristics.py
+import numpy as np
+import pytest
+from branch_and_bound import BranchAndBound
+from data.generator import generate_arrays
+from data.sample_data import HajjData
+from heuristics import greedy_allocation, initial_allocation, repair_solution, vogel_allocation
+from helpers import random_ip
+from simplex import solve_lp
+from transport import TransportationSolver
+
+HEURISTICS = [greedy_allocation, vogel_allocation, initial_allocation]
+
+
+def assert_feasible_allocation(flows, supply, capacity, arc_capacity):
+    assert np.array_equal(flows, np.round(flows)) and np.all(flows >= 0)
+    assert np.all(flows.sum(axis=1) <= supply + 1e-9)
+    assert np.all(flows.sum(axis=0) <= capacity + 1e-9)
+    assert np.all(flows <= arc_capacity + 1e-9)
+
+
+@pytest.mark.parametrize('heuristic', HEURISTICS)
+def test_allocations_are_feasible_and_move_everyone(heuristic):
+    for seed in range(8):
+        supply, capacity, costs, *_ = generate_arrays(6, 12, seed=seed)
+        flows = heuristic(supply, capacity, costs, 50.0)
+        assert_feasible_allocation(flows, supply, capacity, 50.0)
+        optimum = TransportationSolver(supply, capacity, costs, 50.0).solve()
+        # Augmenting paths move every pilgrim that the optimum moves
+        assert flows.sum() == pytest.approx(optimum.point.sum())
+        assert float((costs * flows).sum()) >= optimum.value - 1e-6
+
+
+def test_initial_allocation_is_the_better_candidate():
+    supply, capacity, costs, *_ = generate_arrays(8, 15, seed=3)
+    best = initial_allocation(supply, capacity, costs, 50.0)
+    for flows in (greedy_allocation(supply, capacity, costs, 50.0),
+                  vogel_allocation(supply, capacity, costs, 50.0)):
+        assert (costs * best).sum() <= (costs * flows).sum() + 1e-9
+
+
+def test_seed_is_feasible_for_the_ip_model():
+    data = HajjData()
+    for example in ['small', 'medium', 'large']:
+        A, b, c, lb, ub = data.get_problem_matrices(example, sparse=True, bounds=True)
+        seed = initial_allocation(*data.get_transport_problem(example)).ravel()
+        assert np.all(A @ seed <= b + 1e-9)
+        assert np.all(seed >= lb) and np.all(seed <= ub)
+
+
+def test_repair_returns_feasible_integer_points():
+    rng = np.random.default_rng(90)
+    repaired = 0
+    for _ in range(40):
+        A, b, c, lb, ub = random_ip(rng)
+        point = rng.uniform(lb, ub)
+        x = repair_solution(A, b, lb, ub, c, point)
+        if x is None:
+            continue
+        repaired += 1
+        assert np.array_equal(x, np.round(x))
+        assert np.all(A @ x <= b + 1e-9)
+        assert np.all(x >= lb) and np.all(x <= ub)
+    assert repaired > 0
+
+
+def test_seeded_search_reaches_the_same_optimum():
+    data = HajjData()
+    A, b, c, lb, ub = data.get_problem_matrices('large', sparse=True, bounds=True)
+    constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+    seed = initial_allocation(*data.get_transport_problem('large')).ravel()
+    seeded = BranchAndBound(solve_lp, constraints, c, initial_solution=seed).solve()
+    plain = BranchAndBound(solve_lp, constraints, c, heuristics=False).solve()
+    assert seeded.value == pytest.approx(plain.value)
+    assert seeded.stats.heuristic_solutions >= 1
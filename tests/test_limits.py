@@ -0,0 +1,58 @@
+# tests/test_limits.py
+import numpy as np
+import pytest
+from branch_and_bound import GAP_LIMIT, NODE_LIMIT, TIME_LIMIT, BranchAndBound
+from helpers import milp_value, random_ip
+from simplex import OPTIMAL, solve_lp
+
+pytest.importorskip('scipy.optimize')
+
+
+def hard_ip(seed):
+    return random_ip(np.random.default_rng(seed), 15, 40)
+
+
+def search(A, b, c, lb, ub, **options):
+    return BranchAndBound(solve_lp, {'A': A, 'b': b, 'lb': lb, 'ub': ub}, c, **options).solve()
+
+
+def assert_brackets_optimum(result, optimum):
+    assert result.bound <= optimum + 1e-6
+    if result.point is not None:
+        assert result.value >= optimum - 1e-6
+        assert result.gap == pytest.approx((result.value - result.bound) / max(1.0, abs(result.value)))
+
+
+def test_node_limit():
+    A, b, c, lb, ub = hard_ip(101)
+    result = search(A, b, c, lb, ub, node_limit=20)
+    assert result.status == NODE_LIMIT
+    assert result.nodes == 20
+    assert_brackets_optimum(result, milp_value(A, b, c, lb, ub))
+
+
+def test_time_limit():
+    A, b, c, lb, ub = hard_ip(101)
+    result = search(A, b, c, lb, ub, time_limit=0.05)
+    assert result.status in (TIME_LIMIT, OPTIMAL)
+    assert result.stats.total_time < 1.0
+    assert_brackets_optimum(result, milp_value(A, b, c, lb, ub))
+
+
+@pytest.mark.parametrize('rel_gap', [0.01, 0.05])
+def test_relative_gap(rel_gap):
+    for seed in [100, 102, 103]:
+        A, b, c, lb, ub = hard_ip(seed)
+        optimum = milp_value(A, b, c, lb, ub)
+        result = search(A, b, c, lb, ub, rel_gap=rel_gap)
+        assert result.status in (GAP_LIMIT, OPTIMAL)
+        assert_brackets_optimum(result, optimum)
+        # Integral costs: nodes that cannot gain a whole unit are pruned anyway
+        assert result.value - optimum <= max(1.0, rel_gap * abs(result.value)) + 1e-6
+
+
+def test_absolute_gap():
+    A, b, c, lb, ub = hard_ip(101)
+    result = search(A, b, c, lb, ub, abs_gap=5.0)
+    assert result.status in (GAP_LIMIT, OPTIMAL)
+    assert result.value - milp_value(A, b, c, lb, ub) <= 5.0 + 1e-6
@@ -0,0 +1,59 @@
+# tests/test_parallel_bb.py
+import numpy as np
+import pytest
+from branch_and_bound import BranchAndBound
+from helpers import milp_value, random_ip
+from parallel_bb import ParallelBranchAndBound
+from optimizer import Optimizer
+from simplex import OPTIMAL
+
+pytest.importorskip('scipy.optimize')
+
+
+@pytest.mark.parametrize('deterministic', [False, True])
+def test_parallel_matches_milp(deterministic):
+    rng = np.random.default_rng(30 + deterministic)
+    for _ in range(4):
+        A, b, c, lb, ub = random_ip(rng, 8, 12)
+        constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+        result = ParallelBranchAndBound(Optimizer().optimizerLP, constraints, c, workers=2,
+                                        deterministic=deterministic).solve()
+        assert result.status == OPTIMAL
+        assert result.value == pytest.approx(milp_value(A, b, c, lb, ub))
+        assert np.all(A @ result.point <= b + 1e-9)
+
+
+def test_deterministic_runs_repeat_and_stay_near_the_serial_tree():
+    A, b, c, lb, ub = random_ip(np.random.default_rng(101), 15, 40)
+    constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+    lp = Optimizer().optimizerLP
+    serial = BranchAndBound(lp, constraints, c).solve()
+    runs = [ParallelBranchAndBound(lp, constraints, c, workers=3, deterministic=True).solve()
+            for _ in range(2)]
+    assert runs[0].nodes == runs[1].nodes
+    assert np.array_equal(runs[0].point, runs[1].point)
+    assert runs[0].value == pytest.approx(serial.value)
+    assert runs[0].nodes <= 1.5 * serial.nodes
+
+
+class RecordingPool:
+    """Stands in for the process pool and keeps the arguments of every task"""
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, function, *args):
+        self.tasks.append(args)
+        return len(self.tasks)
+
+
+def test_deterministic_tasks_get_no_time_limit():
+    A, b, c, lb, ub = random_ip(np.random.default_rng(102), 8, 12)
+    constraints = {'A': A, 'b': b, 'lb': lb, 'ub': ub}
+    task_limits = []
+    for deterministic in (False, True):
+        search = ParallelBranchAndBound(Optimizer().optimizerLP, constraints, c, workers=2,
+                                        deterministic=deterministic, time_limit=60)
+        pool = RecordingPool()
+        search._submit(pool, (-np.inf, 0, (), None, None))
+        task_limits.append(pool.tasks[0][3])
+    assert 0 < task_limits[0] <= 60 and task_limits[1] is None
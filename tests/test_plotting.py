@@ -0,0 +1,74 @@
+# tests/test_plotting.py
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from data.generator import generate_instance  # noqa: E402
+from data.sample_data import HajjData  # noqa: E402
+from plotting import (MAX_LABELS, capacity_figure, feasible_mask, flow_figure,  # noqa: E402
+                      plot_2d_problem, render_in_background, render_report)
+from reporting import SolutionReport  # noqa: E402
+
+PNG = b'\x89PNG'
+
+
+def greedy_report(instance, title='test'):
+    # Spread each port's supply evenly over the hotels, at most 5 pilgrims per pair
+    point = np.minimum(np.broadcast_to(instance.supply[:, None] // len(instance.hotels), instance.costs.shape), 5)
+    return SolutionReport.from_instance(title, point.ravel(), float((point * instance.costs).sum()), instance)
+
+
+def test_feasible_mask():
+    A, b = np.array([[1.0, 1.0], [-1.0, 0.0]]), np.array([4.0, 0.0])
+    x = y = np.arange(6.0)
+    mask = feasible_mask(A, b, x, y)
+    assert np.array_equal(mask, (x[None, :] + y[:, None] <= 4) & (x[None, :] >= 0))
+
+
+def test_render_report_writes_pngs(tmp_path):
+    report = greedy_report(HajjData().as_arrays('small'), 'small')
+    paths = render_report(report, 'small', str(tmp_path))
+    assert [p.rsplit('/', 1)[1] for p in paths] == ['flow_diagram_small.png', 'capacity_utilization_small.png']
+    for path in paths:
+        with open(path, 'rb') as f:
+            assert f.read(4) == PNG
+
+
+def test_flow_figure_draws_one_segment_per_flow():
+    report = greedy_report(HajjData().as_arrays('medium'))
+    ax = flow_figure(report, 'medium').axes[0]
+    segments = ax.collections[0].get_segments()
+    assert len(segments) == len(report.flows()[0])
+    assert len(ax.texts) == len(report.ports) + len(report.hotels)
+
+
+def test_large_instances_skip_labels():
+    instance = generate_instance(MAX_LABELS + 1, 4, seed=1, as_arrays=True)
+    ax = flow_figure(greedy_report(instance), 'big').axes[0]
+    assert len(ax.texts) == 4
+
+
+def test_zero_supply_and_unsolved_reports_render():
+    instance = HajjData().as_arrays('small')
+    # Flows drawn against a supply of zero, e.g. a report of an infeasible scenario
+    zero = SolutionReport('zero', np.ones(instance.costs.size), 0.0, instance.ports, instance.hotels,
+                          np.zeros(len(instance.ports)), instance.capacity, instance.costs)
+    for report in (zero, SolutionReport.from_instance('none', None, None, instance)):
+        figure = flow_figure(report, report.title)
+        assert np.all(np.isfinite(figure.axes[0].collections[0].get_linewidths()))
+        figure.canvas.draw()
+        capacity_figure(report, report.title).canvas.draw()
+
+
+@pytest.mark.parametrize('process', [False, True])
+def test_background_render(tmp_path, process):
+    report = greedy_report(HajjData().as_arrays('small'))
+    paths = render_in_background(report, 'background', str(tmp_path), process=process).result(timeout=60)
+    assert all((tmp_path / path.rsplit('/', 1)[1]).exists() for path in paths)
+
+
+def test_plot_2d_problem_to_file(tmp_path):
+    path = tmp_path / 'region.png'
+    plot_2d_problem(np.array([[1.0, 2.0], [3.0, 0.0]]), np.array([80.0, 90.0]), (20.0, 30.0), str(path))
+    assert path.read_bytes()[:4] == PNG
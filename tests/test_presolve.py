@@ -0,0 +1,82 @@
+# tests/test_presolve.py
+import numpy as np
+import pytest
+from branch_and_bound import BranchAndBound
+from helpers import linprog_bounds, linprog_status, milp_value, random_ip, random_lp
+from presolve import presolve
+from optimizer import Optimizer
+from simplex import INFEASIBLE, OPTIMAL, RevisedSimplex
+from sparse import CSRMatrix
+
+linprog = pytest.importorskip('scipy.optimize').linprog
+
+
+def presolved_lp(A, b, c, lb, ub):
+    """Presolve as a continuous model, solve the reduced LP and map it back"""
+    reduced = presolve({'A': A, 'b': b, 'lb': lb, 'ub': ub}, c, integer=False)
+    if reduced.status == INFEASIBLE:
+        return INFEASIBLE, None, None
+    result = Optimizer().optimizerLP(reduced.constraints, reduced.cost)
+    return (result.status,) + reduced.postsolve(result)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_lp_round_trip_matches_direct_solve(seed):
+    # random_lp mixes bounded, one-sided, lower-unbounded and free columns
+    rng = np.random.default_rng(40 + seed)
+    for _ in range(75):
+        A, b, c, lb, ub = random_lp(rng)
+        direct = RevisedSimplex(A, b, c, lb, ub).solve()
+        status, point, value = presolved_lp(A, b, c, lb, ub)
+        if direct.status == OPTIMAL:
+            assert status == OPTIMAL
+            assert value == pytest.approx(direct.value, abs=1e-6)
+            assert np.all(np.isfinite(point))
+            assert np.all(A @ point <= b + 1e-6)
+            assert np.all(point >= lb - 1e-6) and np.all(point <= ub + 1e-6)
+        else:
+            assert status != OPTIMAL
+
+
+@pytest.mark.parametrize('lb', [[-np.inf, -np.inf], [-np.inf, 0.0]])
+def test_columns_without_lower_bounds_are_not_fixed(lb):
+    A, b, c = np.array([[1.0, 1.0], [-1.0, 1.0]]), np.array([2.0, 2.0]), np.array([0.0, -1.0])
+    lb, ub = np.array(lb), np.full(2, np.inf)
+    reduced = presolve({'A': A, 'b': b, 'lb': lb, 'ub': ub}, c, integer=False)
+    assert reduced.stats['variables_fixed'] == 0
+    status, point, value = presolved_lp(A, b, c, lb, ub)
+    reference = linprog(c, A_ub=A, b_ub=b, bounds=linprog_bounds(lb, ub), method='highs')
+    assert status == linprog_status(reference) == OPTIMAL
+    assert value == pytest.approx(reference.fun)
+    assert np.all(np.isfinite(point))
+
+
+def test_free_columns_without_bounds_given():
+    A, b, c = np.array([[1.0, 1.0], [-1.0, 1.0]]), np.array([2.0, 2.0]), np.array([0.0, -1.0])
+    reduced = presolve({'A': CSRMatrix.from_dense(A), 'b': b}, c, integer=False)
+    point, value = reduced.postsolve(Optimizer().optimizerLP(reduced.constraints, reduced.cost))
+    assert value == pytest.approx(-2.0)
+    assert np.allclose(point, [0.0, 2.0])
+
+
+def test_ip_round_trip_matches_milp():
+    rng = np.random.default_rng(43)
+    for _ in range(30):
+        A, b, c, lb, ub = random_ip(rng)
+        reduced = presolve({'A': A, 'b': b, 'lb': lb, 'ub': ub}, c)
+        reference = milp_value(A, b, c, lb, ub)
+        if reduced.status == INFEASIBLE:
+            assert reference is None
+            continue
+        result = BranchAndBound(Optimizer().optimizerLP, reduced.constraints, reduced.cost).solve()
+        point, value = reduced.postsolve(result)
+        assert value == pytest.approx(reference)
+        assert c @ point == pytest.approx(value)
+        assert np.all(A @ point <= b + 1e-9)
+
+
+def test_infeasible_bounds_are_reported():
+    # x0 + x1 <= 3 with both variables at least 2
+    constraints = {'A': np.array([[1.0, 1.0]]), 'b': np.array([3.0]),
+                   'lb': np.full(2, 2.0), 'ub': np.full(2, 10.0)}
+    assert presolve(constraints, np.ones(2)).status == INFEASIBLE
@@ -0,0 +1,89 @@
+# tests/test_reporting.py
+import csv
+import json
+import numpy as np
+import pytest
+from data.generator import generate_instance
+from data.sample_data import HajjData
+from main import HajjOptimizationSystem
+from reporting import SolutionReport, format_cost
+
+
+def solved_report(example='small', execution_time=1.5):
+    system = HajjOptimizationSystem()
+    point, value, _, result = system.solve(example)
+    return SolutionReport.from_instance(example, point, value, HajjData().as_arrays(example),
+                                        execution_time, result.stats)
+
+
+def test_totals_follow_the_allocation():
+    report = solved_report()
+    instance = HajjData().as_arrays('small')
+    assert report.allocation.shape == instance.costs.shape
+    assert report.pair_costs.sum() == pytest.approx(report.value)
+    assert np.array_equal(report.port_used, report.allocation.sum(axis=1))
+    assert np.array_equal(report.hotel_used, report.allocation.sum(axis=0))
+    assert np.all(report.port_used <= instance.supply) and np.all(report.hotel_used <= instance.capacity)
+    assert report.total_pilgrims == report.allocation.sum()
+
+
+def test_text_report(tmp_path):
+    report = solved_report()
+    text = report.text()
+    assert 'HAJJ OPTIMIZATION REPORT - SMALL EXAMPLE' in text
+    assert f"Total Cost: {format_cost(report.value)}" in text
+    assert 'Execution Time: 1.50 seconds' in text
+    assert 'SOLVER STATISTICS:' in text
+    rows, _ = report.flows()
+    port_lines = sum(line.startswith(tuple(report.ports)) for line in text.splitlines())
+    assert port_lines == len(rows) + len(report.ports)
+    report.write_text(tmp_path / 'report.txt')
+    assert (tmp_path / 'report.txt').read_text() == text
+
+
+def test_unsolved_report():
+    instance = HajjData().as_arrays('small')
+    report = SolutionReport.from_instance('small', None, None, instance)
+    assert not report.solved and report.total_pilgrims == 0
+    assert report.text().endswith('No solution found')
+    assert report.to_dict()['flows'] == []
+
+
+def test_json_and_csv_agree_with_the_arrays(tmp_path):
+    report = solved_report()
+    json_path, csv_path = report.write(str(tmp_path / 'report'), ('json', 'csv'))
+    with open(json_path) as f:
+        data = json.load(f)
+    assert data['total_cost'] == pytest.approx(report.value)
+    assert data['total_pilgrims'] == report.total_pilgrims
+    assert [port['used'] for port in data['ports']] == report.port_used.tolist()
+    assert [hotel['capacity'] for hotel in data['hotels']] == report.capacity.tolist()
+    assert data['stats'] == json.loads(json.dumps(report.stats.as_dict()))
+
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(data['flows'])
+    for row, flow in zip(rows, data['flows']):
+        assert (row['port'], row['hotel']) == (flow['port'], flow['hotel'])
+        assert float(row['pilgrims']) == flow['pilgrims']
+        assert float(row['total_cost']) == pytest.approx(flow['total_cost'])
+    assert sum(float(row['total_cost']) for row in rows) == pytest.approx(report.value)
+
+
+def test_parquet_matches_csv(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    instance = generate_instance(5, 8, seed=3, as_arrays=True)
+    rng = np.random.default_rng(0)
+    point = rng.integers(0, 3, instance.costs.size)
+    report = SolutionReport.from_instance('generated', point, float(point @ instance.costs.ravel()), instance)
+    parquet_path, csv_path = report.write(str(tmp_path / 'report'), ('parquet', 'csv'))
+    table = pq.read_table(parquet_path).to_pydict()
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert table['port'] == [row['port'] for row in rows]
+    assert table['pilgrims'] == [float(row['pilgrims']) for row in rows]
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match='Unknown report format'):
+        solved_report().write(str(tmp_path / 'report'), ('xml',))
@@ -0,0 +1,44 @@
+# tests/test_sample_data.py
+import numpy as np
+import pytest
+from data.sample_data import HajjData, max_service
+from simplex import OPTIMAL, RevisedSimplex
+
+linprog = pytest.importorskip('scipy.optimize').linprog
+
+
+def max_flow(supply, capacity, bus_capacity):
+    """Max flow of the port/hotel network with scipy's LP"""
+    n_ports, n_hotels = len(supply), len(capacity)
+    A = np.zeros((n_ports + n_hotels, n_ports * n_hotels))
+    for i in range(n_ports):
+        A[i, i * n_hotels:(i + 1) * n_hotels] = 1
+    for j in range(n_hotels):
+        A[n_ports + j, j::n_hotels] = 1
+    high = None if np.isinf(bus_capacity) else bus_capacity
+    result = linprog(-np.ones(A.shape[1]), A_ub=A, b_ub=np.concatenate([supply, capacity]),
+                     bounds=[(0, high)] * A.shape[1], method='highs')
+    return -result.fun
+
+
+def test_max_service_matches_the_max_flow():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n_ports, n_hotels = rng.integers(1, 6, 2)
+        supply = rng.integers(0, 300, n_ports).astype(float)
+        capacity = rng.integers(0, 300, n_hotels).astype(float)
+        bus_capacity = rng.choice([0.0, 10.0, 50.0, np.inf])
+        assert max_service(supply, capacity, bus_capacity) == pytest.approx(
+            max_flow(supply, capacity, bus_capacity))
+
+
+def test_binding_bus_capacity_moves_as_many_as_the_buses_allow():
+    # 200 pilgrims and 400 beds, but the buses carry only 50 per pair
+    example = {'ports': {'p1': 200, 'p2': 30}, 'hotels': {'h1': 200, 'h2': 200}, 'bus_capacity': 50,
+               'costs': {('p1', 'h1'): 10, ('p1', 'h2'): 20, ('p2', 'h1'): 30, ('p2', 'h2'): 40}}
+    A, b, c = HajjData().get_problem_matrices(example)
+    assert b[-1] == -130
+    result = RevisedSimplex(A, b, c, np.zeros(len(c))).solve()
+    assert result.status == OPTIMAL
+    assert result.point.sum() == pytest.approx(130)
+    assert result.value == pytest.approx(50 * 10 + 50 * 20 + 30 * 30)
@@ -0,0 +1,130 @@
+# tests/test_service.py
+import asyncio
+import json
+import numpy as np
+import pytest
+from data.sample_data import HajjData
+from service import SolverService, canonical_order, instance_payload
+
+
+def permuted(payload, port_order, hotel_order, prefix='renamed'):
+    costs = np.asarray(payload['costs'])[np.ix_(port_order, hotel_order)]
+    return {
+        'ports': [f'{prefix} {payload["ports"][i]}' for i in port_order],
+        'hotels': [f'{prefix} {payload["hotels"][j]}' for j in hotel_order],
+        'supply': [payload['supply'][i] for i in port_order],
+        'capacity': [payload['capacity'][j] for j in hotel_order],
+        'costs': costs.tolist(),
+        'bus_capacity': payload['bus_capacity'],
+    }
+
+
+def canonical(payload):
+    return SolverService()._resolve({'instance': payload, 'engine': 'transport'})[0]
+
+
+def test_canonical_order_ignores_row_and_column_order():
+    rng = np.random.default_rng(0)
+    amounts, costs = rng.integers(1, 4, 6).astype(float), rng.integers(0, 5, (6, 4)).astype(float)
+    order = canonical_order(amounts, costs)
+    rows, cols = rng.permutation(6), rng.permutation(4)
+    reordered = canonical_order(amounts[rows], costs[np.ix_(rows, cols)])
+    assert np.array_equal(amounts[order], amounts[rows][reordered])
+    assert np.array_equal(np.sort(costs[order], axis=1), np.sort(costs[np.ix_(rows, cols)][reordered], axis=1))
+
+
+def test_ties_are_broken_by_the_costs_under_the_hotel_order():
+    # Ports 0 and 1 share the supply and the sorted cost row, hotels are all distinguishable
+    payload = {'ports': ['a', 'b', 'c'], 'hotels': ['x', 'y', 'z'], 'supply': [10, 10, 20],
+               'capacity': [30, 40, 50], 'costs': [[1, 2, 3], [3, 2, 1], [5, 5, 5]], 'bus_capacity': 50}
+    key = canonical(payload).key
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        other = canonical(permuted(payload, rng.permutation(3), rng.permutation(3)))
+        assert other.key == key
+        assert np.array_equal(other.instance.costs, canonical(payload).instance.costs)
+
+
+def test_restore_undoes_the_canonical_order():
+    payload = instance_payload(HajjData().get_example('medium'))
+    instance = canonical(payload)
+    allocation = np.arange(instance.instance.costs.size, dtype=float).reshape(instance.instance.costs.shape)
+    restored = instance.restore(allocation)
+    assert np.array_equal(restored[np.ix_(instance.port_order, instance.hotel_order)], allocation)
+    assert np.array_equal(instance.restore(instance.instance.costs), np.asarray(payload['costs']))
+
+
+async def exchange(service, requests, tmp_path):
+    """Serve on a Unix socket, send the requests one at a time and collect the responses"""
+    path = str(tmp_path / 'solver.sock')
+    ready = asyncio.Event()
+    server = asyncio.create_task(service.serve(path=path, ready=ready.set))
+    await ready.wait()
+    reader, writer = await asyncio.open_unix_connection(path)
+    responses = []
+    try:
+        for request in requests:
+            writer.write((request if isinstance(request, str) else json.dumps(request)).encode() + b'\n')
+            await writer.drain()
+            responses.append(json.loads(await asyncio.wait_for(reader.readline(), 60)))
+    finally:
+        writer.close()
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+    return responses
+
+
+def test_cache_hits_for_repeated_and_permuted_instances(tmp_path):
+    payload = instance_payload(HajjData().get_example('medium'))
+    n_ports, n_hotels = len(payload['ports']), len(payload['hotels'])
+    ports, hotels = np.arange(n_ports)[::-1], np.roll(np.arange(n_hotels), 2)
+    requests = [{'instance': 'medium', 'engine': 'transport', 'id': 1},
+                {'instance': 'medium', 'engine': 'transport', 'id': 2},
+                {'instance': permuted(payload, ports, hotels), 'engine': 'transport', 'id': 3},
+                {'instance': 'medium', 'engine': 'ip', 'id': 4},
+                {'op': 'stats'}]
+    first, repeat, renamed, ip, stats = asyncio.run(exchange(SolverService(), requests, tmp_path))
+
+    assert [first['cached'], repeat['cached'], renamed['cached'], ip['cached']] == [False, True, True, False]
+    assert [first['id'], repeat['id'], renamed['id']] == [1, 2, 3]
+    assert first['total_cost'] == repeat['total_cost'] == renamed['total_cost']
+    assert ip['total_cost'] == pytest.approx(first['total_cost'])
+    assert first['flows'] == repeat['flows']
+    # The permuted request's flows use its own names and land on the same pairs
+    names = {f'renamed {name}': name for name in payload['ports'] + payload['hotels']}
+    assert sorted([names[port], names[hotel], amount] for port, hotel, amount in renamed['flows']) == \
+        sorted(first['flows'])
+    assert (stats['cache_hits'], stats['solved'], stats['cache_entries']) == (2, 2, 2)
+
+
+def test_error_responses(tmp_path):
+    shape_mismatch = dict(instance_payload(HajjData().get_example('small')), costs=[[1.0]])
+    requests = ['not json', '[1, 2]',
+                {'instance': 'small', 'engine': 'simplex'},
+                {'instance': 'small', 'engine': 'transport', 'options': {'node_limit': 5}},
+                {'instance': 'small', 'options': {'workers': 4}},
+                {'instance': str(tmp_path / 'missing')},
+                {'instance': shape_mismatch, 'engine': 'transport'},
+                {'instance': {'ports': ['a']}, 'engine': 'transport'}]
+    responses = asyncio.run(exchange(SolverService(), requests, tmp_path))
+    assert all(set(response) == {'error'} for response in responses)
+    assert responses[0]['error'].startswith('Invalid JSON')
+    assert responses[1]['error'] == 'A request must be a JSON object'
+    assert "Unknown engine 'simplex'" in responses[2]['error']
+    assert 'node_limit' in responses[3]['error'] and 'workers' in responses[4]['error']
+    assert 'neither an example name nor an instance directory' in responses[5]['error']
+    assert 'do not match' in responses[6]['error']
+
+
+class FailingBatcher(SolverService):
+    async def _batcher(self):
+        await self._queue.get()
+        raise RuntimeError('batcher crashed')
+
+
+def test_batcher_failure_fails_pending_and_later_requests(tmp_path, caplog):
+    requests = [{'instance': 'small', 'engine': 'transport'}, {'instance': 'medium', 'engine': 'transport'}]
+    first, later = asyncio.run(exchange(FailingBatcher(), requests, tmp_path))
+    assert first == {'error': 'RuntimeError: batcher crashed'}
+    assert later['error'] == 'Solver service failed: RuntimeError: batcher crashed'
+    assert 'Request batcher stopped' in caplog.text
@@ -0,0 +1,88 @@
+# tests/test_session.py
+import numpy as np
+import pytest
+from data.generator import generate_instance
+from session import SolverSession
+from simplex import OPTIMAL
+from transport import TransportationSolver
+
+
+def reference_value(session):
+    """Value of a cold transportation simplex solve of the session's current data"""
+    arc_capacity = np.where(session.closed, 0.0, session.bus_capacity)
+    return TransportationSolver(session.supply, session.capacity, session.costs, arc_capacity).solve().value
+
+
+def test_updates_match_cold_solves():
+    session = SolverSession(generate_instance(6, 10, seed=70))
+    assert session.status == OPTIMAL
+    assert session.value == pytest.approx(reference_value(session))
+    rng = np.random.default_rng(70)
+    ports, hotels = session.ports, session.hotels
+    for _ in range(15):
+        port, hotel = ports[rng.integers(len(ports))], hotels[rng.integers(len(hotels))]
+        kind = rng.integers(4)
+        previous = session.allocation.copy()
+        if kind == 0:
+            changes = session.update(supply={port: float(rng.integers(50, 400))})
+        elif kind == 1:
+            changes = session.update(capacity={hotel: float(rng.integers(80, 300))})
+        elif kind == 2:
+            changes = session.update(costs={(port, hotel): float(rng.integers(10, 300))})
+        else:
+            changes = session.update(close=[(port, hotel)])
+        assert session.status == OPTIMAL
+        assert session.value == pytest.approx(reference_value(session))
+        assert np.all(session.allocation[session.closed] == 0)
+        assert session.unserved == session.supply.sum() - session.allocation.sum()
+        # Exactly the pairs whose allocation changed are reported
+        assert len(changes) == np.count_nonzero(previous != session.allocation)
+        for port, hotel, old, new in changes:
+            i, j = ports.index(port), hotels.index(hotel)
+            assert (old, new) == (previous[i, j], session.allocation[i, j])
+
+
+def test_reopen_restores_the_plan():
+    session = SolverSession('large')
+    first = session.allocation.copy()
+    i, j = np.unravel_index(np.argmax(first), first.shape)
+    pair = (session.ports[i], session.hotels[j])
+    session.update(close=[pair])
+    assert session.allocation[i, j] == 0
+    session.update(reopen=[pair])
+    assert session.value == pytest.approx(float(session.costs.ravel() @ first.ravel()))
+
+
+def test_closing_a_binding_arc_moves_everyone_else():
+    # p1 -> h1 carries 20 of p1's 60 pilgrims; h2 holds only the other 40
+    session = SolverSession('small')
+    assert session.allocation[0, 0] > 0 and session.unserved == 0
+    changes = session.update(close=[('p1', 'h1')])
+    assert session.status == OPTIMAL
+    assert session.allocation[0, 0] == 0
+    assert ('p1', 'h1', 20.0, 0.0) in changes
+    assert session.unserved == 20
+    assert session.value == pytest.approx(reference_value(session))
+
+
+def test_closing_every_arc_of_a_port():
+    session = SolverSession('large')
+    port = session.ports[0]
+    moved = session.allocation.sum()
+    session.update(close=[(port, hotel) for hotel in session.hotels])
+    assert session.status == OPTIMAL
+    assert np.all(session.allocation[0] == 0)
+    assert session.unserved >= session.supply[0]
+    assert session.value == pytest.approx(reference_value(session))
+    session.update(reopen=[(port, hotel) for hotel in session.hotels])
+    assert session.allocation.sum() == moved
+
+
+def test_more_pilgrims_than_the_buses_carry():
+    session = SolverSession('large')
+    # Room for everyone, but more pilgrims at one port than its buses can carry
+    capacity = {hotel: 1e7 for hotel in session.hotels}
+    session.update(supply={session.ports[0]: 1e6}, capacity=capacity)
+    assert session.status == OPTIMAL
+    assert session.allocation[0].sum() == session.bus_capacity[0].sum()
+    assert session.value == pytest.approx(reference_value(session))
@@ -0,0 +1,152 @@
+# tests/test_simplex.py
+import numpy as np
+import pytest
+from helpers import linprog_bounds, linprog_status, random_lp
+from simplex import BASIC, OPTIMAL, RevisedSimplex
+from sparse import CSRMatrix
+
+linprog = pytest.importorskip('scipy.optimize').linprog
+
+
+def reference(A, b, c, lb, ub):
+    return linprog(c, A_ub=A, b_ub=b, bounds=linprog_bounds(lb, ub), method='highs')
+
+
+def assert_matches(result, ref, A, b, lb, ub):
+    assert result.status == linprog_status(ref)
+    if result.status == OPTIMAL:
+        point, value = result
+        assert value == pytest.approx(ref.fun, rel=1e-6, abs=1e-6)
+        assert np.all(A @ point <= b + 1e-6)
+        assert np.all(point >= lb - 1e-6) and np.all(point <= ub + 1e-6)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_lps_match_linprog(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(75):
+        A, b, c, lb, ub = random_lp(rng)
+        assert_matches(RevisedSimplex(A, b, c, lb, ub).solve(), reference(A, b, c, lb, ub), A, b, lb, ub)
+
+
+def test_sparse_matrix_matches_dense():
+    rng = np.random.default_rng(10)
+    for _ in range(50):
+        A, b, c, lb, ub = random_lp(rng)
+        A[rng.random(A.shape) < 0.5] = 0
+        dense = RevisedSimplex(A, b, c, lb, ub).solve()
+        sparse = RevisedSimplex(CSRMatrix.from_dense(A), b, c, lb, ub).solve()
+        assert sparse.status == dense.status
+        if dense.status == OPTIMAL:
+            assert sparse.value == pytest.approx(dense.value, abs=1e-6)
+
+
+def test_warm_start_after_bound_changes():
+    rng = np.random.default_rng(11)
+    for _ in range(100):
+        A, b, c, lb, ub = random_lp(rng)
+        first = RevisedSimplex(A, b, c, lb, ub).solve()
+        if first.status != OPTIMAL:
+            continue
+        # Branch-like change: tighten one variable to either side of its value
+        j = int(rng.integers(len(c)))
+        lb, ub = lb.copy(), ub.copy()
+        if rng.random() < 0.5:
+            ub[j] = np.floor(first.point[j] - 0.5)
+        else:
+            lb[j] = np.ceil(first.point[j] + 0.5)
+        warm = RevisedSimplex(A, b, c, lb, ub).solve(first.basis)
+        if np.all(lb <= ub):
+            assert_matches(warm, reference(A, b, c, lb, ub), A, b, lb, ub)
+
+
+def test_modify_runs_dual_then_primal_simplex():
+    rng = np.random.default_rng(12)
+    for _ in range(100):
+        A, b, c, lb, ub = random_lp(rng)
+        engine = RevisedSimplex(A, b, c, lb, ub)
+        if engine.solve().status != OPTIMAL:
+            continue
+        b2 = b + rng.integers(-4, 3, len(b))
+        assert_matches(engine.modify(b=b2), reference(A, b2, c, lb, ub), A, b2, lb, ub)
+        c2 = c + rng.integers(-2, 3, len(c))
+        assert_matches(engine.modify(c=c2), reference(A, b2, c2, lb, ub), A, b2, lb, ub)
+
+
+def test_modify_adds_and_drops_rows():
+    rng = np.random.default_rng(14)
+    cold_solves = []
+    for _ in range(100):
+        A, b, c, lb, ub = random_lp(rng)
+        engine = RevisedSimplex(A, b, c, lb, ub)
+        first = engine.solve()
+        if first.status != OPTIMAL:
+            continue
+        cold_solve = engine.solve
+        engine.solve = lambda: cold_solves.append(1) or cold_solve()
+        # A row cutting off the current point, like a cut round
+        row = rng.integers(-3, 4, len(c)).astype(float)
+        rhs = float(row @ first.point) - 1.0
+        A2, b2 = np.vstack([A, row]), np.append(b, rhs)
+        second = engine.modify(b=b2, A=A2)
+        assert_matches(second, reference(A2, b2, c, lb, ub), A2, b2, lb, ub)
+        # Drop the first row again when its slack is basic
+        if second.status == OPTIMAL and len(b) > 1 and engine.status[len(c)] == BASIC:
+            A3, b3 = A2[1:], b2[1:]
+            third = engine.modify(b=b3, A=A3, kept_rows=np.arange(1, len(b2)))
+            assert_matches(third, reference(A3, b3, c, lb, ub), A3, b3, lb, ub)
+    assert not cold_solves
+
+
+def master_lp(rng, days=7, hotels=6, stay=3, rounds=13):
+    """
+    LP shaped like the multi-day master: day plans that fill the hotels over
+    their stay, one convexity row per day and costs in the millions
+    """
+    capacity = rng.choice([120.0, 150.0, 180.0, 200.0], hotels)
+    margin = rng.integers(800, 1200, hotels) * 10.0 - 90000.0
+    columns, costs = [], []
+    for _ in range(rounds):
+        plan = np.floor(capacity / stay * rng.choice([0.5, 1.0, 1.5], (days, hotels)))
+        for day in range(days):
+            column = np.zeros(days * hotels + days)
+            for offset in range(min(stay, days - day)):
+                column[(day + offset) * hotels:(day + offset + 1) * hotels] = plan[day]
+            column[days * hotels + day] = 1
+            columns.append(column)
+            costs.append(plan[day] @ margin)
+    return np.array(columns).T, np.concatenate([np.tile(capacity, days), np.ones(days)]), np.array(costs)
+
+
+def test_badly_scaled_costs():
+    # Reduced costs of about 1e6 carry rounding noise far above an absolute
+    # 1e-9 tolerance: the simplex kept pivoting on it until the iteration limit
+    rng = np.random.default_rng(13)
+    for _ in range(20):
+        A, b, c = master_lp(rng)
+        lb, ub = np.zeros(len(c)), np.full(len(c), np.inf)
+        assert_matches(RevisedSimplex(A, b, c, lb, ub).solve(), reference(A, b, c, lb, ub), A, b, lb, ub)
+
+
+def test_phase1_falls_back_when_the_costs_are_unbounded():
+    # Phase 1 carries a share of the costs, along which x is unbounded before y >= 1 holds
+    A, b, c = np.array([[0.0, -1.0]]), np.array([-1.0]), np.array([-1.0, 0.0])
+    lb, ub = np.zeros(2), np.full(2, np.inf)
+    assert_matches(RevisedSimplex(A, b, c, lb, ub).solve(), reference(A, b, c, lb, ub), A, b, lb, ub)
+
+
+def test_generated_transport_lp():
+    from data.generator import generate_instance
+    from data.sample_data import HajjData
+    A, b, c, lb, ub = HajjData().get_problem_matrices(generate_instance(20, 60, seed=3), sparse=True, bounds=True)
+    result = RevisedSimplex(A, b, c, lb, ub).solve()
+    assert_matches(result, reference(A.toarray(), b, c, lb, ub), A.toarray(), b, lb, ub)
+    assert result.iterations < 10 * A.shape[0]
+
+
+def test_model_without_rows():
+    # Presolve can remove every row, leaving only the bounds
+    A, b, c = np.zeros((0, 3)), np.zeros(0), np.array([1.0, -2.0, 0.0])
+    lb, ub = np.array([1.0, 0.0, -1.0]), np.array([4.0, 3.0, 2.0])
+    point, value = RevisedSimplex(A, b, c, lb, ub).solve()
+    assert np.array_equal(point, [1.0, 3.0, -1.0]) and value == -5.0
@@ -0,0 +1,84 @@
+# tests/test_solve.py
+import json
+import os
+import subprocess
+import sys
+import pytest
+from branch_and_bound import NODE_LIMIT
+from data.array_instance import save_instance
+from data.generator import generate_instance
+from data.sample_data import HajjData
+from main import HajjOptimizationSystem
+from simplex import OPTIMAL
+from solve import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_record(prefix):
+    with open(f'{prefix}.solution.json') as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize('engine', ['ip', 'transport'])
+def test_solution_file(tmp_path, capsys, engine):
+    prefix = str(tmp_path / 'small')
+    assert main(['small', '--engine', engine, '--output', prefix]) == 0
+    record = read_record(prefix)
+    _, value, _, _ = HajjOptimizationSystem().solve('small', engine)
+    assert record['status'] == OPTIMAL and record['engine'] == engine
+    assert record['total_cost'] == pytest.approx(value)
+    ports, hotels = HajjData().get_names('small')
+    assert (record['n_ports'], record['n_hotels']) == (len(ports), len(hotels))
+    assert {port for port, _, _ in record['flows']} <= set(ports)
+    assert sum(amount for _, _, amount in record['flows']) > 0
+    assert os.listdir(tmp_path) == ['small.solution.json']
+    assert 'small: optimal' in capsys.readouterr().out
+
+
+def test_instance_directory(tmp_path):
+    instance = generate_instance(4, 6, seed=9)
+    save_instance(instance, tmp_path / 'generated')
+    prefix = str(tmp_path / 'out' / 'generated')
+    assert main([str(tmp_path / 'generated'), '--output', prefix]) == 0
+    record = read_record(prefix)
+    assert record['instance'] == 'generated'
+    assert record['total_cost'] == pytest.approx(HajjOptimizationSystem().solve(instance)[1])
+
+
+def test_reports_and_plots_on_request(tmp_path):
+    pytest.importorskip('matplotlib')
+    prefix = str(tmp_path / 'run')
+    assert main(['medium', '--output', prefix, '--report', 'txt', 'json', 'csv', '--plot']) == 0
+    assert sorted(os.listdir(tmp_path)) == ['capacity_utilization_run.png', 'flow_diagram_run.png',
+                                            'run.csv', 'run.json', 'run.solution.json', 'run.txt']
+    with open(f'{prefix}.json') as f:
+        assert json.load(f)['total_cost'] == pytest.approx(read_record(prefix)['total_cost'])
+
+
+def test_reporting_and_plotting_are_not_imported_for_a_plain_solve(tmp_path):
+    code = ("import sys; from solve import main; main(['small', '--output', sys.argv[1]]); "
+            "print(sorted({'reporting', 'plotting', 'matplotlib'} & set(sys.modules)))")
+    output = subprocess.run([sys.executable, '-c', code, str(tmp_path / 'small')], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.splitlines()[-1] == '[]'
+
+
+def test_scipy_is_not_imported_with_the_cli():
+    code = "import sys, solve; print('scipy' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.splitlines()[-1] == 'False'
+
+
+def test_limits_are_passed_to_the_solver(tmp_path):
+    prefix = str(tmp_path / 'large')
+    main(['large', '--output', prefix, '--node-limit', '1'])
+    assert read_record(prefix)['status'] in (OPTIMAL, NODE_LIMIT)
+
+
+def test_unknown_instance(tmp_path, capsys):
+    with pytest.raises(SystemExit) as error:
+        main([str(tmp_path / 'missing')])
+    assert error.value.code == 2
+    assert 'neither an example name nor an instance directory' in capsys.readouterr().err
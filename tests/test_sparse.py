@@ -0,0 +1,61 @@
+# tests/test_sparse.py
+import numpy as np
+import pytest
+from data.generator import generate_instance
+from data.sample_data import HajjData
+from simplex import OPTIMAL, RevisedSimplex
+from sparse import CSRMatrix, vstack
+
+
+def random_sparse(rng, shape, density=0.3):
+    dense = rng.integers(-5, 6, shape).astype(float)
+    dense[rng.random(shape) > density] = 0
+    return dense
+
+
+def test_csr_operations_match_dense():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        dense = random_sparse(rng, (int(rng.integers(1, 12)), int(rng.integers(1, 12))))
+        matrix = CSRMatrix.from_dense(dense)
+        x = rng.normal(size=dense.shape[1])
+        assert np.allclose(matrix @ x, dense @ x)
+        assert np.array_equal(matrix.T.toarray(), dense.T)
+        row = int(rng.integers(dense.shape[0]))
+        assert np.array_equal(matrix[row], dense[row])
+        rows = rng.integers(0, dense.shape[0], 5)
+        assert np.array_equal(matrix.take_rows(rows), dense[rows])
+        assert matrix.nnz == np.count_nonzero(dense)
+
+
+def test_vstack_mixes_dense_and_sparse_blocks():
+    rng = np.random.default_rng(1)
+    blocks = [random_sparse(rng, (3, 6)), random_sparse(rng, (2, 6)), random_sparse(rng, (4, 6))]
+    stacked = vstack([blocks[0], CSRMatrix.from_dense(blocks[1]), blocks[2]])
+    assert isinstance(stacked, CSRMatrix)
+    assert np.array_equal(stacked.toarray(), np.vstack(blocks))
+    assert isinstance(vstack(blocks), np.ndarray)
+
+
+@pytest.mark.parametrize('example', ['small', 'medium', 'large'])
+@pytest.mark.parametrize('bounds', [False, True])
+def test_sparse_problem_matrices_match_dense(example, bounds):
+    data = HajjData()
+    dense = data.get_problem_matrices(example, bounds=bounds)
+    sparse = data.get_problem_matrices(example, sparse=True, bounds=bounds)
+    assert isinstance(sparse[0], CSRMatrix)
+    assert np.array_equal(sparse[0].toarray(), dense[0])
+    for dense_part, sparse_part in zip(dense[1:], sparse[1:]):
+        assert np.array_equal(dense_part, sparse_part)
+
+
+def test_bounds_give_the_same_optimum_as_bound_rows():
+    data = HajjData()
+    for example in ['small', 'medium', 'large', generate_instance(6, 9, seed=2)]:
+        A, b, c = data.get_problem_matrices(example)
+        rows = RevisedSimplex(A, b, c).solve()
+        A, b, c, lb, ub = data.get_problem_matrices(example, sparse=True, bounds=True)
+        bounded = RevisedSimplex(A, b, c, lb, ub).solve()
+        assert rows.status == bounded.status == OPTIMAL
+        assert bounded.value == pytest.approx(rows.value)
+        assert np.all(bounded.point >= lb - 1e-9) and np.all(bounded.point <= ub + 1e-9)
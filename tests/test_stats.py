@@ -0,0 +1,73 @@
+# tests/test_stats.py
+import numpy as np
+import pytest
+from branch_and_bound import BranchAndBound
+from helpers import random_ip
+from simplex import OPTIMAL, solve_lp
+from stats import COUNTERS, SolverStats
+
+
+def solve_with_events(seed, **options):
+    A, b, c, lb, ub = random_ip(np.random.default_rng(seed), 8, 14)
+    events = []
+
+    def callback(event, stats):
+        events.append((event, stats.incumbent, stats.bound))
+
+    search = BranchAndBound(solve_lp, {'A': A, 'b': b, 'lb': lb, 'ub': ub}, c,
+                            callback=callback, progress_interval=5, **options)
+    return search.solve(), events
+
+
+def test_counters_add_up():
+    result, _ = solve_with_events(80)
+    stats = result.stats
+    assert stats.nodes_solved == result.nodes
+    assert stats.lp_calls == stats.nodes_solved
+    assert stats.nodes_solved <= stats.nodes_created
+    assert stats.pruned_infeasible + stats.integral_nodes <= stats.nodes_solved
+    assert stats.pivots > 0
+    assert stats.lp_time + stats.branching_time + stats.heuristic_time <= stats.total_time + 1e-6
+    assert stats.bookkeeping_time >= 0
+    assert stats.incumbent == pytest.approx(result.value)
+    assert len(stats.summary()) == 5
+    assert set(COUNTERS) <= set(stats.as_dict())
+
+
+def test_callback_sees_incumbents_and_progress():
+    result, events = solve_with_events(81, heuristics=False)
+    kinds = {event for event, _, _ in events}
+    assert kinds == {'incumbent', 'progress'}
+    incumbents = [value for event, value, _ in events if event == 'incumbent']
+    assert incumbents == sorted(incumbents, reverse=True)
+    assert incumbents[-1] == pytest.approx(result.value)
+    assert sum(event == 'progress' for event, _, _ in events) == result.nodes // 5
+
+
+def test_history_bounds_the_incumbent():
+    result, _ = solve_with_events(82, history=True)
+    history = result.stats.history
+    assert history and history[-1][1] == pytest.approx(result.value)
+    for seconds, incumbent, bound in history:
+        assert bound <= incumbent + 1e-6
+    assert [entry[0] for entry in history] == sorted(entry[0] for entry in history)
+
+
+def test_no_snapshots_without_a_callback_or_history(monkeypatch):
+    A, b, c, lb, ub = random_ip(np.random.default_rng(82), 8, 14)
+    search = BranchAndBound(solve_lp, {'A': A, 'b': b, 'lb': lb, 'ub': ub}, c, progress_interval=1)
+    scans = []
+    global_bound = search._global_bound
+    monkeypatch.setattr(search, '_global_bound', lambda: scans.append(1) or global_bound())
+    result = search.solve()
+    assert result.status == OPTIMAL and result.nodes > 1
+    assert result.stats.history == [] and len(scans) == 1
+    assert result.stats.incumbent == pytest.approx(result.value)
+
+
+def test_merge_sums_counters():
+    total, part = SolverStats(), SolverStats()
+    part.nodes_solved, part.pivots, part.lp_time = 3, 10, 0.5
+    total.merge(part.counters())
+    total.merge(part.counters())
+    assert (total.nodes_solved, total.pivots, total.lp_time) == (6, 20, 1.0)
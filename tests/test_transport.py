@@ -0,0 +1,80 @@
+# tests/test_transport.py
+import numpy as np
+import pytest
+from simplex import OPTIMAL, RevisedSimplex
+from transport import TransportationSolver
+
+
+def transport_lp(supply, capacity, costs, arc_capacity):
+    """
+    The transportation model as a generic LP: supply and capacity rows, and as
+    many pilgrims moved as the arcs allow (the max flow, found with a first LP)
+    """
+    n_ports, n_hotels = costs.shape
+    A = np.zeros((n_ports + n_hotels + 1, n_ports * n_hotels))
+    for i in range(n_ports):
+        A[i, i * n_hotels:(i + 1) * n_hotels] = 1
+    for j in range(n_hotels):
+        A[n_ports + j, j::n_hotels] = 1
+    A[-1] = -1
+    ub = np.broadcast_to(arc_capacity, costs.shape).ravel().astype(float)
+    lb = np.zeros(costs.size)
+    flow = RevisedSimplex(A[:-1], np.concatenate([supply, capacity]), -np.ones(costs.size), lb, ub)
+    max_flow = -flow.solve().value
+    b = np.concatenate([supply, capacity, [-np.floor(max_flow + 1e-6)]])
+    return A, b, costs.ravel().astype(float), lb, ub
+
+
+def random_instance(rng, balanced, capacitated):
+    n_ports, n_hotels = int(rng.integers(1, 8)), int(rng.integers(1, 8))
+    supply = rng.integers(0, 100, n_ports).astype(float)
+    capacity = rng.integers(0, 100, n_hotels).astype(float)
+    if balanced:
+        capacity = np.full(n_hotels, supply.sum() // n_hotels)
+        capacity[0] += supply.sum() - capacity.sum()
+    costs = rng.integers(1, 50, (n_ports, n_hotels)).astype(float)
+    arc_capacity = np.inf
+    if capacitated:
+        arc_capacity = (rng.integers(0, 40, (n_ports, n_hotels)).astype(float)
+                        if rng.random() < 0.5 else float(rng.integers(1, 60)))
+    return supply, capacity, costs, arc_capacity
+
+
+@pytest.mark.parametrize('balanced', [True, False])
+@pytest.mark.parametrize('capacitated', [False, True])
+def test_matches_generic_simplex(balanced, capacitated):
+    rng = np.random.default_rng(2 * balanced + capacitated)
+    for _ in range(60):
+        supply, capacity, costs, arc_capacity = random_instance(rng, balanced, capacitated)
+        result = TransportationSolver(supply, capacity, costs, arc_capacity).solve()
+        reference = RevisedSimplex(*transport_lp(supply, capacity, costs, arc_capacity)).solve()
+        assert result.status == reference.status
+        if result.status == OPTIMAL:
+            assert result.value == pytest.approx(reference.value, abs=1e-6)
+            flows = result.point.reshape(costs.shape)
+            assert np.allclose(flows, np.round(flows))
+            assert np.all(flows.sum(axis=1) <= supply + 1e-9)
+            assert np.all(flows.sum(axis=0) <= capacity + 1e-9)
+            assert np.all(flows <= arc_capacity + 1e-9)
+
+
+def test_binding_arc_capacities_move_as_many_as_they_allow():
+    # Every pilgrim fits in the hotels, but the only arc carries ten of them
+    result = TransportationSolver([20.0], [30.0], [[5.0]], 10.0).solve()
+    assert result.status == OPTIMAL
+    assert np.array_equal(result.point, [10.0]) and result.value == 50.0
+    # The cheap hotel is reachable by one bus only; the rest go to the dear one
+    result = TransportationSolver([100.0], [100.0, 100.0], [[1.0, 9.0]], np.array([[30.0, 50.0]])).solve()
+    assert np.array_equal(result.point, [30.0, 50.0])
+
+
+@pytest.mark.parametrize('pricing_cells', [1, 16, 10 ** 6])
+def test_pricing_block_size_does_not_change_the_optimum(pricing_cells):
+    rng = np.random.default_rng(7)
+    supply = rng.integers(100, 500, 30).astype(float)
+    capacity = rng.integers(100, 400, 80).astype(float)
+    costs = rng.integers(50, 500, (30, 80)).astype(float)
+    full = TransportationSolver(supply, capacity, costs, 50.0, pricing_cells=10 ** 6).solve()
+    partial = TransportationSolver(supply, capacity, costs, 50.0, pricing_cells=pricing_cells).solve()
+    assert partial.status == full.status == OPTIMAL
+    assert partial.value == pytest.approx(full.value)
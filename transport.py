@@ -0,0 +1,325 @@
+# transport.py
+import numpy as np
+from simplex import LPResult, OPTIMAL, INFEASIBLE, ITERATION_LIMIT
+
+# Cell states
+BASIC = 0
+AT_LOWER = 1
+AT_UPPER = 2
+
+# Cells priced per block of rows: each pivot prices blocks in turn and takes the
+# best cell of the first block with one, instead of pricing the whole tableau
+PRICING_CELLS = 2048
+
+
+def vogel_initial_solution(supply, demand, costs, arc_capacity):
+    """
+    Vogel's approximation method on a balanced transportation tableau with arc capacities
+    Args:
+        supply: Row supplies
+        demand: Column demands
+        costs: Cost matrix (rows x columns)
+        arc_capacity: Capacity of every cell (np.inf for uncapacitated cells)
+    Returns:
+        flows, state, row_residual, col_residual, row_alive, col_alive
+        Basic cells form a forest in which every tree keeps exactly one alive
+        row or column; cells saturated at their capacity are nonbasic at upper.
+    """
+    n_rows, n_cols = costs.shape
+    flows = np.zeros((n_rows, n_cols))
+    state = np.full((n_rows, n_cols), AT_LOWER, dtype=np.int8)
+    row_residual = np.array(supply, dtype=float)
+    col_residual = np.array(demand, dtype=float)
+    row_alive = np.ones(n_rows, dtype=bool)
+    col_alive = np.ones(n_cols, dtype=bool)
+
+    # Costs of the cells still available, and the two cheapest of every row and
+    # column; after each allocation only the penalties that lost a cell are updated
+    masked = np.where(arc_capacity > 0, costs, np.inf)
+    row_two, row_penalty = _vogel_penalty(masked)
+    col_two, col_penalty = _vogel_penalty(masked.T)
+
+    while row_alive.any() and col_alive.any():
+        if max(row_penalty.max(initial=-1.0), col_penalty.max(initial=-1.0)) < 0:
+            break  # no available cell
+        if row_penalty.max() >= col_penalty.max():
+            i = int(np.argmax(row_penalty))
+            j = int(np.argmin(masked[i]))
+        else:
+            j = int(np.argmax(col_penalty))
+            i = int(np.argmin(masked[:, j]))
+
+        amount = min(row_residual[i], col_residual[j], arc_capacity[i, j])
+        flows[i, j] = amount
+        row_residual[i] -= amount
+        col_residual[j] -= amount
+        if row_residual[i] <= 0:
+            state[i, j] = BASIC
+            row_alive[i] = False
+            masked[i] = np.inf
+            rows, cols = [i], np.flatnonzero(np.any(col_two == i, axis=1))
+        elif col_residual[j] <= 0:
+            state[i, j] = BASIC
+            col_alive[j] = False
+            masked[:, j] = np.inf
+            rows, cols = np.flatnonzero(np.any(row_two == j, axis=1)), [j]
+        else:
+            state[i, j] = AT_UPPER
+            masked[i, j] = np.inf
+            rows, cols = [i], [j]
+        row_two[rows], row_penalty[rows] = _vogel_penalty(masked[rows])
+        col_two[cols], col_penalty[cols] = _vogel_penalty(masked[:, cols].T)
+
+    return flows, state, row_residual, col_residual, row_alive, col_alive
+
+
+def _vogel_penalty(masked):
+    """
+    Difference between the two cheapest available cells of every row
+    Returns:
+        Column indices of the two cheapest cells (rows x 2) and the penalties
+    """
+    if masked.shape[1] == 1:
+        cheapest = masked[:, 0]
+        two = np.zeros((len(masked), 2), dtype=np.int64)
+        return two, np.where(np.isfinite(cheapest), np.inf, -1.0)
+    two = np.argpartition(masked, 1, axis=1)[:, :2]
+    values = np.take_along_axis(masked, two, axis=1)
+    first, second = values.min(axis=1), values.max(axis=1)
+    with np.errstate(invalid='ignore'):
+        penalty = second - first
+    penalty[~np.isfinite(first)] = -1.0  # no available cell
+    penalty[np.isfinite(first) & ~np.isfinite(second)] = np.inf  # only one choice left
+    return two, penalty
+
+
+class TransportationSolver:
+    """
+    Transportation simplex (MODI / u-v potentials) for the port -> hotel model
+        min sum c_ij x_ij
+        s.t. sum_j x_ij <= supply_i, sum_i x_ij <= capacity_j,
+             sum x = max flow of the network, 0 <= x_ij <= arc_capacity
+    The problem is balanced with a dummy hotel that keeps unserved pilgrims at a
+    penalty above any rerouting cost, so as many pilgrims move as the arc
+    capacities allow, and a dummy port that fills the spare beds. It is started
+    from Vogel's approximation, and anything Vogel could not place is routed
+    through a big-M artificial row and column. Integral data gives integral
+    optimal flows.
+    """
+    def __init__(self, supply, capacity, costs, arc_capacity=None, tol=1e-9, max_iter=None,
+                 pricing_cells=PRICING_CELLS):
+        self.supply = np.asarray(supply, dtype=float)
+        self.capacity = np.asarray(capacity, dtype=float)
+        self.costs = np.asarray(costs, dtype=float)
+        self.n_ports, self.n_hotels = self.costs.shape
+        if arc_capacity is None:
+            arc_capacity = np.inf
+        self.arc_capacity = np.broadcast_to(np.asarray(arc_capacity, dtype=float), self.costs.shape)
+        self.tol = tol
+        self.max_iter = max_iter if max_iter is not None else 20 * self.costs.size + 1000
+        self.pricing_cells = pricing_cells
+
+    def _build_tableau(self):
+        """Balanced tableau: real cells, then dummy row/column, then artificial row/column"""
+        # A dummy port absorbs the spare beds and a dummy hotel keeps the unserved
+        # pilgrims; the dummy port to dummy hotel cell balances whatever the arc
+        # capacities keep from moving
+        supply = np.append(self.supply, self.capacity.sum())
+        demand = np.append(self.capacity, self.supply.sum())
+        # Serving one more pilgrim reroutes at most one path through every row and column
+        unserved = (np.abs(self.costs).max(initial=0.0) + 1.0) * (self.n_ports + self.n_hotels + 2)
+        costs = np.zeros((self.n_ports + 1, self.n_hotels + 1))
+        costs[:self.n_ports, :self.n_hotels] = self.costs
+        costs[:self.n_ports, self.n_hotels] = unserved
+        capacity = np.full(costs.shape, np.inf)
+        capacity[:self.n_ports, :self.n_hotels] = self.arc_capacity
+        return supply, demand, costs, capacity
+
+    def solve(self):
+        """
+        Solve the transportation problem
+        Returns:
+            LPResult: flows flattened port-major (same order as get_problem_matrices) and total cost
+        """
+        supply, demand, costs, capacity = self._build_tableau()
+        flows, state, row_res, col_res, row_alive, col_alive = vogel_initial_solution(
+            supply, demand, costs, capacity)
+
+        # Artificial row a and column z close the Vogel forest into a spanning tree
+        n_rows, n_cols = costs.shape
+        big_m = (np.abs(costs).max(initial=0.0) + 1.0) * (n_rows + n_cols + 2)
+        a, z = n_rows, n_cols
+        self.C = np.zeros((n_rows + 1, n_cols + 1))
+        self.C[:n_rows, :n_cols] = costs
+        self.C[:n_rows, z] = big_m
+        self.C[a, :n_cols] = big_m
+        self.U = np.full((n_rows + 1, n_cols + 1), np.inf)
+        self.U[:n_rows, :n_cols] = capacity
+        self.X = np.zeros((n_rows + 1, n_cols + 1))
+        self.X[:n_rows, :n_cols] = flows
+        self.state = np.full((n_rows + 1, n_cols + 1), AT_LOWER, dtype=np.int8)
+        self.state[:n_rows, :n_cols] = state
+        for i in np.flatnonzero(row_alive):
+            self.X[i, z] = row_res[i]
+            self.state[i, z] = BASIC
+        for j in np.flatnonzero(col_alive):
+            self.X[a, j] = col_res[j]
+            self.state[a, j] = BASIC
+        self.state[a, z] = BASIC
+
+        status, iterations = self._pivot_loop()
+        if status == OPTIMAL and (self.X[:n_rows, z].sum() > self.tol or self.X[a, :n_cols].sum() > self.tol):
+            status = INFEASIBLE
+        if status != OPTIMAL:
+            return LPResult(None, None, status, iterations=iterations)
+
+        point = self.X[:self.n_ports, :self.n_hotels].ravel().copy()
+        value = float(self.costs.ravel() @ point)
+        return LPResult(point, value, status, iterations=iterations)
+
+    # ------------------------------------------------------------------
+    # Spanning tree bookkeeping. Rows are nodes 0..R-1, columns R..R+K-1.
+    # ------------------------------------------------------------------
+    def _build_tree(self):
+        R, K = self.C.shape
+        self.adjacent = [set() for _ in range(R + K)]
+        for i, j in zip(*np.nonzero(self.state == BASIC)):
+            self.adjacent[i].add(R + j)
+            self.adjacent[R + j].add(i)
+        self.parent = np.full(R + K, -1)
+        self.depth = np.zeros(R + K, dtype=int)
+        self.u = np.zeros(R)
+        self.v = np.zeros(K)
+        # Potentials down the tree from the root row, parents before children
+        for node in self._hang(R - 1, -1)[1:]:
+            parent = self.parent[node]
+            if node < R:
+                self.u[node] = self.C[node, parent - R] - self.v[parent - R]
+            else:
+                self.v[node - R] = self.C[parent, node - R] - self.u[parent]
+
+    def _hang(self, start, parent):
+        """
+        Set parent and depth of the subtree reached from start
+        Returns:
+            The subtree's nodes, each one after its parent
+        """
+        self.parent[start] = parent
+        self.depth[start] = 0 if parent < 0 else self.depth[parent] + 1
+        nodes = [start]
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for child in self.adjacent[node]:
+                if child != self.parent[node]:
+                    self.parent[child] = node
+                    self.depth[child] = self.depth[node] + 1
+                    nodes.append(child)
+                    stack.append(child)
+        return nodes
+
+    def _violation(self, rows):
+        """How much every cell of the given rows would improve the cost per unit moved"""
+        reduced = self.C[rows] - self.u[rows, None] - self.v[None, :]
+        state = self.state[rows]
+        violation = np.where(state == AT_LOWER, -reduced, np.where(state == AT_UPPER, reduced, 0.0))
+        violation[self.U[rows] <= 0] = 0.0
+        return violation
+
+    def _cycle(self, i, j):
+        """Basic cells on the tree path from column j back to row i, in cycle order"""
+        R = self.C.shape[0]
+        left, right = R + j, i
+        from_j, from_i = [], []
+        while left != right:
+            if self.depth[left] >= self.depth[right]:
+                from_j.append(left)
+                left = self.parent[left]
+            else:
+                from_i.append(right)
+                right = self.parent[right]
+        nodes = from_j + [left] + from_i[::-1]
+        cells = []
+        for p, q in zip(nodes[:-1], nodes[1:]):
+            cells.append((p, q - R) if p < R else (q, p - R))
+        return cells
+
+    def _pivot_loop(self):
+        R, K = self.C.shape
+        self._build_tree()
+        tol = self.tol
+        block = max(1, -(-self.pricing_cells // K))  # rows priced at a time
+        n_blocks = -(-R // block)
+        next_block = 0
+        degenerate_run = 0
+        iterations = 0
+        while True:
+            if iterations >= self.max_iter:
+                return ITERATION_LIMIT, iterations
+            if degenerate_run > 50:
+                eligible = np.flatnonzero(self._violation(slice(None)).ravel() > tol)
+                if len(eligible) == 0:
+                    return OPTIMAL, iterations
+                i, j = divmod(int(eligible[0]), K)  # Bland's rule to break cycling
+            else:
+                # Partial pricing: blocks of rows in turn, from where the last pivot stopped
+                for _ in range(n_blocks):
+                    first = next_block * block
+                    violation = self._violation(slice(first, first + block))
+                    next_block = (next_block + 1) % n_blocks
+                    flat = int(np.argmax(violation))
+                    if violation.flat[flat] > tol:
+                        break
+                else:
+                    return OPTIMAL, iterations
+                i, j = divmod(flat, K)
+                i += first
+            sign = 1.0 if self.state[i, j] == AT_LOWER else -1.0
+            reduced = self.C[i, j] - self.u[i] - self.v[j]
+
+            # Cells along the cycle alternate -/+ starting next to column j
+            cycle = self._cycle(i, j)
+            theta = self.U[i, j]
+            leaving = (i, j)
+            for k, (p, q) in enumerate(cycle):
+                step = -sign if k % 2 == 0 else sign
+                room = self.X[p, q] if step < 0 else self.U[p, q] - self.X[p, q]
+                if room < theta:
+                    theta = room
+                    leaving = (p, q)
+                elif room == theta and degenerate_run > 50 and leaving != (i, j) and (p, q) < leaving:
+                    leaving = (p, q)
+            iterations += 1
+            degenerate_run = degenerate_run + 1 if theta <= tol else 0
+
+            self.X[i, j] += sign * theta
+            for k, (p, q) in enumerate(cycle):
+                self.X[p, q] += (-sign if k % 2 == 0 else sign) * theta
+
+            if leaving == (i, j):
+                self.state[i, j] = AT_UPPER if sign > 0 else AT_LOWER
+                continue
+
+            p, q = leaving
+            self.state[p, q] = AT_LOWER if self.X[p, q] <= tol else AT_UPPER
+            self.state[i, j] = BASIC
+            self.adjacent[p].discard(R + q)
+            self.adjacent[R + q].discard(p)
+            self.adjacent[i].add(R + j)
+            self.adjacent[R + j].add(i)
+
+            # Re-hang the subtree cut off by the leaving cell below the entering cell.
+            # Only its potentials change, all by the entering cell's reduced cost.
+            below = R + q if self.parent[R + q] == p else p
+            entering_end = i if self._in_subtree(i, below) else R + j
+            other_end = R + j if entering_end == i else i
+            nodes = np.array(self._hang(entering_end, other_end))
+            shift = reduced if entering_end == i else -reduced
+            self.u[nodes[nodes < R]] += shift
+            self.v[nodes[nodes >= R] - R] -= shift
+
+    def _in_subtree(self, node, root):
+        """Whether node lies in the subtree rooted at root (before the re-hang)"""
+        while node >= 0 and self.depth[node] > self.depth[root]:
+            node = self.parent[node]
+        return node == root